@@ -2,19 +2,24 @@
 
 import click
 
-from .predict import predict
-from .preprocess import preprocess
-from .test import test
-from .train import train
+from .lazy_group import LazyGroup
 
 
-@click.group()
+# Commands are imported on use, so e.g. TensorFlow is not imported to preprocess data
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "export": "dfd.cli.export:export",
+        "predict": "dfd.cli.predict:predict",
+        "predict-video": "dfd.cli.predict_video:predict_video",
+        "preprocess": "dfd.cli.preprocess.preprocess:preprocess",
+        "serve": "dfd.cli.serve:serve",
+        "test": "dfd.cli.test:test",
+        "train": "dfd.cli.train:train",
+    },
+)
 def entry_point():
     """Entry point for CLI commands."""
 
 
 # TODO: configure logging on app start
-entry_point.add_command(preprocess)
-entry_point.add_command(predict)
-entry_point.add_command(train)
-entry_point.add_command(test)
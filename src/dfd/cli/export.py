@@ -0,0 +1,162 @@
+"""Export trained model for inference."""
+import pathlib
+import typing as t
+
+import click
+import numpy as np
+
+from dfd.datasets.dataset_index import IMAGE_SUFFIXES, DatasetIndex
+from dfd.datasets.packed import DEFAULT_CLASS_NAMES, PackedDataset
+from dfd.models.implementation.inference_only import read_faces
+
+from .utils import echo_metrics
+
+
+@click.command()
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["saved-model", "tflite", "frozen-graph"]),
+    default="saved-model",
+    help="Format of exported model.",
+)
+@click.option(
+    "--quantization",
+    type=click.Choice(["none", "float16", "int8"]),
+    default="none",
+    help="Post-training quantization, supported only by tflite format.",
+)
+@click.option(
+    "--calibration-path",
+    type=click.Path(exists=True, file_okay=False, path_type=pathlib.Path),
+    help="Directory of faces used to calibrate int8 quantization, sub-directories are searched.",
+)
+@click.option(
+    "--no-calibration-faces",
+    type=click.IntRange(min=1),
+    default=200,
+    help="Max number of faces used to calibrate int8 quantization.",
+)
+@click.option(
+    "--evaluation-path",
+    type=click.Path(exists=True, path_type=pathlib.Path),
+    help=(
+        "Dataset of faces exported model is compared on with original model, "
+        + "accuracy is compared if it has reals and fakes directories or is labeled packed dataset."
+    ),
+)
+@click.option(
+    "--no-evaluation-faces",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Max number of faces models are compared on.",
+)
+@click.argument("model_path", type=click.Path(exists=True, path_type=pathlib.Path))
+@click.argument("output_path", type=click.Path(path_type=pathlib.Path))
+def export(
+    export_format: str,
+    quantization: str,
+    calibration_path: t.Optional[pathlib.Path],
+    no_calibration_faces: int,
+    evaluation_path: t.Optional[pathlib.Path],
+    no_evaluation_faces: int,
+    model_path: pathlib.Path,
+    output_path: pathlib.Path,
+):
+    """Export MesoNet with batch normalization folded.
+
+    SavedModel and TFLite models can be used as meso_net_exported, frozen graph
+    as meso_net_opencv.
+
+    Exported model is compared with original model, differences of confidences, accuracy
+    and latency are reported.
+
+    Args:
+        export_format: Format of exported model.
+        quantization: Post-training quantization of exported model.
+        calibration_path: Directory of faces used to calibrate int8 quantization.
+        no_calibration_faces: Max number of faces used to calibrate int8 quantization.
+        evaluation_path: Dataset of faces models are compared on.
+        no_evaluation_faces: Max number of faces models are compared on.
+        model_path: Path to trained model.
+        output_path: Path to exported model.
+
+    """
+    # Imported on use, so TensorFlow is not imported when commands are listed
+    from dfd.models.implementation.export import ExportFormat, Quantization, compare_models
+    from dfd.models.implementation.exported_meso_net import ExportedMesoNet
+    from dfd.models.implementation.meso_net import MesoNet
+    from dfd.models.implementation.opencv_meso_net import OpenCvMesoNet
+
+    # Frozen graph is meant to be run by OpenCV DNN, other formats by TensorFlow
+    exported_model_classes = {
+        ExportFormat.SAVED_MODEL: ExportedMesoNet,
+        ExportFormat.TFLITE: ExportedMesoNet,
+        ExportFormat.FROZEN_GRAPH: OpenCvMesoNet,
+    }
+    if Quantization(quantization) == Quantization.INT8 and calibration_path is None:
+        raise click.UsageError("Calibration path is required by int8 quantization.")
+    calibration_faces = None
+    if calibration_path is not None:
+        calibration_faces = _select_calibration_faces(calibration_path, no_calibration_faces)
+    model = t.cast(MesoNet, MesoNet.load(model_path))
+    exported_path = model.export(
+        output_path, ExportFormat(export_format), Quantization(quantization), calibration_faces
+    )
+    click.echo(f"Model exported to {exported_path}")
+    exported_model = exported_model_classes[ExportFormat(export_format)].load(exported_path)
+    faces, labels = _load_evaluation_faces(evaluation_path, no_evaluation_faces, calibration_faces)
+    echo_metrics(compare_models(model, exported_model, faces, labels))
+
+
+def _select_calibration_faces(
+    calibration_path: pathlib.Path, no_faces: int
+) -> t.Callable[[], t.Iterator[np.ndarray]]:
+    """Select faces evenly spread over sorted paths, so all classes and videos are included."""
+    file_paths = DatasetIndex.build(calibration_path, suffixes=IMAGE_SUFFIXES).file_paths
+    if not file_paths:
+        raise click.UsageError(f"No faces found in calibration path {calibration_path}.")
+    selected_paths = file_paths[_select_evenly(len(file_paths), no_faces)]
+    return lambda: read_faces(selected_paths)
+
+
+def _select_evenly(no_items: int, no_selected_items: int) -> slice:
+    """Select at most given number of items evenly spread over all items."""
+    step = max(no_items // no_selected_items, 1)
+    return slice(0, step * no_selected_items, step)
+
+
+def _load_evaluation_faces(
+    evaluation_path: t.Optional[pathlib.Path],
+    no_faces: int,
+    calibration_faces: t.Optional[t.Callable[[], t.Iterator[np.ndarray]]],
+) -> t.Tuple[np.ndarray, t.Optional[t.List[int]]]:
+    """Load faces models are compared on, random faces are used if no faces are given.
+
+    Faces are selected evenly spread over dataset, so all classes are included.
+
+    """
+    if evaluation_path is not None and PackedDataset.is_packed(evaluation_path):
+        packed_dataset = PackedDataset.open(evaluation_path)
+        if not len(packed_dataset.images):
+            raise click.UsageError(f"No faces found in evaluation path {evaluation_path}.")
+        selected = _select_evenly(len(packed_dataset.images), no_faces)
+        labels = None
+        if packed_dataset.labels is not None:
+            labels = packed_dataset.labels[selected].tolist()
+        # Only selected faces are read from memory-mapped images
+        return np.asarray(packed_dataset.images[selected]), labels
+    if evaluation_path is not None:
+        dataset_index = DatasetIndex.build(
+            evaluation_path, DEFAULT_CLASS_NAMES, suffixes=IMAGE_SUFFIXES
+        )
+        if not dataset_index.file_paths:
+            raise click.UsageError(f"No faces found in evaluation path {evaluation_path}.")
+        selected = _select_evenly(len(dataset_index.file_paths), no_faces)
+        faces = np.stack(list(read_faces(dataset_index.file_paths[selected])))
+        labels = None if dataset_index.labels is None else dataset_index.labels[selected]
+        return faces, labels
+    if calibration_faces is not None:
+        return np.stack(list(calibration_faces())), None
+    random_faces = np.random.default_rng(0).integers(0, 256, (32, 256, 256, 3), dtype=np.uint8)
+    return random_faces, None
@@ -0,0 +1,47 @@
+"""Command group importing its subcommands on demand."""
+
+import typing as t
+
+import click
+
+from dfd.plugins import import_object
+
+
+class LazyGroup(click.Group):
+    """Command group with subcommands referenced by import path, e.g. ``"package.module:command"``.
+
+    Subcommand module is imported only when subcommand is invoked or group help is shown,
+    so each subcommand imports only libraries it actually uses.
+
+    """
+
+    def __init__(
+        self,
+        *args: t.Any,
+        lazy_subcommands: t.Optional[t.Mapping[str, str]] = None,
+        **kwargs: t.Any,
+    ) -> None:
+        """Initialize LazyGroup.
+
+        Args:
+            args: Positional arguments passed to ``click.Group``.
+            lazy_subcommands: Map from subcommand name to reference to subcommand.
+            kwargs: Keyword arguments passed to ``click.Group``.
+
+        """
+        super().__init__(*args, **kwargs)
+        self._lazy_subcommands = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx: click.Context) -> t.List[str]:
+        """List names of loaded and not loaded subcommands."""
+        return sorted({*super().list_commands(ctx), *self._lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> t.Optional[click.Command]:
+        """Get subcommand, importing it if it was not loaded yet."""
+        reference = self._lazy_subcommands.pop(cmd_name, None)
+        if reference is not None:
+            command = import_object(reference)
+            if not isinstance(command, click.Command):
+                raise click.ClickException(f"{reference} is not a click command.")
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
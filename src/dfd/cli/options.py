@@ -0,0 +1,35 @@
+"""Options shared by commands."""
+
+import click
+
+server_option = click.option(
+    "server_url",
+    "--server",
+    metavar="URL",
+    help=(
+        "URL of inference server started with 'dfd serve', e.g. http://127.0.0.1:8765. "
+        + "If given, prediction is made by server which keeps model loaded between requests."
+    ),
+)
+
+# Any name is accepted, so models registered by plugins in `dfd.models` entry points group
+# can be used, unknown names are reported by `ModelRegistry`
+model_name_option = click.option(
+    "--model-name",
+    default="meso_net",
+    help=(
+        "Name of model used, e.g. meso_net, meso_net_exported or meso_net_opencv, "
+        + "models registered by installed plugins can be used as well."
+    ),
+)
+
+threads_option = click.option(
+    "num_threads",
+    "--threads",
+    type=click.IntRange(min=1),
+    help=(
+        "Number of threads model runs inference with, by default it is chosen by runtime. "
+        + "Built-in models set it for the whole process, e.g. OpenCV threads are used "
+        + "for frame processing as well. Not used with --server."
+    ),
+)
@@ -1,33 +1,68 @@
 """Perform prediction for single video or frame."""
 import pathlib
+import typing as t
 
 import click
 
+from dfd.datasets.dataset_index import IMAGE_SUFFIXES, DatasetIndex
+from dfd.datasets.packed import PackedDataset
 from dfd.models import ModelRegistry
+from dfd.models.interface import Prediction
+from dfd.serving import InferenceClient
+
+from .options import model_name_option, server_option, threads_option
 
 
 @click.command()
-@click.option(
-    "--model-name",
-    type=click.Choice(["meso_net"], case_sensitive=False),
-    default="meso_net",
-    help="Name of model used.",
-)
+@model_name_option
+@threads_option
+@server_option
 @click.argument("model_path", type=click.Path(exists=True, path_type=pathlib.Path))
 @click.argument("data_path", type=click.Path(exists=True, path_type=pathlib.Path))
-def predict(model_name: str, model_path: pathlib.Path, data_path: pathlib.Path):
+def predict(
+    model_name: str,
+    num_threads: t.Optional[int],
+    server_url: t.Optional[str],
+    model_path: pathlib.Path,
+    data_path: pathlib.Path,
+):
     """Perform prediction on group of videos or frames.
 
     Args:
         model_name: Name of model which will be trained.
+        num_threads: Number of threads model runs inference with.
+        server_url: URL of inference server, if not given model is loaded by command.
         model_path: Path to model, optional param used to load pre-trained model.
         data_path: Path to data used for predictions
 
     """
-    model_class = ModelRegistry.default().get_model_class(model_name)
-    model = model_class.load(model_path)
+    if server_url is not None:
+        _predict_on_server(server_url, model_name, model_path, data_path)
+        return
+    model = ModelRegistry.default().load_model(model_name, model_path, num_threads)
     frame_path_to_prediction_map = model.predict(sample_path=data_path)
     for frame_path, prediction in frame_path_to_prediction_map.items():
         click.echo(
-            "{frame_name}: {prediction}".format(frame_name=frame_path, prediction=prediction)
+            "{frame_name}: {prediction}".format(
+                frame_name=frame_path, prediction=Prediction(prediction).name
+            )
+        )
+
+
+def _predict_on_server(
+    server_url: str, model_name: str, model_path: pathlib.Path, data_path: pathlib.Path
+) -> None:
+    if PackedDataset.is_packed(data_path):
+        raise click.UsageError("Packed datasets cannot be sent to inference server.")
+    frame_paths = [data_path]
+    if data_path.is_dir():
+        frame_paths = DatasetIndex.build(data_path, suffixes=IMAGE_SUFFIXES).file_paths
+    frame_path_to_confidence_map = InferenceClient(server_url).predict_frames(
+        model_name, model_path, frame_paths
+    )
+    for frame_path, confidence in frame_path_to_confidence_map.items():
+        click.echo(
+            "{frame_name}: {prediction}".format(
+                frame_name=frame_path, prediction=Prediction.from_confidence(confidence).name
+            )
         )
@@ -0,0 +1,162 @@
+"""Perform prediction for whole videos."""
+import pathlib
+import typing as t
+
+import click
+
+from dfd.datasets.dataset_index import DatasetIndex
+from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.models import ModelRegistry
+from dfd.models.video import Aggregation, VideoPredictionSettings, VideoPredictor, VideoVerdict
+from dfd.serving import InferenceClient
+
+from .options import model_name_option, server_option, threads_option
+from .preprocess.options import detection_scale_option
+
+
+@click.command(name="predict-video")
+@model_name_option
+@threads_option
+@click.option(
+    "--face-model",
+    type=click.Choice(["hog", "cnn"], case_sensitive=False),
+    default="hog",
+    help="Model used to find faces, server uses its own face model.",
+)
+@detection_scale_option
+@click.option(
+    "--frame-stride",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Only every n-th frame of video is scored.",
+)
+@click.option(
+    "--frame-interval",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds of video between scored frames, overrides frame stride.",
+)
+@click.option(
+    "--max-frames",
+    type=click.IntRange(min=1),
+    help="Max number of frames sampled from single video, by default whole video is sampled.",
+)
+@click.option(
+    "--time-budget",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Max number of seconds spent on single video, prediction is made on frames scored.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=32,
+    help="Number of frames on which faces are found and scored together.",
+)
+@click.option(
+    "--aggregation",
+    type=click.Choice([aggregation.value for aggregation in Aggregation], case_sensitive=False),
+    default=Aggregation.TRIMMED_MEAN.value,
+    help="Method used to aggregate confidences of frames into score of video.",
+)
+@click.option(
+    "--trim-share",
+    type=click.FloatRange(min=0, max=0.5, max_open=True),
+    default=0.1,
+    help="Share of lowest and highest confidences ignored by 'trimmed-mean' aggregation.",
+)
+@click.option(
+    "--min-frames",
+    type=click.IntRange(min=1),
+    default=16,
+    help="Min number of scored frames before prediction can be stopped early.",
+)
+@click.option(
+    "--early-stop-z",
+    type=click.FloatRange(min=0, min_open=True),
+    default=3.0,
+    help="Stop once score is this many standard errors away from threshold.",
+)
+@click.option(
+    "--no-early-stop", is_flag=True, help="Sample whole video even if prediction is confident."
+)
+@server_option
+@click.argument("model_path", type=click.Path(exists=True, path_type=pathlib.Path))
+@click.argument("data_path", type=click.Path(exists=True, path_type=pathlib.Path))
+def predict_video(
+    model_name: str,
+    num_threads: t.Optional[int],
+    face_model: str,
+    detection_scale: float,
+    frame_stride: int,
+    frame_interval: t.Optional[float],
+    max_frames: t.Optional[int],
+    time_budget: t.Optional[float],
+    batch_size: int,
+    aggregation: str,
+    trim_share: float,
+    min_frames: int,
+    early_stop_z: float,
+    no_early_stop: bool,
+    server_url: t.Optional[str],
+    model_path: pathlib.Path,
+    data_path: pathlib.Path,
+):
+    """Predict whether videos are DeepFakes, each video gets single prediction.
+
+    Args:
+        model_name: Name of model used.
+        num_threads: Number of threads model runs inference with.
+        face_model: Name of model used to find faces.
+        detection_scale: Scale of frames on which faces are found.
+        frame_stride: Only every n-th frame is scored.
+        frame_interval: Seconds of video between scored frames.
+        max_frames: Max number of frames sampled from single video.
+        time_budget: Max number of seconds spent on single video.
+        batch_size: Number of frames scored together.
+        aggregation: Name of method used to aggregate confidences of frames.
+        trim_share: Share of confidences ignored by trimmed mean on each side.
+        min_frames: Min number of scored frames before prediction can be stopped early.
+        early_stop_z: Number of standard errors between score and threshold to stop early.
+        no_early_stop: Whether early stopping is disabled.
+        server_url: URL of inference server, if given server finds faces and scores them.
+        model_path: Path to model.
+        data_path: Path to video or directory of videos.
+
+    """
+    settings = VideoPredictionSettings(
+        frame_stride=frame_stride,
+        frame_interval=frame_interval,
+        max_frames=max_frames,
+        time_budget=time_budget,
+        batch_size=batch_size,
+        aggregation=Aggregation(aggregation),
+        trim_share=trim_share,
+        min_frames=min_frames,
+        early_stop_z=None if no_early_stop else early_stop_z,
+    )
+    video_paths = DatasetIndex.build(data_path).file_paths if data_path.is_dir() else [data_path]
+    if server_url is not None:
+        video_path_to_verdict_map = InferenceClient(server_url).predict_videos(
+            model_name, model_path, video_paths, settings
+        )
+        for video_path, verdict in video_path_to_verdict_map.items():
+            _echo_verdict(video_path, verdict)
+        return
+    model = ModelRegistry.default().load_model(model_name, model_path, num_threads)
+    with FaceExtractor(
+        FaceExtractionModel(face_model), detection_scale=detection_scale
+    ) as face_extractor:
+        video_predictor = VideoPredictor(model, face_extractor, settings)
+        for video_path in video_paths:
+            _echo_verdict(video_path, video_predictor.predict(video_path))
+
+
+def _echo_verdict(video_path: pathlib.Path, verdict: VideoVerdict) -> None:
+    click.echo(
+        "{video_name}: {prediction} (score {score:.3f}, {scored}/{sampled} frames)".format(
+            video_name=video_path,
+            prediction=verdict.prediction.name,
+            score=verdict.score,
+            scored=verdict.no_scored_frames,
+            sampled=verdict.no_sampled_frames,
+        )
+    )
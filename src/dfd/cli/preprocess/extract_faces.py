@@ -1,9 +1,15 @@
+import pathlib
+import typing as t
+
 import click
 
 from dfd.datasets import extract_faces_in_batches, extract_faces_one_by_one
-from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_extractor import FaceExtractionEngine, FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_location_cache import FaceLocationCache
+from dfd.datasets.manifest import PreprocessingManifest
 
 from .dto import PreprocessDTO, pass_process_dto
+from .options import detection_scale_option, face_cache_option, manifest_option
 
 
 @click.command(name="extract-faces")
@@ -21,17 +27,36 @@ from .dto import PreprocessDTO, pass_process_dto
     "--model",
     type=click.Choice(["hog", "cnn"], case_sensitive=False),
     default="hog",
+    help="Model used to find faces.",
+)
+@click.option(
+    "--batch-engine",
+    type=click.Choice([engine.value for engine in FaceExtractionEngine], case_sensitive=False),
     help=(
-        "Model used to find faces if frames are processed one by one, "
-        + "if 'in-batches' flag is set cnn is used."
+        "Engine used to find faces in batches of frames. 'dlib-batch' supports only cnn model, "
+        + "'threads' and 'processes' spread frames over CPU cores. "
+        + "Defaults to 'dlib-batch' for cnn and 'processes' for hog."
     ),
 )
+@click.option(
+    "--detection-workers",
+    type=click.IntRange(min=1),
+    help="Number of workers used by 'threads' and 'processes' engines, defaults to CPU count.",
+)
+@detection_scale_option
+@face_cache_option
+@manifest_option
 @pass_process_dto
 def extract_faces(
     preprocess_dto: PreprocessDTO,
     in_batches: bool,
     model_name: str,
     batch_size: int,
+    batch_engine: t.Optional[str],
+    detection_workers: t.Optional[int],
+    detection_scale: float,
+    face_cache_path: t.Optional[pathlib.Path],
+    manifest_path: t.Optional[pathlib.Path],
 ):
     """Extract frames from frames contained in given directory.
 
@@ -40,22 +65,37 @@ def extract_faces(
         in_batches: Boolean flag specifying whether to process frames in batches.
         model_name: Name of model used to find faces.
         batch_size: Sie of batch.
+        batch_engine: Name of engine used to find faces in batches.
+        detection_workers: Number of workers used by pool based engines.
+        detection_scale: Scale of frames on which faces are found.
+        face_cache_path: Path to cache of found face locations.
+        manifest_path: Path to manifest of completed work.
 
     """
     # TODO: Use HOG by default
-    face_extractor = FaceExtractor(FaceExtractionModel(model_name), number_of_times_to_upsample=0)
-    if not in_batches:
-        click.echo("Processing frames one by one...")
-        extract_faces_one_by_one(
-            face_extractor=face_extractor,
-            input_path=preprocess_dto.input_path,
-            output_path=preprocess_dto.output_path,
-        )
-    else:
-        click.echo("Processing frames in batches...")
-        extract_faces_in_batches(
-            face_extractor=face_extractor,
-            input_path=preprocess_dto.input_path,
-            output_path=preprocess_dto.output_path,
-            batch_size=batch_size,
-        )
+    with FaceExtractor(
+        FaceExtractionModel(model_name),
+        number_of_times_to_upsample=0,
+        batch_engine=FaceExtractionEngine(batch_engine) if batch_engine else None,
+        workers=detection_workers,
+        detection_scale=detection_scale,
+        cache=FaceLocationCache(face_cache_path) if face_cache_path else None,
+    ) as face_extractor:
+        manifest = PreprocessingManifest(manifest_path) if manifest_path else None
+        if not in_batches:
+            click.echo("Processing frames one by one...")
+            extract_faces_one_by_one(
+                face_extractor=face_extractor,
+                input_path=preprocess_dto.input_path,
+                output_path=preprocess_dto.output_path,
+                manifest=manifest,
+            )
+        else:
+            click.echo("Processing frames in batches...")
+            extract_faces_in_batches(
+                face_extractor=face_extractor,
+                input_path=preprocess_dto.input_path,
+                output_path=preprocess_dto.output_path,
+                batch_size=batch_size,
+                manifest=manifest,
+            )
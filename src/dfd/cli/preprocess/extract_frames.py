@@ -1,9 +1,13 @@
+import pathlib
 import typing as t
 
 import click
 
-from .dto import PreprocessDTO, pass_process_dto
 from dfd.datasets import FrameExtractor
+from dfd.datasets.manifest import PreprocessingManifest
+
+from .dto import PreprocessDTO, pass_process_dto
+from .options import manifest_option
 
 
 @click.command(name="extract-frames")
@@ -19,9 +23,33 @@ from dfd.datasets import FrameExtractor
     type=int,
     help="specify upper index of videos range that will be processed, defaults to last available",
 )
+@click.option(
+    "--frame-stride",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Extract only every n-th frame of each video.",
+)
+@click.option(
+    "--max-frames",
+    type=click.IntRange(min=1),
+    help="Max number of frames extracted from single video, defaults to all frames.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes used to extract frames, videos are spread over processes.",
+)
+@manifest_option
 @pass_process_dto
 def extract_frames(
-    preprocess_dto: PreprocessDTO, lower_bound: t.Optional[int], upper_bound: t.Optional[int]
+    preprocess_dto: PreprocessDTO,
+    lower_bound: t.Optional[int],
+    upper_bound: t.Optional[int],
+    frame_stride: int,
+    max_frames: t.Optional[int],
+    workers: int,
+    manifest_path: t.Optional[pathlib.Path],
 ):
     """Extract frames from videos contained in given directory.
 
@@ -29,14 +57,21 @@ def extract_frames(
         preprocess_dto: Object containing input and output path, passed via decorator.
         lower_bound: Inclusive, lower bound of videos batch that will be processed.
         upper_bound: Exclusive, upper bound of videos batch that will be processed.
+        frame_stride: Only every n-th frame of each video is extracted.
+        max_frames: Max number of frames extracted from single video.
+        workers: Number of processes used to extract frames.
+        manifest_path: Path to manifest of completed work.
 
     Returns:
 
     """
-    frame_extractor = FrameExtractor()
+    frame_extractor = FrameExtractor(
+        frame_stride=frame_stride, max_frames=max_frames, workers=workers
+    )
     frame_extractor.extract_batch(
         input_path=preprocess_dto.input_path,
         output_path=preprocess_dto.output_path,
         lower_bound=lower_bound,
         upper_bound=upper_bound,
+        manifest=PreprocessingManifest(manifest_path) if manifest_path else None,
     )
@@ -6,9 +6,18 @@ import click
 
 from dfd.datasets import GeneratorSettings, preprocessor
 from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_location_cache import FaceLocationCache
 from dfd.datasets.frames_generators import ModificationGenerator
+from dfd.datasets.manifest import PreprocessingManifest
 
 from .dto import PreprocessDTO, pass_process_dto
+from .options import (
+    detection_scale_option,
+    face_cache_option,
+    manifest_option,
+    modification_seed_option,
+    workers_option,
+)
 
 
 @click.command(name="modify-frames")
@@ -31,11 +40,21 @@ from .dto import PreprocessDTO, pass_process_dto
         + "if 'in-batches' flag is set cnn is used."
     ),
 )
+@detection_scale_option
+@face_cache_option
+@manifest_option
+@workers_option
+@modification_seed_option
 @pass_process_dto
 def modify_frames(
     preprocess_dto: PreprocessDTO,
     setting_path: t.Optional[pathlib.Path],
     model_name: str,
+    detection_scale: float,
+    face_cache_path: t.Optional[pathlib.Path],
+    manifest_path: t.Optional[pathlib.Path],
+    workers: int,
+    modification_seed: t.Optional[int],
 ):
     """Modify provided frames using specified settings.
 
@@ -43,21 +62,34 @@ def modify_frames(
         preprocess_dto: Object containing input and output path, passed via decorator.
         setting_path: Path to settings used to define modifications used.
         model_name: Name of model used to find faces.
+        detection_scale: Scale of frames on which faces are found.
+        face_cache_path: Path to cache of found face locations.
+        manifest_path: Path to manifest of completed work.
+        workers: Number of threads used to load and modify frames.
+        modification_seed: Seed used to assign modifications to frames.
 
     """
     if setting_path and not setting_path.is_file():
         click.echo("Settings path must points to existing file.")
         sys.exit(1)
     # TODO: Use HOG by default
-    face_extractor = FaceExtractor(FaceExtractionModel(model_name), number_of_times_to_upsample=0)
-    if setting_path:
-        modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
-    else:
-        modification_generator_settings = GeneratorSettings.default()
-    modification_generator = ModificationGenerator(settings=modification_generator_settings)
-    preprocessor.modify_frames(
-        face_extractor=face_extractor,
-        modification_generator=modification_generator,
-        input_path=preprocess_dto.input_path,
-        output_path=preprocess_dto.output_path,
-    )
+    with FaceExtractor(
+        FaceExtractionModel(model_name),
+        number_of_times_to_upsample=0,
+        detection_scale=detection_scale,
+        cache=FaceLocationCache(face_cache_path) if face_cache_path else None,
+    ) as face_extractor:
+        if setting_path:
+            modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
+        else:
+            modification_generator_settings = GeneratorSettings.default()
+        modification_generator = ModificationGenerator(
+            settings=modification_generator_settings, workers=workers, seed=modification_seed
+        )
+        preprocessor.modify_frames(
+            face_extractor=face_extractor,
+            modification_generator=modification_generator,
+            input_path=preprocess_dto.input_path,
+            output_path=preprocess_dto.output_path,
+            manifest=PreprocessingManifest(manifest_path) if manifest_path else None,
+        )
@@ -0,0 +1,56 @@
+"""Options shared by preprocess subcommands."""
+
+import pathlib
+
+import click
+
+detection_scale_option = click.option(
+    "--detection-scale",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=1.0,
+    help=(
+        "Scale of frames on which faces are found, e.g. 0.25 finds faces on frames "
+        + "four times smaller than original. Faces are always cropped from original frames."
+    ),
+)
+
+face_cache_option = click.option(
+    "face_cache_path",
+    "--face-cache",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help=(
+        "Path to file used to cache found face locations, created if it does not exist. "
+        + "Faces are not searched again on frames already processed with the same settings."
+    ),
+)
+
+manifest_option = click.option(
+    "manifest_path",
+    "--manifest",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help=(
+        "Path to file used to record completed work, created if it does not exist. "
+        + "Videos and frames already processed are skipped unless they changed since, "
+        + "so interrupted preprocessing can be resumed and new videos added incrementally."
+    ),
+)
+
+workers_option = click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help=(
+        "Number of threads used to load and modify frames. "
+        + "Modifications assigned to frames do not depend on number of workers."
+    ),
+)
+
+modification_seed_option = click.option(
+    "modification_seed",
+    "--modification-seed",
+    type=click.INT,
+    help=(
+        "Seed used to assign modifications to frames. Assignment of frames read from "
+        + "directory is saved next to output directory and reused by next runs."
+    ),
+)
@@ -0,0 +1,28 @@
+import typing as t
+
+import click
+
+from dfd.datasets.packed import pack_directory
+
+from .dto import PreprocessDTO, pass_process_dto
+
+
+@click.command(name="pack")
+@click.option("--seed", type=click.INT, help="Seed used to shuffle packed faces.")
+@pass_process_dto
+def pack(preprocess_dto: PreprocessDTO, seed: t.Optional[int]):
+    """Pack faces from given directory into single array read sequentially by models.
+
+    If directory contains 'reals' and 'fakes' sub-directories faces are labeled accordingly,
+    otherwise they are packed without labels, e.g. to be used for predictions.
+
+    Args:
+        preprocess_dto: Object containing input and output path, passed via decorator.
+        seed: Seed used to shuffle packed faces.
+
+    """
+    pack_directory(
+        input_path=preprocess_dto.input_path,
+        output_path=preprocess_dto.output_path,
+        seed=seed,
+    )
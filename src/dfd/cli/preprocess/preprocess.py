@@ -4,18 +4,25 @@ import pathlib
 
 import click
 
+from ..lazy_group import LazyGroup
 from .dto import PreprocessDTO
-from .extract_faces import extract_faces
-from .extract_frames import extract_frames
-from .modify_frames import modify_frames
-from .preprocess_dataset import preprocess_dataset
-from .preprocess_directory import preprocess_directory
-from .preprocess_fakes import preprocess_fakes
-from .preprocess_reals import preprocess_reals
-from .split import split
 
 
-@click.group(name="preprocess")
+@click.group(
+    name="preprocess",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "dataset": "dfd.cli.preprocess.preprocess_dataset:preprocess_dataset",
+        "directory": "dfd.cli.preprocess.preprocess_directory:preprocess_directory",
+        "extract-faces": "dfd.cli.preprocess.extract_faces:extract_faces",
+        "extract-frames": "dfd.cli.preprocess.extract_frames:extract_frames",
+        "fakes": "dfd.cli.preprocess.preprocess_fakes:preprocess_fakes",
+        "modify-frames": "dfd.cli.preprocess.modify_frames:modify_frames",
+        "pack": "dfd.cli.preprocess.pack:pack",
+        "reals": "dfd.cli.preprocess.preprocess_reals:preprocess_reals",
+        "split": "dfd.cli.preprocess.split:split",
+    },
+)
 @click.argument("input_path", type=click.Path(exists=True, path_type=pathlib.Path))
 @click.argument("output_path", type=click.Path(exists=False, path_type=pathlib.Path))
 @click.pass_context
@@ -33,13 +40,3 @@ def preprocess(ctx, input_path: pathlib.Path, output_path: pathlib.Path):
         input_path=input_path,
         output_path=output_path,
     )
-
-
-preprocess.add_command(extract_frames)
-preprocess.add_command(extract_faces)
-preprocess.add_command(preprocess_fakes)
-preprocess.add_command(preprocess_reals)
-preprocess.add_command(split)
-preprocess.add_command(preprocess_directory)
-preprocess.add_command(preprocess_dataset)
-preprocess.add_command(modify_frames)
@@ -5,10 +5,18 @@ import typing as t
 import click
 
 from dfd.datasets import FrameExtractor, GeneratorSettings, preprocessor
-from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_extractor import FaceExtractionEngine, FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_location_cache import FaceLocationCache
 from dfd.datasets.frames_generators import ModificationGenerator
+from dfd.datasets.manifest import PreprocessingManifest
 
 from .dto import PreprocessDTO, pass_process_dto
+from .options import (
+    detection_scale_option,
+    face_cache_option,
+    manifest_option,
+    modification_seed_option,
+)
 
 
 @click.command(name="dataset")
@@ -34,14 +42,52 @@ from .dto import PreprocessDTO, pass_process_dto
     "--model",
     type=click.Choice(["hog", "cnn"], case_sensitive=False),
     default="cnn",
+    help="Model used to find faces.",
+)
+@click.option(
+    "--batch-engine",
+    type=click.Choice([engine.value for engine in FaceExtractionEngine], case_sensitive=False),
+    help=(
+        "Engine used to find faces in batches of frames. 'dlib-batch' supports only cnn model, "
+        + "'threads' and 'processes' spread frames over CPU cores. "
+        + "Defaults to 'dlib-batch' for cnn and 'processes' for hog."
+    ),
+)
+@click.option(
+    "--detection-workers",
+    type=click.IntRange(min=1),
+    help="Number of workers used by 'threads' and 'processes' engines, defaults to CPU count.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes used to extract frames, videos are spread over processes.",
+)
+@click.option(
+    "--in-memory",
+    is_flag=True,
+    help=(
+        "Whether to process frames extracted from videos in memory. "
+        + "If set only split videos are saved in storage path."
+    ),
+)
+@click.option(
+    "--output-format",
+    type=click.Choice([dataset_format.value for dataset_format in preprocessor.DatasetFormat]),
+    default=preprocessor.DatasetFormat.PNG.value,
     help=(
-        "Model used to find faces if frames are processed one by one, "
-        + "if 'in-batches' flag is set cnn is used."
+        "Format of preprocessed dataset. 'png' saves each face in separate file, "
+        + "'packed' packs faces into single array per dataset, read sequentially by models."
     ),
 )
 @click.option("train_share", "--train", type=click.FLOAT, default=None)
 @click.option("validation_share", "--validation", type=click.FLOAT, default=None)
 @click.option("test_share", "--test", type=click.FLOAT, default=None)
+@detection_scale_option
+@face_cache_option
+@manifest_option
+@modification_seed_option
 @click.argument("storage_path", type=click.Path(exists=False, path_type=pathlib.Path))
 @pass_process_dto
 def preprocess_dataset(
@@ -50,9 +96,18 @@ def preprocess_dataset(
     batch_size: t.Optional[int],
     storage_path: pathlib.Path,
     model_name: str,
+    batch_engine: t.Optional[str],
+    detection_workers: t.Optional[int],
     train_share: t.Optional[float],
     validation_share: t.Optional[float],
     test_share: t.Optional[float],
+    workers: int,
+    in_memory: bool,
+    output_format: str,
+    detection_scale: float,
+    face_cache_path: t.Optional[pathlib.Path],
+    manifest_path: t.Optional[pathlib.Path],
+    modification_seed: t.Optional[int],
 ):
     """Preprocess whole dataset.
 
@@ -62,9 +117,18 @@ def preprocess_dataset(
         batch_size: Size of batch that will be used during face finding.
         storage_path: Path that will be used to store frames extracted from videos.
         model_name: Name of model used to find faces.
+        batch_engine: Name of engine used to find faces in batches.
+        detection_workers: Number of workers used by pool based engines.
         train_share: Share of training dataset.
         validation_share: Share of validation dataset.
         test_share: Share of test dataset.
+        workers: Number of processes used to extract frames.
+        in_memory: Whether to process extracted frames in memory instead of saving them.
+        output_format: Format of preprocessed dataset.
+        detection_scale: Scale of frames on which faces are found.
+        face_cache_path: Path to cache of found face locations.
+        manifest_path: Path to manifest of completed work.
+        modification_seed: Seed used to assign modifications to frames.
 
     """
     if setting_path and not setting_path.is_file():
@@ -72,28 +136,36 @@ def preprocess_dataset(
         sys.exit(1)
 
     storage_path.mkdir(parents=True, exist_ok=True)
-    frame_extractor = FrameExtractor()
+    frame_extractor = FrameExtractor(workers=workers)
     # TODO: use HOG by default
     face_extraction_model = FaceExtractionModel(model_name)
-    face_extractor = FaceExtractor(face_extraction_model, number_of_times_to_upsample=0)
-    # HOG cannot process frames in batches
-    # TODO: verify
-    if face_extraction_model == FaceExtractionModel.HOG:
-        batch_size = None
-    if setting_path:
-        modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
-    else:
-        modification_generator_settings = GeneratorSettings.default()
-    modification_generator = ModificationGenerator(settings=modification_generator_settings)
-    preprocessor.preprocess_whole_dataset(
-        frame_extractor=frame_extractor,
-        face_extractor=face_extractor,
-        modification_generator=modification_generator,
-        input_path=preprocess_dto.input_path,
-        storage_path=storage_path,
-        output_path=preprocess_dto.output_path,
-        batch_size=batch_size,
-        train_ds_share=train_share,
-        validation_ds_share=validation_share,
-        test_ds_share=test_share,
-    )
+    with FaceExtractor(
+        face_extraction_model,
+        number_of_times_to_upsample=0,
+        batch_engine=FaceExtractionEngine(batch_engine) if batch_engine else None,
+        workers=detection_workers,
+        detection_scale=detection_scale,
+        cache=FaceLocationCache(face_cache_path) if face_cache_path else None,
+    ) as face_extractor:
+        if setting_path:
+            modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
+        else:
+            modification_generator_settings = GeneratorSettings.default()
+        modification_generator = ModificationGenerator(
+            settings=modification_generator_settings, seed=modification_seed
+        )
+        preprocessor.preprocess_whole_dataset(
+            frame_extractor=frame_extractor,
+            face_extractor=face_extractor,
+            modification_generator=modification_generator,
+            input_path=preprocess_dto.input_path,
+            storage_path=storage_path,
+            output_path=preprocess_dto.output_path,
+            batch_size=batch_size,
+            train_ds_share=train_share,
+            validation_ds_share=validation_share,
+            test_ds_share=test_share,
+            in_memory=in_memory,
+            manifest=PreprocessingManifest(manifest_path) if manifest_path else None,
+            dataset_format=preprocessor.DatasetFormat(output_format),
+        )
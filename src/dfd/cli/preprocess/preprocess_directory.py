@@ -5,10 +5,18 @@ import typing as t
 import click
 
 from dfd.datasets import FrameExtractor, GeneratorSettings, preprocessor
-from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_extractor import FaceExtractionEngine, FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_location_cache import FaceLocationCache
 from dfd.datasets.frames_generators import ModificationGenerator
+from dfd.datasets.manifest import PreprocessingManifest
 
 from .dto import PreprocessDTO, pass_process_dto
+from .options import (
+    detection_scale_option,
+    face_cache_option,
+    manifest_option,
+    modification_seed_option,
+)
 
 
 @click.command(name="directory")
@@ -34,19 +42,42 @@ from .dto import PreprocessDTO, pass_process_dto
     "--model",
     type=click.Choice(["hog", "cnn"], case_sensitive=False),
     default="cnn",
+    help="Model used to find faces.",
+)
+@click.option(
+    "--batch-engine",
+    type=click.Choice([engine.value for engine in FaceExtractionEngine], case_sensitive=False),
     help=(
-        "Model used to find faces if frames are processed one by one, "
-        + "if 'in-batches' flag is set cnn is used."
+        "Engine used to find faces in batches of frames. 'dlib-batch' supports only cnn model, "
+        + "'threads' and 'processes' spread frames over CPU cores. "
+        + "Defaults to 'dlib-batch' for cnn and 'processes' for hog."
     ),
 )
-@click.argument("storage_path", type=click.Path(exists=False, path_type=pathlib.Path))
+@click.option(
+    "--detection-workers",
+    type=click.IntRange(min=1),
+    help="Number of workers used by 'threads' and 'processes' engines, defaults to CPU count.",
+)
+@detection_scale_option
+@face_cache_option
+@manifest_option
+@modification_seed_option
+@click.argument(
+    "storage_path", required=False, type=click.Path(exists=False, path_type=pathlib.Path)
+)
 @pass_process_dto
 def preprocess_directory(
     preprocess_dto: PreprocessDTO,
     setting_path: t.Optional[pathlib.Path],
     batch_size: t.Optional[int],
     model_name: str,
-    storage_path: pathlib.Path,
+    batch_engine: t.Optional[str],
+    detection_workers: t.Optional[int],
+    storage_path: t.Optional[pathlib.Path],
+    detection_scale: float,
+    face_cache_path: t.Optional[pathlib.Path],
+    manifest_path: t.Optional[pathlib.Path],
+    modification_seed: t.Optional[int],
 ):
     """Preprocess directory containing fake and real videos.
 
@@ -55,33 +86,47 @@ def preprocess_directory(
         setting_path: Path to settings used to define modifications used.
         batch_size: Size of batch that will be used during face finding.
         model_name: Name of model used to find faces.
-        storage_path: Path that will be used to store frames extracted from videos.
+        batch_engine: Name of engine used to find faces in batches.
+        detection_workers: Number of workers used by pool based engines.
+        storage_path: Path that will be used to store frames extracted from videos,
+            if not specified frames are processed in memory and never saved.
+        detection_scale: Scale of frames on which faces are found.
+        face_cache_path: Path to cache of found face locations.
+        manifest_path: Path to manifest of completed work.
+        modification_seed: Seed used to assign modifications to frames.
 
     """
     if setting_path and not setting_path.is_file():
         click.echo("Settings path must points to existing file.")
         sys.exit(1)
 
-    storage_path.mkdir(parents=True, exist_ok=True)
+    if storage_path:
+        storage_path.mkdir(parents=True, exist_ok=True)
     frame_extractor = FrameExtractor()
     # TODO: use HOG by default
     face_extraction_model = FaceExtractionModel(model_name)
-    face_extractor = FaceExtractor(face_extraction_model, number_of_times_to_upsample=0)
-    # HOG cannot process frames in batches
-    # TODO: verify
-    if face_extraction_model == FaceExtractionModel.HOG:
-        batch_size = None
-    if setting_path:
-        modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
-    else:
-        modification_generator_settings = GeneratorSettings.default()
-    modification_generator = ModificationGenerator(settings=modification_generator_settings)
-    preprocessor.preprocess_single_directory(
-        frame_extractor=frame_extractor,
-        face_extractor=face_extractor,
-        modification_generator=modification_generator,
-        input_path=preprocess_dto.input_path,
-        storage_path=storage_path,
-        output_path=preprocess_dto.output_path,
-        batch_size=batch_size,
-    )
+    with FaceExtractor(
+        face_extraction_model,
+        number_of_times_to_upsample=0,
+        batch_engine=FaceExtractionEngine(batch_engine) if batch_engine else None,
+        workers=detection_workers,
+        detection_scale=detection_scale,
+        cache=FaceLocationCache(face_cache_path) if face_cache_path else None,
+    ) as face_extractor:
+        if setting_path:
+            modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
+        else:
+            modification_generator_settings = GeneratorSettings.default()
+        modification_generator = ModificationGenerator(
+            settings=modification_generator_settings, seed=modification_seed
+        )
+        preprocessor.preprocess_single_directory(
+            frame_extractor=frame_extractor,
+            face_extractor=face_extractor,
+            modification_generator=modification_generator,
+            input_path=preprocess_dto.input_path,
+            storage_path=storage_path,
+            output_path=preprocess_dto.output_path,
+            batch_size=batch_size,
+            manifest=PreprocessingManifest(manifest_path) if manifest_path else None,
+        )
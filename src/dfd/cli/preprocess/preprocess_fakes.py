@@ -5,8 +5,11 @@ import click
 
 from dfd.datasets import FrameExtractor, preprocessor
 from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_location_cache import FaceLocationCache
+from dfd.datasets.manifest import PreprocessingManifest
 
 from .dto import PreprocessDTO, pass_process_dto
+from .options import detection_scale_option, face_cache_option, manifest_option
 
 
 @click.command(name="fakes")
@@ -18,34 +21,79 @@ from .dto import PreprocessDTO, pass_process_dto
         + "If not specified frames are processed one by one."
     ),
 )
-@click.argument("storage_path", type=click.Path(exists=False, path_type=pathlib.Path))
+@click.option(
+    "--frame-stride",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Extract only every n-th frame of each video.",
+)
+@click.option(
+    "--max-frames",
+    type=click.IntRange(min=1),
+    help="Max number of frames extracted from single video, defaults to all frames.",
+)
+@click.option(
+    "--keyframe-interval",
+    type=click.IntRange(min=1),
+    help=(
+        "Detect faces only on every n-th frame or on scene change and track them in between. "
+        + "Used only if frames are processed in memory, i.e. storage path is not specified."
+    ),
+)
+@detection_scale_option
+@face_cache_option
+@manifest_option
+@click.argument(
+    "storage_path", required=False, type=click.Path(exists=False, path_type=pathlib.Path)
+)
 @pass_process_dto
 def preprocess_fakes(
     preprocess_dto: PreprocessDTO,
     batch_size: t.Optional[int],
-    storage_path: pathlib.Path,
+    storage_path: t.Optional[pathlib.Path],
+    frame_stride: int,
+    max_frames: t.Optional[int],
+    keyframe_interval: t.Optional[int],
+    detection_scale: float,
+    face_cache_path: t.Optional[pathlib.Path],
+    manifest_path: t.Optional[pathlib.Path],
 ):
     """Preprocess directory containing fake videos.
 
     Args:
         preprocess_dto: Object containing input and output path, passed via decorator.
         batch_size: Size of batch that will be used during face finding.
-        storage_path: Path that will be used to store frames extracted from videos.
+        storage_path: Path that will be used to store frames extracted from videos,
+            if not specified frames are processed in memory and never saved.
+        frame_stride: Only every n-th frame of each video is extracted.
+        max_frames: Max number of frames extracted from single video.
+        keyframe_interval: Interval between frames on which faces are detected.
+        detection_scale: Scale of frames on which faces are found.
+        face_cache_path: Path to cache of found face locations.
+        manifest_path: Path to manifest of completed work.
 
     """
-    storage_path.mkdir(parents=True, exist_ok=True)
-    frame_extractor = FrameExtractor()
+    if storage_path:
+        storage_path.mkdir(parents=True, exist_ok=True)
+    frame_extractor = FrameExtractor(frame_stride=frame_stride, max_frames=max_frames)
     # If batch size is set use CNN model
     if batch_size:
         face_extractor_model_type = FaceExtractionModel.CNN
     else:
         face_extractor_model_type = FaceExtractionModel.HOG
-    face_extractor = FaceExtractor(model=face_extractor_model_type, number_of_times_to_upsample=0)
-    preprocessor.preprocess_fakes(
-        frame_extractor=frame_extractor,
-        face_extractor=face_extractor,
-        input_path=preprocess_dto.input_path,
-        storage_path=storage_path,
-        output_path=preprocess_dto.output_path,
-        batch_size=batch_size,
-    )
+    with FaceExtractor(
+        model=face_extractor_model_type,
+        number_of_times_to_upsample=0,
+        detection_scale=detection_scale,
+        cache=FaceLocationCache(face_cache_path) if face_cache_path else None,
+    ) as face_extractor:
+        preprocessor.preprocess_fakes(
+            frame_extractor=frame_extractor,
+            face_extractor=face_extractor,
+            input_path=preprocess_dto.input_path,
+            storage_path=storage_path,
+            output_path=preprocess_dto.output_path,
+            keyframe_interval=keyframe_interval,
+            batch_size=batch_size,
+            manifest=PreprocessingManifest(manifest_path) if manifest_path else None,
+        )
@@ -6,9 +6,18 @@ import click
 
 from dfd.datasets import FrameExtractor, GeneratorSettings, preprocessor
 from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_location_cache import FaceLocationCache
 from dfd.datasets.frames_generators import ModificationGenerator
+from dfd.datasets.manifest import PreprocessingManifest
 
 from .dto import PreprocessDTO, pass_process_dto
+from .options import (
+    detection_scale_option,
+    face_cache_option,
+    manifest_option,
+    modification_seed_option,
+    workers_option,
+)
 
 
 @click.command(name="reals")
@@ -31,13 +40,47 @@ from .dto import PreprocessDTO, pass_process_dto
         + "if 'in-batches' flag is set cnn is used."
     ),
 )
-@click.argument("storage_path", type=click.Path(exists=False, path_type=pathlib.Path))
+@click.option(
+    "--frame-stride",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Extract only every n-th frame of each video.",
+)
+@click.option(
+    "--max-frames",
+    type=click.IntRange(min=1),
+    help="Max number of frames extracted from single video, defaults to all frames.",
+)
+@click.option(
+    "--keyframe-interval",
+    type=click.IntRange(min=1),
+    help=(
+        "Detect faces only on every n-th frame or on scene change and track them in between. "
+        + "Used only if frames are processed in memory, i.e. storage path is not specified."
+    ),
+)
+@detection_scale_option
+@face_cache_option
+@manifest_option
+@workers_option
+@modification_seed_option
+@click.argument(
+    "storage_path", required=False, type=click.Path(exists=False, path_type=pathlib.Path)
+)
 @pass_process_dto
 def preprocess_reals(
     preprocess_dto: PreprocessDTO,
     setting_path: t.Optional[pathlib.Path],
     model_name: str,
-    storage_path: pathlib.Path,
+    storage_path: t.Optional[pathlib.Path],
+    frame_stride: int,
+    max_frames: t.Optional[int],
+    keyframe_interval: t.Optional[int],
+    detection_scale: float,
+    face_cache_path: t.Optional[pathlib.Path],
+    manifest_path: t.Optional[pathlib.Path],
+    workers: int,
+    modification_seed: t.Optional[int],
 ):
     """Preprocess directory containing real videos.
 
@@ -45,7 +88,16 @@ def preprocess_reals(
         preprocess_dto: Object containing input and output path, passed via decorator.
         setting_path: Path to settings used to define modifications used.
         model_name: Name of model used to find faces.
-        storage_path: Path that will be used to store frames extracted from videos.
+        storage_path: Path that will be used to store frames extracted from videos,
+            if not specified frames are processed in memory and never saved.
+        frame_stride: Only every n-th frame of each video is extracted.
+        max_frames: Max number of frames extracted from single video.
+        keyframe_interval: Interval between frames on which faces are detected.
+        detection_scale: Scale of frames on which faces are found.
+        face_cache_path: Path to cache of found face locations.
+        manifest_path: Path to manifest of completed work.
+        workers: Number of threads used to load and modify frames.
+        modification_seed: Seed used to assign modifications to frames.
 
     """
     # TODO: if not settings path provided use some default settings
@@ -53,20 +105,30 @@ def preprocess_reals(
         click.echo("Settings path must points to existing file.")
         sys.exit(1)
 
-    storage_path.mkdir(parents=True, exist_ok=True)
-    frame_extractor = FrameExtractor()
+    if storage_path:
+        storage_path.mkdir(parents=True, exist_ok=True)
+    frame_extractor = FrameExtractor(frame_stride=frame_stride, max_frames=max_frames)
     # TODO: use HOG by default
-    face_extractor = FaceExtractor(FaceExtractionModel(model_name), number_of_times_to_upsample=0)
-    if setting_path:
-        modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
-    else:
-        modification_generator_settings = GeneratorSettings.default()
-    modification_generator = ModificationGenerator(settings=modification_generator_settings)
-    preprocessor.preprocess_reals(
-        frame_extractor=frame_extractor,
-        face_extractor=face_extractor,
-        modification_generator=modification_generator,
-        input_path=preprocess_dto.input_path,
-        storage_path=storage_path,
-        output_path=preprocess_dto.output_path,
-    )
+    with FaceExtractor(
+        FaceExtractionModel(model_name),
+        number_of_times_to_upsample=0,
+        detection_scale=detection_scale,
+        cache=FaceLocationCache(face_cache_path) if face_cache_path else None,
+    ) as face_extractor:
+        if setting_path:
+            modification_generator_settings = GeneratorSettings.from_yaml(setting_path)
+        else:
+            modification_generator_settings = GeneratorSettings.default()
+        modification_generator = ModificationGenerator(
+            settings=modification_generator_settings, workers=workers, seed=modification_seed
+        )
+        preprocessor.preprocess_reals(
+            frame_extractor=frame_extractor,
+            face_extractor=face_extractor,
+            modification_generator=modification_generator,
+            input_path=preprocess_dto.input_path,
+            storage_path=storage_path,
+            output_path=preprocess_dto.output_path,
+            keyframe_interval=keyframe_interval,
+            manifest=PreprocessingManifest(manifest_path) if manifest_path else None,
+        )
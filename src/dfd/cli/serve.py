@@ -0,0 +1,92 @@
+"""Serve models to local clients."""
+import pathlib
+import typing as t
+
+import click
+
+from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.models import ModelRegistry
+from dfd.serving import InferenceServer, InferenceService
+
+from .options import threads_option
+from .preprocess.options import detection_scale_option
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Host server listens on.")
+@click.option("--port", type=click.IntRange(min=0), default=8765, help="Port server listens on.")
+@click.option(
+    "--max-batch-size",
+    type=click.IntRange(min=1),
+    default=64,
+    help="Max number of faces scored by model in single call.",
+)
+@click.option(
+    "--max-latency",
+    type=click.FloatRange(min=0),
+    default=5.0,
+    help="Max number of milliseconds request waits for other requests to be scored with.",
+)
+@click.option(
+    "--face-model",
+    type=click.Choice(["hog", "cnn"], case_sensitive=False),
+    default="hog",
+    help="Model used to find faces on frames of videos.",
+)
+@detection_scale_option
+@threads_option
+@click.option(
+    "preloaded_models",
+    "--preload-model",
+    type=(str, click.Path(exists=True, path_type=pathlib.Path)),
+    multiple=True,
+    metavar="NAME PATH",
+    help="Model loaded on start, other models are loaded on first request.",
+)
+def serve(
+    host: str,
+    port: int,
+    max_batch_size: int,
+    max_latency: float,
+    face_model: str,
+    detection_scale: float,
+    num_threads: t.Optional[int],
+    preloaded_models: t.Tuple[t.Tuple[str, pathlib.Path], ...],
+):
+    """Keep models loaded and score requests sent by 'predict' and 'predict-video' commands.
+
+    Concurrent requests are scored together, throughput and latency are available
+    under /stats endpoint.
+
+    Args:
+        host: Host server listens on.
+        port: Port server listens on.
+        max_batch_size: Max number of faces scored in single call.
+        max_latency: Max number of milliseconds request waits for other requests.
+        face_model: Name of model used to find faces.
+        detection_scale: Scale of frames on which faces are found.
+        num_threads: Number of threads models run inference with.
+        preloaded_models: Names and paths of models loaded on start.
+
+    """
+    with FaceExtractor(
+        FaceExtractionModel(face_model), detection_scale=detection_scale
+    ) as face_extractor:
+        service = InferenceService(
+            ModelRegistry.default(),
+            face_extractor,
+            max_batch_size=max_batch_size,
+            max_latency=max_latency / 1000,
+            num_threads=num_threads,
+        )
+        for model_name, model_path in preloaded_models:
+            service.load_model(model_name, model_path)
+        server = InferenceServer((host, port), service)
+        click.echo(f"Serving on {server.url}, press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            click.echo("Stopping server...")
+        finally:
+            server.server_close()
+            service.close()
@@ -1,32 +1,35 @@
 """Test model on provided data."""
 import pathlib
+import typing as t
 
 import click
 
 from dfd.models import ModelRegistry
 
+from .options import model_name_option, threads_option
 from .utils import echo_metrics
 
 
 @click.command()
-@click.option(
-    "--model-name",
-    type=click.Choice(["meso_net"], case_sensitive=False),
-    default="meso_net",
-    help="Name of model used.",
-)
+@model_name_option
+@threads_option
 @click.argument("model_path", type=click.Path(exists=True, path_type=pathlib.Path))
 @click.argument("data_path", type=click.Path(exists=True, path_type=pathlib.Path))
-def test(model_name: str, model_path: pathlib.Path, data_path: pathlib.Path):
+def test(
+    model_name: str,
+    num_threads: t.Optional[int],
+    model_path: pathlib.Path,
+    data_path: pathlib.Path,
+):
     """Test model on provided data.
 
     Args:
         model_name: Name of model which will be trained.
+        num_threads: Number of threads model runs inference with.
         model_path: Path to model, optional param used to load pre-trained model.
         data_path: Path to test dataset.
 
     """
-    model_class = ModelRegistry.default().get_model_class(model_name)
-    model = model_class.load(model_path)
+    model = ModelRegistry.default().load_model(model_name, model_path, num_threads)
     metrics_dict = model.test(test_ds_path=data_path)
     echo_metrics(metrics_dict)  # TODO: pretty print
@@ -4,16 +4,13 @@ import typing as t
 
 import click
 
-from dfd.models import ModelRegistry
+from dfd.models import CacheMode, ModelRegistry, TrainingSettings
+
+from .options import model_name_option
 
 
 @click.command()
-@click.option(
-    "--model-name",
-    type=click.Choice(["meso_net"], case_sensitive=False),
-    default="meso_net",
-    help="Name of model used.",
-)
+@model_name_option
 @click.option(
     "--model-path",
     type=click.Path(exists=True, path_type=pathlib.Path),
@@ -24,12 +21,53 @@ from dfd.models import ModelRegistry
     type=click.Path(exists=False, path_type=pathlib.Path),
     help="Optional path used to save trained model model.",
 )
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=TrainingSettings().batch_size,
+    help="Number of images in single batch.",
+)
+@click.option(
+    "--epochs",
+    type=click.IntRange(min=1),
+    default=TrainingSettings().epochs,
+    help="Maximal number of epochs, training is stopped early if validation loss rises.",
+)
+@click.option(
+    "--cache",
+    type=click.Choice([cache_mode.value for cache_mode in CacheMode], case_sensitive=False),
+    default=CacheMode.NONE.value,
+    help=(
+        "Cache decoded images in memory or on disk, so images are decoded only during "
+        + "first epoch. Packed datasets are read from memory-mapped arrays and are not cached."
+    ),
+)
+@click.option(
+    "--cache-path",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    help=(
+        "Directory used to cache images on disk, cache is reused by next runs "
+        + "so it has to be removed when dataset changes."
+    ),
+)
+@click.option(
+    "--mixed-precision",
+    is_flag=True,
+    help="Compute in float16 while keeping weights in float32, faster on recent GPUs.",
+)
+@click.option("--xla", "jit_compile", is_flag=True, help="Compile training step with XLA.")
 @click.argument("train_path", type=click.Path(exists=True, path_type=pathlib.Path))
 @click.argument("validation_path", type=click.Path(exists=True, path_type=pathlib.Path))
 def train(
     model_name: str,
     model_path: t.Optional[pathlib.Path],
     output_path: t.Optional[pathlib.Path],
+    batch_size: int,
+    epochs: int,
+    cache: str,
+    cache_path: t.Optional[pathlib.Path],
+    mixed_precision: bool,
+    jit_compile: bool,
     train_path: pathlib.Path,
     validation_path: pathlib.Path,
 ):
@@ -39,16 +77,32 @@ def train(
         model_name: Name of model which will be trained.
         model_path: Path to model, optional param used to load pre-trained model.
         output_path: Path that will be used to store trained model.
+        batch_size: Number of images in single batch.
+        epochs: Maximal number of epochs.
+        cache: Where decoded images are cached.
+        cache_path: Directory used to cache images on disk.
+        mixed_precision: Whether to train with mixed precision.
+        jit_compile: Whether to compile training step with XLA.
         train_path: Path to train dataset.
         validation_path: Path to validation dataset.
 
     """
+    if cache == CacheMode.DISK.value and cache_path is None:
+        raise click.UsageError("Option --cache-path is required to cache images on disk.")
+    settings = TrainingSettings(
+        batch_size=batch_size,
+        epochs=epochs,
+        cache=CacheMode(cache),
+        cache_path=cache_path,
+        mixed_precision=mixed_precision,
+        jit_compile=jit_compile,
+    )
     model_class = ModelRegistry.default().get_model_class(model_name)
 
     if model_path:
         model = model_class.load(model_path)
     else:
         model = model_class()  # TODO: method default instead of __init__ that can be overwrite
-    model.train(train_ds_path=train_path, validation_ds_path=validation_path)
+    model.train(train_ds_path=train_path, validation_ds_path=validation_path, settings=settings)
     if output_path:
         model.save(output_path)
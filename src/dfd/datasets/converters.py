@@ -1,12 +1,76 @@
 """Converters used in frame extractors package."""
 
+from typing import Generator, NamedTuple, Optional
+
 import cv2
 import numpy as np
 
+from dfd.exceptions import DfdError
+
+
+class VideoFrame(NamedTuple):
+    """Single frame decoded from video.
+
+    Args:
+        frame_index: index of frame in original video, counted from zero
+        frame: OpenCV image. (image in BGR space)
+
+    """
+
+    frame_index: int
+    frame: np.ndarray
+
+
+def generate_video_frames(
+    filepath: str,
+    frame_stride: int = 1,
+    max_frames: Optional[int] = None,
+) -> Generator[VideoFrame, None, None]:
+    """Decode video frame by frame.
+
+    Only single decoded frame is kept in memory at the time, so memory usage does not depend
+    on video length. Frames skipped due to stride are grabbed but never decoded.
+
+    Args:
+        filepath: path to video
+        frame_stride: only every n-th frame is yielded, must be positive
+        max_frames: max number of frames yielded, if not specified all frames are yielded
+
+    Raises:
+        DfdError: if frame stride is not positive
+
+    Yields:
+        frames together with their index in original video
+
+    """
+    if frame_stride < 1:
+        raise DfdError(f"Frame stride must be positive, got {frame_stride}.")
+    capture = cv2.VideoCapture(filepath)
+    try:
+        no_yielded_frames = 0
+        frame_index = 0
+        while max_frames is None or no_yielded_frames < max_frames:
+            if frame_index % frame_stride:
+                # Skip frame without decoding it
+                if not capture.grab():
+                    break
+                frame_index += 1
+                continue
+            success, frame = capture.read()
+            if not success:
+                break
+            yield VideoFrame(frame_index=frame_index, frame=frame)
+            no_yielded_frames += 1
+            frame_index += 1
+    finally:
+        capture.release()
+
 
 def convert_video_to_frames(filepath: str) -> list[np.ndarray]:
     """Split video into frames.
 
+    Whole video is kept in memory, use ``generate_video_frames`` to process long videos.
+
     Args:
         filepath: path to video
 
@@ -14,14 +78,49 @@ def convert_video_to_frames(filepath: str) -> list[np.ndarray]:
         list of frames
 
     """
+    return [video_frame.frame for video_frame in generate_video_frames(filepath)]
+
+
+def count_video_frames(filepath: str, exact: bool = False, limit: Optional[int] = None) -> int:
+    """Get number of frames in video without decoding it.
+
+    By default number of frames is read from video container metadata, for some formats
+    it might be only an estimate. Exact number is counted by grabbing all frames, which
+    takes longer, but frames are still not decoded.
+
+    Args:
+        filepath: path to video
+        exact: count frames by grabbing them instead of reading metadata
+        limit: max number of frames grabbed while counting exactly
+
+    Returns:
+        number of frames in video, zero if video could not be opened
 
-    frames: list[np.ndarray] = []
+    """
     capture = cv2.VideoCapture(filepath)
+    try:
+        if not exact:
+            return max(int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+        no_frames = 0
+        while (limit is None or no_frames < limit) and capture.grab():
+            no_frames += 1
+        return no_frames
+    finally:
+        capture.release()
+
+
+def get_video_fps(filepath: str) -> float:
+    """Get number of frames per second of video without decoding it.
 
-    while True:
-        success, frame = capture.read()
-        if not success:
-            break
-        frames.append(frame)
+    Args:
+        filepath: path to video
 
-    return frames
+    Returns:
+        frames per second read from video container metadata, zero if unknown
+
+    """
+    capture = cv2.VideoCapture(filepath)
+    try:
+        return max(float(capture.get(cv2.CAP_PROP_FPS)), 0.0)
+    finally:
+        capture.release()
@@ -0,0 +1,179 @@
+"""Index of files in dataset directory."""
+import json
+import os
+import pathlib
+from typing import Collection, Dict, List, Optional, Sequence
+
+# Image formats decoded by both OpenCV and TensorFlow
+IMAGE_SUFFIXES = frozenset({".bmp", ".gif", ".jpeg", ".jpg", ".png"})
+
+
+class DatasetIndex:
+    """Files in dataset directory, listed once and shared by all consumers.
+
+    If directory contains class sub-directories files are labeled by class of
+    sub-directory they are placed in, otherwise files are not labeled.
+
+    Directory is walked with ``os.scandir``, so files are told apart from directories
+    without calling ``stat`` on each of them. Only modification times of walked directories
+    are recorded, they change when files are added, removed or renamed, so saved index
+    can be validated without listing directory again.
+
+    """
+
+    def __init__(
+        self,
+        root: pathlib.Path,
+        relative_paths: Sequence[str],
+        labels: Optional[Sequence[int]],
+        class_names: Sequence[str],
+        directory_times: Dict[str, int],
+    ) -> None:
+        """Initialize DatasetIndex.
+
+        Args:
+            root: Path to indexed directory.
+            relative_paths: Paths to files relative to root, sorted within each class.
+            labels: Index of class of each file, None if files are not labeled.
+            class_names: Names of class sub-directories, ordered by class index.
+            directory_times: Modification times of walked directories, relative to root.
+
+        """
+        self._root = root
+        self._relative_paths = list(relative_paths)
+        self._labels = None if labels is None else list(labels)
+        self._class_names = list(class_names)
+        self._directory_times = directory_times
+        self._file_paths: Optional[List[pathlib.Path]] = None
+
+    @classmethod
+    def build(
+        cls,
+        root: pathlib.Path,
+        class_names: Sequence[str] = (),
+        recursive: bool = True,
+        suffixes: Optional[Collection[str]] = None,
+    ) -> "DatasetIndex":
+        """List files in directory.
+
+        Args:
+            root: Path to indexed directory.
+            class_names: Names of class sub-directories, ordered by class index.
+            recursive: Whether files in nested directories are listed as well.
+            suffixes: Lowercase suffixes of listed files, e.g. ``IMAGE_SUFFIXES``, so
+                other files such as ``.DS_Store`` are skipped. All files are listed if None.
+
+        Returns:
+            Built index.
+
+        """
+        directory_times: Dict[str, int] = {}
+        class_directories = [root.joinpath(class_name) for class_name in class_names]
+        if not any(class_directory.is_dir() for class_directory in class_directories):
+            # No class directories, files are not labeled
+            relative_paths = sorted(_walk(root, root, recursive, suffixes, directory_times))
+            return cls(root, relative_paths, None, class_names, directory_times)
+        # Root changes when class directory is added or removed
+        directory_times["."] = root.stat().st_mtime_ns
+        relative_paths = []
+        labels: List[int] = []
+        for label, class_directory in enumerate(class_directories):
+            class_relative_paths = sorted(
+                _walk(root, class_directory, recursive, suffixes, directory_times)
+            )
+            relative_paths.extend(class_relative_paths)
+            labels.extend([label] * len(class_relative_paths))
+        return cls(root, relative_paths, labels, class_names, directory_times)
+
+    @property
+    def root(self) -> pathlib.Path:
+        """Path to indexed directory."""
+        return self._root
+
+    @property
+    def file_paths(self) -> List[pathlib.Path]:
+        """Paths to indexed files."""
+        if self._file_paths is None:
+            self._file_paths = [self._root.joinpath(path) for path in self._relative_paths]
+        return self._file_paths
+
+    @property
+    def labels(self) -> Optional[List[int]]:
+        """Index of class of each file, None if files are not labeled."""
+        return self._labels
+
+    @property
+    def class_names(self) -> List[str]:
+        """Names of class sub-directories, ordered by class index."""
+        return self._class_names
+
+    def __len__(self) -> int:
+        return len(self._relative_paths)
+
+    def count(self, label: int) -> int:
+        """Count files of given class, zero if files are not labeled."""
+        if self._labels is None:
+            return 0
+        return self._labels.count(label)
+
+    def is_up_to_date(self) -> bool:
+        """Check if no file was added, removed or renamed since directory was indexed."""
+        for relative_path, modification_time in self._directory_times.items():
+            try:
+                if self._root.joinpath(relative_path).stat().st_mtime_ns != modification_time:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def to_json(self) -> str:
+        """Serialize index to JSON."""
+        return json.dumps(
+            {
+                "root": str(self._root),
+                "relative_paths": self._relative_paths,
+                "labels": self._labels,
+                "class_names": self._class_names,
+                "directory_times": self._directory_times,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, serialized_index: str) -> "DatasetIndex":
+        """Deserialize index from JSON, see ``to_json``."""
+        index = json.loads(serialized_index)
+        return cls(
+            root=pathlib.Path(index["root"]),
+            relative_paths=index["relative_paths"],
+            labels=index["labels"],
+            class_names=index["class_names"],
+            directory_times=index["directory_times"],
+        )
+
+
+def _walk(
+    root: pathlib.Path,
+    directory: pathlib.Path,
+    recursive: bool,
+    suffixes: Optional[Collection[str]],
+    directory_times: Dict[str, int],
+) -> List[str]:
+    """List files in directory, paths are relative to root and use forward slashes."""
+    relative_paths: List[str] = []
+    if not directory.is_dir():
+        return relative_paths
+    relative_directory = directory.relative_to(root).as_posix()
+    directory_times[relative_directory] = directory.stat().st_mtime_ns
+    prefix = "" if relative_directory == "." else f"{relative_directory}/"
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                if suffixes is None or os.path.splitext(entry.name)[1].lower() in suffixes:
+                    relative_paths.append(prefix + entry.name)
+            elif recursive and entry.is_dir():
+                relative_paths.extend(
+                    _walk(
+                        root, directory.joinpath(entry.name), recursive, suffixes, directory_times
+                    )
+                )
+    return relative_paths
@@ -1,55 +1,124 @@
 """Face extractor."""
 
 import enum
+import functools
 import math
-from typing import NamedTuple, Tuple, Sequence, List, Iterable
+import os
+import threading
+from concurrent import futures
+from typing import List, Optional, Sequence, Tuple, cast
 
 import cv2 as cv
-import face_recognition
 import numpy as np
 
 from dfd.consts import MODEL_INPUT_SIZE
 from dfd.exceptions import DfdError
 
+from .face_location import FaceLocation
+from .face_location_cache import FaceLocationCache
+
 
 class FaceExtractionModel(enum.Enum):
     HOG = "hog"
     CNN = "cnn"
 
 
-class FaceLocation(NamedTuple):
-    """Face location, rectangle."""
+class FaceExtractionEngine(enum.Enum):
+    """Engine used to find faces in batch of frames.
 
-    top: int
-    right: int
-    bottom: int
-    left: int
+    DLIB_BATCH uses dlib batch API, it supports only CNN model and pays off when GPU is used.
+    THREAD_POOL and PROCESS_POOL find faces on each frame separately using pool of workers,
+    they support both models and are intended for CPU only machines.
 
-    @classmethod
-    def from_tuple(cls, locations_tuple: Tuple[int, int, int, int]) -> "FaceLocation":
-        """Convert raw tuple into FaceLocation.
+    """
 
-        Args:
-            locations_tuple: tuple of face locations, in order: top, right, bottom, left
+    DLIB_BATCH = "dlib-batch"
+    THREAD_POOL = "threads"
+    PROCESS_POOL = "processes"
 
-        Returns:
-            FaceLocation instance
 
-        """
-        return cls(
-            top=locations_tuple[0],
-            right=locations_tuple[1],
-            bottom=locations_tuple[2],
-            left=locations_tuple[3],
-        )
+def _locate_faces(
+    frame_in_rgb: np.ndarray, model_name: str, number_of_times_to_upsample: int
+) -> List[Tuple[int, int, int, int]]:
+    """Find faces on single frame.
+
+    Defined on module level so it can be sent to worker processes.
+
+    """
+    # Imported on use, importing loads dlib and its models which slows down start-up
+    import face_recognition
+
+    face_locations = face_recognition.face_locations(
+        frame_in_rgb,
+        model=model_name,
+        number_of_times_to_upsample=number_of_times_to_upsample,
+    )
+    return cast(List[Tuple[int, int, int, int]], face_locations)
 
 
 class FaceExtractor:
     """Extract face from original frame."""
 
-    def __init__(self, model: FaceExtractionModel, number_of_times_to_upsample: int = 0) -> None:
+    def __init__(
+        self,
+        model: FaceExtractionModel,
+        number_of_times_to_upsample: int = 0,
+        batch_engine: Optional[FaceExtractionEngine] = None,
+        workers: Optional[int] = None,
+        detection_scale: float = 1.0,
+        cache: Optional[FaceLocationCache] = None,
+    ) -> None:
+        """Initialize FaceExtractor.
+
+        Args:
+            model: Model used to find faces.
+            number_of_times_to_upsample: How many times frame is upsampled before finding faces.
+            batch_engine: Engine used to find faces in batch of frames, if not specified
+                dlib batch API is used for CNN and pool of processes for HOG.
+            workers: Number of workers used by pool based engines, defaults to number of CPUs.
+            detection_scale: Scale of frame on which faces are found, e.g. for 0.25 faces are
+                found on frame four times smaller than original. Faces are still cropped
+                from original frame.
+            cache: Cache of face locations, if provided faces are searched only on frames
+                that were not processed by the same detector before.
+
+        Raises:
+            DfdError: if selected engine does not support selected model
+                or detection scale is not in (0, 1] range.
+
+        """
+        if batch_engine is None:
+            if model == FaceExtractionModel.CNN:
+                batch_engine = FaceExtractionEngine.DLIB_BATCH
+            else:
+                batch_engine = FaceExtractionEngine.PROCESS_POOL
+        if batch_engine == FaceExtractionEngine.DLIB_BATCH and model != FaceExtractionModel.CNN:
+            raise DfdError(f"Engine {batch_engine.value} supports only CNN model.")
+        if not 0 < detection_scale <= 1:
+            raise DfdError(f"Detection scale must be in (0, 1] range, got {detection_scale}.")
         self._model_name = model.value
         self._number_of_times_to_upsample = number_of_times_to_upsample
+        self._batch_engine = batch_engine
+        self._workers = workers or os.cpu_count()
+        self._detection_scale = detection_scale
+        self._cache = cache
+        self._detector_id = f"{model.value}_{number_of_times_to_upsample}_{detection_scale}"
+        self._executor: Optional[futures.Executor] = None
+        # Extractor is shared by threads of inference server, so pool is started only once
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self) -> "FaceExtractor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release workers used to find faces in batches, if any were started."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
 
     def extract(self, frame: np.ndarray) -> np.ndarray:
         """Extract face from original frame.
@@ -61,21 +130,7 @@ class FaceExtractor:
             Single extracted face, if no face was found original image is returned.
 
         """
-        frame_in_rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
-        face_location_raws = face_recognition.face_locations(
-            frame_in_rgb,
-            model=self._model_name,
-            number_of_times_to_upsample=self._number_of_times_to_upsample,
-        )
-        face_locations = [
-            FaceLocation.from_tuple(location_tuple) for location_tuple in face_location_raws
-        ]
-        # If no face was found return original frame
-        if not face_locations:
-            return frame
-        selected_face_location = face_locations[0]
-        face = self._select_face(frame, selected_face_location)
-        return face
+        return self.crop(frame, self.locate(frame))
 
     def extract_batch(self, frames_batch: Sequence[np.ndarray]) -> List[np.ndarray]:
         """Extract faces from batch of frame.
@@ -87,41 +142,182 @@ class FaceExtractor:
             Batch of found faces, one per frame, if no face was found original frame is returned.
 
         """
-        frames_in_rgb = [cv.cvtColor(frame, cv.COLOR_BGR2RGB) for frame in frames_batch]
-        faces_batch: List[np.ndarray] = []
-        face_locations_batch = face_recognition.batch_face_locations(
-            frames_in_rgb,
-            batch_size=len(frames_in_rgb),
-            number_of_times_to_upsample=self._number_of_times_to_upsample,
+        face_locations_batch = self.locate_batch(frames_batch)
+        return [
+            self.crop(frame, face_location)
+            for frame, face_location in zip(frames_batch, face_locations_batch)
+        ]
+
+    def locate(self, frame: np.ndarray) -> Optional[FaceLocation]:
+        """Find face on original frame.
+
+        Args:
+            frame: OpenCV image. (image in BGR space)
+
+        Returns:
+            Location of first found face, None if no face was found.
+
+        """
+        if self._cache is None:
+            return self._detect(frame)
+        frame_key = self._cache.hash_frame(frame)
+        cached_face_location = self._cache.get(frame_key, self._detector_id)
+        if cached_face_location is not None:
+            return cached_face_location.face_location
+        face_location = self._detect(frame)
+        self._cache.put(frame_key, self._detector_id, face_location)
+        return face_location
+
+    def locate_batch(self, frames_batch: Sequence[np.ndarray]) -> List[Optional[FaceLocation]]:
+        """Find faces on batch of frames using configured engine.
+
+        Args:
+            frames_batch: batch of OpenCV image. (images in BGR space)
+
+        Returns:
+            Location of first found face for each frame, None if no face was found.
+
+        """
+        if self._cache is None:
+            return self._detect_batch(frames_batch)
+        face_locations: List[Optional[FaceLocation]] = [None] * len(frames_batch)
+        frame_keys = [self._cache.hash_frame(frame) for frame in frames_batch]
+        not_cached_indexes: List[int] = []
+        for frame_index, frame_key in enumerate(frame_keys):
+            cached_face_location = self._cache.get(frame_key, self._detector_id)
+            if cached_face_location is None:
+                not_cached_indexes.append(frame_index)
+            else:
+                face_locations[frame_index] = cached_face_location.face_location
+        detected_face_locations = self._detect_batch(
+            [frames_batch[frame_index] for frame_index in not_cached_indexes]
         )
-        for frame_index, face_location_raws in enumerate(face_locations_batch):
-            # If no face was found append original frame
-            if not face_location_raws:
-                faces_batch.append(frames_batch[frame_index])
-                continue
-            face_locations = [
-                FaceLocation.from_tuple(location_tuple) for location_tuple in face_location_raws
-            ]
-            selected_face_location = face_locations[0]
-            face = self._select_face(frames_batch[frame_index], selected_face_location)
-            faces_batch.append(face)
-        return faces_batch
-
-    def _select_face(
+        for frame_index, face_location in zip(not_cached_indexes, detected_face_locations):
+            face_locations[frame_index] = face_location
+            self._cache.put(frame_keys[frame_index], self._detector_id, face_location)
+        return face_locations
+
+    def crop(self, frame: np.ndarray, face_location: Optional[FaceLocation]) -> np.ndarray:
+        """Crop face from original frame.
+
+        Args:
+            frame: OpenCV image. (image in BGR space)
+            face_location: Location of face on frame.
+
+        Returns:
+            Cropped face, if no face location is provided original frame is returned.
+
+        """
+        # If no face was found return original frame
+        if face_location is None:
+            return frame
+        return self._select_face(frame, face_location)
+
+    def _detect(self, frame: np.ndarray) -> Optional[FaceLocation]:
+        face_location_raws = _locate_faces(
+            self._prepare_for_detection(frame),
+            self._model_name,
+            self._number_of_times_to_upsample,
+        )
+        return self._select_first_location(face_location_raws, frame.shape)
+
+    def _detect_batch(self, frames_batch: Sequence[np.ndarray]) -> List[Optional[FaceLocation]]:
+        if not frames_batch:
+            return []
+        frames_in_rgb = [self._prepare_for_detection(frame) for frame in frames_batch]
+        if self._batch_engine == FaceExtractionEngine.DLIB_BATCH:
+            import face_recognition
+
+            face_locations_batch = face_recognition.batch_face_locations(
+                frames_in_rgb,
+                batch_size=len(frames_in_rgb),
+                number_of_times_to_upsample=self._number_of_times_to_upsample,
+            )
+        else:
+            locate_faces = functools.partial(
+                _locate_faces,
+                model_name=self._model_name,
+                number_of_times_to_upsample=self._number_of_times_to_upsample,
+            )
+            face_locations_batch = self._get_executor().map(locate_faces, frames_in_rgb)
+        return [
+            self._select_first_location(face_location_raws, frame.shape)
+            for face_location_raws, frame in zip(face_locations_batch, frames_batch)
+        ]
+
+    def _get_executor(self) -> futures.Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                if self._batch_engine == FaceExtractionEngine.THREAD_POOL:
+                    self._executor = futures.ThreadPoolExecutor(max_workers=self._workers)
+                else:
+                    self._executor = futures.ProcessPoolExecutor(max_workers=self._workers)
+            return self._executor
+
+    def _prepare_for_detection(self, frame: np.ndarray) -> np.ndarray:
+        if self._detection_scale != 1:
+            # Downscale before color conversion, so conversion is performed on fewer pixels
+            frame = cv.resize(
+                frame,
+                dsize=None,
+                fx=self._detection_scale,
+                fy=self._detection_scale,
+                interpolation=cv.INTER_AREA,
+            )
+        return cv.cvtColor(frame, cv.COLOR_BGR2RGB)
+
+    def _select_first_location(
+        self,
+        face_location_raws: Sequence[Tuple[int, int, int, int]],
+        frame_shape: Tuple[int, ...],
+    ) -> Optional[FaceLocation]:
+        if not face_location_raws:
+            return None
+        face_location = FaceLocation.from_tuple(face_location_raws[0])
+        if self._detection_scale == 1:
+            return face_location
+        # Map location found on downscaled frame back to original frame
+        frame_height, frame_width = frame_shape[:2]
+        top, right, bottom, left = (
+            round(coordinate / self._detection_scale) for coordinate in face_location
+        )
+        return FaceLocation(
+            top=max(top, 0),
+            right=min(right, frame_width),
+            bottom=min(bottom, frame_height),
+            left=max(left, 0),
+        )
+
+    def get_crop_location(
         self,
-        frame: np.ndarray,
+        frame_shape: Tuple[int, ...],
         face_location: FaceLocation,
         preferred_size: Tuple[int, int] = MODEL_INPUT_SIZE,
-    ) -> np.ndarray:
+    ) -> FaceLocation:
+        """Get location of area cropped around face, see ``crop``.
+
+        Args:
+            frame_shape: Shape of frame on which face was found.
+            face_location: Location of face on frame.
+            preferred_size: Min size of cropped area, if frame is large enough.
+
+        Returns:
+            Location of cropped area on frame.
+
+        """
         top, right, bottom, left = face_location
         pref_width, pref_height = preferred_size
-        frame_height = frame.shape[0]
-        frame_width = frame.shape[1]
+        frame_height = frame_shape[0]
+        frame_width = frame_shape[1]
         # Add margin to bounds
         top, bottom = self._expand_range(top, bottom, pref_height)
         top, bottom = self._adjust_range(top, bottom, frame_height)
         left, right = self._expand_range(left, right, pref_width)
         left, right = self._adjust_range(left, right, frame_width)
+        return FaceLocation(top=top, right=right, bottom=bottom, left=left)
+
+    def _select_face(self, frame: np.ndarray, face_location: FaceLocation) -> np.ndarray:
+        top, right, bottom, left = self.get_crop_location(frame.shape, face_location)
         return frame[top:bottom, left:right]
 
     # TODO: dedicated type / struct for range
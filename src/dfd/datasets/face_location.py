@@ -0,0 +1,29 @@
+"""Face location."""
+from typing import NamedTuple, Tuple
+
+
+class FaceLocation(NamedTuple):
+    """Face location, rectangle."""
+
+    top: int
+    right: int
+    bottom: int
+    left: int
+
+    @classmethod
+    def from_tuple(cls, locations_tuple: Tuple[int, int, int, int]) -> "FaceLocation":
+        """Convert raw tuple into FaceLocation.
+
+        Args:
+            locations_tuple: tuple of face locations, in order: top, right, bottom, left
+
+        Returns:
+            FaceLocation instance
+
+        """
+        return cls(
+            top=locations_tuple[0],
+            right=locations_tuple[1],
+            bottom=locations_tuple[2],
+            left=locations_tuple[3],
+        )
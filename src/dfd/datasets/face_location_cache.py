@@ -0,0 +1,115 @@
+"""Persistent cache of face locations."""
+import hashlib
+import pathlib
+import sqlite3
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .face_location import FaceLocation
+
+
+class CachedFaceLocation(NamedTuple):
+    """Cached result of face detection, face location is None if no face was found."""
+
+    face_location: Optional[FaceLocation]
+
+
+class FaceLocationCache:
+    """Persistent cache mapping frames to locations of faces found on them.
+
+    Frames are identified by keys, by default hash of frame content is used so
+    the same frame is recognised across runs and pipeline stages. Results of different
+    detectors are stored separately.
+
+    Cache is backed by SQLite database, each stored location is committed immediately,
+    so results are preserved even if processing is interrupted.
+
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        """Initialize FaceLocationCache.
+
+        Args:
+            path: Path to cache file, created if it does not exist.
+
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS face_locations ("
+            + "frame_key TEXT NOT NULL, "
+            + "detector TEXT NOT NULL, "
+            + "top INTEGER, "
+            + "right INTEGER, "
+            + "bottom INTEGER, "
+            + "left INTEGER, "
+            + "PRIMARY KEY (frame_key, detector))"
+        )
+
+    def __enter__(self) -> "FaceLocationCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def hash_frame(frame: np.ndarray) -> str:
+        """Calculate key identifying frame by its content.
+
+        Args:
+            frame: OpenCV image.
+
+        Returns:
+            Hash of frame content and shape.
+
+        """
+        frame_hash = hashlib.blake2b(digest_size=16)
+        frame_hash.update(str(frame.shape).encode())
+        frame_hash.update(np.ascontiguousarray(frame).data)
+        return frame_hash.hexdigest()
+
+    def get(self, frame_key: str, detector: str) -> Optional[CachedFaceLocation]:
+        """Get cached face location.
+
+        Args:
+            frame_key: Key identifying frame.
+            detector: Identifier of detector used to find face.
+
+        Returns:
+            Cached face location, None if frame was not processed by given detector yet.
+
+        """
+        row = self._connection.execute(
+            "SELECT top, right, bottom, left FROM face_locations "
+            + "WHERE frame_key = ? AND detector = ?",
+            (frame_key, detector),
+        ).fetchone()
+        if row is None:
+            return None
+        if row[0] is None:
+            return CachedFaceLocation(face_location=None)
+        return CachedFaceLocation(face_location=FaceLocation.from_tuple(row))
+
+    def put(self, frame_key: str, detector: str, face_location: Optional[FaceLocation]) -> None:
+        """Store face location.
+
+        Args:
+            frame_key: Key identifying frame.
+            detector: Identifier of detector used to find face.
+            face_location: Found face location, None if no face was found.
+
+        """
+        coordinates: Tuple[Optional[int], ...] = (None, None, None, None)
+        if face_location is not None:
+            coordinates = tuple(int(coordinate) for coordinate in face_location)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO face_locations VALUES (?, ?, ?, ?, ?, ?)",
+            (frame_key, detector, *coordinates),
+        )
+
+    def close(self) -> None:
+        """Close underlying database connection."""
+        self._connection.close()
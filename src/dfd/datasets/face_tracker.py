@@ -0,0 +1,161 @@
+"""Face tracker."""
+from typing import Optional, Tuple
+
+import cv2 as cv
+import numpy as np
+
+from .face_extractor import FaceExtractor, FaceLocation
+
+_THUMBNAIL_SIZE = (64, 36)
+
+
+class FaceTracker:
+    """Find faces on consecutive frames of single video.
+
+    Face is detected only on keyframes, i.e. every n-th frame or frame on which scene changes.
+    On remaining frames face found on last keyframe is tracked inside small search window
+    using template matching. If face cannot be tracked with sufficient confidence
+    frame is treated as keyframe and face is detected again.
+
+    Tracker is stateful, ``reset`` must be called before processing frames of new video.
+
+    """
+
+    def __init__(
+        self,
+        face_extractor: FaceExtractor,
+        keyframe_interval: int = 10,
+        scene_change_threshold: float = 30.0,
+        min_tracking_confidence: float = 0.7,
+        search_margin: float = 0.25,
+    ) -> None:
+        """Initialize FaceTracker.
+
+        Args:
+            face_extractor: Face extractor used to detect faces on keyframes.
+            keyframe_interval: Face is detected at least once per given number of frames.
+            scene_change_threshold: Mean absolute difference between downscaled grayscale
+                consecutive frames, from 0 to 255, above which scene is considered changed.
+            min_tracking_confidence: Min normalized correlation between face found on keyframe
+                and tracked face, if not achieved face is detected again.
+            search_margin: Margin added to each side of last face location while tracking,
+                relative to face size.
+
+        """
+        self._face_extractor = face_extractor
+        self._keyframe_interval = keyframe_interval
+        self._scene_change_threshold = scene_change_threshold
+        self._min_tracking_confidence = min_tracking_confidence
+        self._search_margin = search_margin
+        self._face_location: Optional[FaceLocation] = None
+        self._face_template: Optional[np.ndarray] = None
+        self._previous_thumbnail: Optional[np.ndarray] = None
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._no_frames_since_keyframe = 0
+
+    def reset(self) -> None:
+        """Forget tracked face, next processed frame is treated as keyframe."""
+        self._face_location = None
+        self._face_template = None
+        self._previous_thumbnail = None
+        self._frame_shape = None
+        self._no_frames_since_keyframe = 0
+
+    def extract(self, frame: np.ndarray) -> np.ndarray:
+        """Extract face from next frame of video.
+
+        Args:
+            frame: OpenCV image. (image in BGR space)
+
+        Returns:
+            Single extracted face, if no face was found original image is returned.
+
+        """
+        return self.crop(frame, self.locate(frame))
+
+    def crop(self, frame: np.ndarray, face_location: Optional[FaceLocation]) -> np.ndarray:
+        """Crop face from frame, see ``FaceExtractor.crop``."""
+        return self._face_extractor.crop(frame, face_location)
+
+    def get_crop_location(
+        self, frame_shape: Tuple[int, ...], face_location: FaceLocation
+    ) -> FaceLocation:
+        """Get location of area cropped around face, see ``FaceExtractor.get_crop_location``."""
+        return self._face_extractor.get_crop_location(frame_shape, face_location)
+
+    def locate(self, frame: np.ndarray) -> Optional[FaceLocation]:
+        """Find face on next frame of video.
+
+        Args:
+            frame: OpenCV image. (image in BGR space)
+
+        Returns:
+            Location of face, None if no face was found on last keyframe.
+
+        """
+        gray_frame = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+        self._no_frames_since_keyframe += 1
+        if not self._is_keyframe(gray_frame):
+            # No face was found on last keyframe, there is nothing to track
+            if self._face_location is None:
+                return None
+            tracked_face_location = self._track(gray_frame)
+            if tracked_face_location is not None:
+                self._face_location = tracked_face_location
+                return tracked_face_location
+        return self._detect(frame, gray_frame)
+
+    def _is_keyframe(self, gray_frame: np.ndarray) -> bool:
+        thumbnail = cv.resize(gray_frame, _THUMBNAIL_SIZE, interpolation=cv.INTER_AREA)
+        previous_thumbnail = self._previous_thumbnail
+        self._previous_thumbnail = thumbnail
+        if previous_thumbnail is None or self._no_frames_since_keyframe >= self._keyframe_interval:
+            return True
+        if gray_frame.shape != self._frame_shape:
+            return True
+        scene_difference = float(np.mean(cv.absdiff(thumbnail, previous_thumbnail)))
+        return scene_difference > self._scene_change_threshold
+
+    def _detect(self, frame: np.ndarray, gray_frame: np.ndarray) -> Optional[FaceLocation]:
+        self._no_frames_since_keyframe = 0
+        self._frame_shape = gray_frame.shape
+        self._face_location = self._face_extractor.locate(frame)
+        if self._face_location is None:
+            self._face_template = None
+            return None
+        top, right, bottom, left = self._face_location
+        self._face_template = gray_frame[top:bottom, left:right].copy()
+        return self._face_location
+
+    def _track(self, gray_frame: np.ndarray) -> Optional[FaceLocation]:
+        if self._face_location is None or self._face_template is None:
+            return None
+        top, right, bottom, left = self._face_location
+        frame_height, frame_width = gray_frame.shape
+        vertical_margin = int((bottom - top) * self._search_margin)
+        horizontal_margin = int((right - left) * self._search_margin)
+        window_top = max(top - vertical_margin, 0)
+        window_bottom = min(bottom + vertical_margin, frame_height)
+        window_left = max(left - horizontal_margin, 0)
+        window_right = min(right + horizontal_margin, frame_width)
+        search_window = gray_frame[window_top:window_bottom, window_left:window_right]
+        template_height, template_width = self._face_template.shape
+        if (
+            search_window.shape[0] < template_height
+            or search_window.shape[1] < template_width
+            or template_height == 0
+            or template_width == 0
+        ):
+            return None
+        matches = cv.matchTemplate(search_window, self._face_template, cv.TM_CCOEFF_NORMED)
+        _, confidence, _, (match_left, match_top) = cv.minMaxLoc(matches)
+        if confidence < self._min_tracking_confidence:
+            return None
+        new_top = window_top + match_top
+        new_left = window_left + match_left
+        return FaceLocation(
+            top=new_top,
+            right=new_left + template_width,
+            bottom=new_top + template_height,
+            left=new_left,
+        )
@@ -1,12 +1,80 @@
 """Extract fom videos frames."""
+import functools
+import math
+from concurrent import futures
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Generator, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 import cv2
 import numpy as np
 from tqdm import tqdm
 
-from .converters import convert_video_to_frames
+from .converters import count_video_frames, generate_video_frames
+from .manifest import PreprocessingManifest
+
+FRAMES_STAGE = "frames"
+
+
+class ExtractedFrame(NamedTuple):
+    """Frame extracted from video."""
+
+    video_prefix: str
+    frame_index: int
+    frame: np.ndarray
+
+    @property
+    def name(self) -> str:
+        """Name of file used to store frame."""
+        return _get_frame_name(self.video_prefix, self.frame_index)
+
+
+def _get_frame_name(video_prefix: str, frame_index: int) -> str:
+    return "{0}_{1}.png".format(video_prefix, frame_index)
+
+
+def _get_video_prefix(video: Path) -> str:
+    return video.name.split(".")[0]
+
+
+def _initialize_worker() -> None:
+    # Videos are already processed in parallel, avoid oversubscription by OpenCV threads
+    cv2.setNumThreads(1)
+
+
+def _generate_extracted_frames(
+    video: Path,
+    frame_stride: int,
+    max_frames: Optional[int],
+) -> Generator[ExtractedFrame, None, None]:
+    video_prefix = _get_video_prefix(video)
+    for frame_index, frame in generate_video_frames(
+        filepath=str(video),
+        frame_stride=frame_stride,
+        max_frames=max_frames,
+    ):
+        yield ExtractedFrame(video_prefix=video_prefix, frame_index=frame_index, frame=frame)
+
+
+def _extract_single_video(
+    video: Path,
+    output_path: Path,
+    frame_stride: int,
+    max_frames: Optional[int],
+) -> List[str]:
+    """Extract frames from single video.
+
+    Defined on module level so it can be sent to worker processes.
+
+    Returns:
+        paths to saved frames
+
+    """
+    saved_frame_paths = []
+    for extracted_frame in _generate_extracted_frames(video, frame_stride, max_frames):
+        frame_path = output_path.joinpath(extracted_frame.name)
+        FrameExtractor._save_video_frame(extracted_frame.frame, str(frame_path))
+        saved_frame_paths.append(str(frame_path))
+    return saved_frame_paths
 
 
 class FrameExtractor:
@@ -18,35 +86,220 @@ class FrameExtractor:
 
     """
 
+    def __init__(
+        self,
+        frame_stride: int = 1,
+        max_frames: Optional[int] = None,
+        workers: int = 1,
+    ) -> None:
+        """Initialize FrameExtractor.
+
+        Args:
+            frame_stride: only every n-th frame of each video is extracted.
+            max_frames: max number of frames extracted from single video,
+                if not specified all frames are extracted.
+            workers: number of processes used to extract frames, videos are spread
+                over processes. If equal to one videos are processed in current process.
+
+        """
+        self._frame_stride = frame_stride
+        self._max_frames = max_frames
+        self._workers = workers
+
     def extract_batch(
         self,
         input_path: Path,
         output_path: Path,
         lower_bound: Optional[int] = None,
         upper_bound: Optional[int] = None,
+        manifest: Optional[PreprocessingManifest] = None,
     ) -> None:
         """Extract frames from batch of videos.
 
         Split videos into frames and save them into output directory.
         If boundaries are not specified frames_extractor all videos from input directory.
-        Frames are saved in files named by number in which they were produced.
-        Starting number is determined by number of files already existing in directory.
+        Frames are saved in files named by index of frame in original video.
+        Videos are decoded frame by frame, so memory usage does not depend on videos length.
+        Output does not depend on number of workers used.
+        If manifest is provided videos from which frames were already extracted are skipped,
+        unless they changed since, and each processed video is recorded in manifest.
 
         Args:
             input_path: path to directory containing videos.
             output_path: path to directory where frames from videos should be saved.
             lower_bound: lower batch boundary.
             upper_bound: upper batch boundary.
+            manifest: manifest of completed work.
 
         """
+        processed_input_videos = self._select_videos(input_path, lower_bound, upper_bound)
+        fingerprints: Dict[Path, str] = {}
+        if manifest is not None:
+            pending_videos = manifest.select_pending(
+                FRAMES_STAGE, output_path, processed_input_videos
+            )
+            fingerprints = {video: fingerprint for video, fingerprint in pending_videos}
+            processed_input_videos = list(fingerprints)
+        extract_single_video = functools.partial(
+            _extract_single_video,
+            output_path=output_path,
+            frame_stride=self._frame_stride,
+            max_frames=self._max_frames,
+        )
+        with tqdm(total=len(processed_input_videos), desc="extract frames") as progress_bar:
+            no_saved_frames = 0
+            for video, saved_frame_paths in self._map_videos(
+                extract_single_video, processed_input_videos
+            ):
+                if manifest is not None:
+                    manifest.put(
+                        FRAMES_STAGE,
+                        output_path,
+                        str(video),
+                        fingerprints[video],
+                        saved_frame_paths,
+                    )
+                no_saved_frames += len(saved_frame_paths)
+                progress_bar.update()
+                progress_bar.set_postfix(frames=no_saved_frames)
+
+    def generate_batch(
+        self,
+        input_path: Path,
+        lower_bound: Optional[int] = None,
+        upper_bound: Optional[int] = None,
+    ) -> Generator[ExtractedFrame, None, None]:
+        """Generate frames from batch of videos without saving them.
+
+        Frames are yielded in the same order and under the same names as the ones
+        saved by ``extract_batch``. Videos are decoded frame by frame in current process.
+
+        Args:
+            input_path: path to directory containing videos.
+            lower_bound: lower batch boundary.
+            upper_bound: upper batch boundary.
+
+        Yields:
+            frames extracted from videos
+
+        """
+        yield from self.generate_from_videos(
+            self._select_videos(input_path, lower_bound, upper_bound)
+        )
+
+    def generate_from_videos(self, videos: Iterable[Path]) -> Generator[ExtractedFrame, None, None]:
+        """Generate frames from given videos without saving them.
+
+        Args:
+            videos: paths to videos.
+
+        Yields:
+            frames extracted from videos
+
+        """
+        for video in videos:
+            yield from _generate_extracted_frames(video, self._frame_stride, self._max_frames)
+
+    def count_frames(
+        self,
+        input_path: Path,
+        lower_bound: Optional[int] = None,
+        upper_bound: Optional[int] = None,
+        exact: bool = False,
+    ) -> int:
+        """Count frames that will be extracted from batch of videos.
+
+        Videos are not decoded, by default number of frames is estimated from videos metadata.
+
+        Args:
+            input_path: path to directory containing videos.
+            lower_bound: lower batch boundary.
+            upper_bound: upper batch boundary.
+            exact: count frames by grabbing them, see ``count_video_frames``.
+
+        Returns:
+            number of extracted frames
+
+        """
+        return self.count_frames_in_videos(
+            self._select_videos(input_path, lower_bound, upper_bound), exact=exact
+        )
+
+    def count_frames_in_videos(self, videos: Iterable[Path], exact: bool = False) -> int:
+        """Count frames that will be extracted from given videos.
+
+        Args:
+            videos: paths to videos.
+            exact: count frames by grabbing them instead of estimating their number
+                from videos metadata, see ``count_video_frames``.
+
+        Returns:
+            number of extracted frames
+
+        """
+        no_frames = 0
+        for video in videos:
+            no_video_frames = math.ceil(
+                count_video_frames(str(video), exact=exact, limit=self._get_limit())
+                / self._frame_stride
+            )
+            if self._max_frames is not None:
+                no_video_frames = min(no_video_frames, self._max_frames)
+            no_frames += no_video_frames
+        return no_frames
+
+    def list_frame_names(self, videos: Iterable[Path]) -> List[str]:
+        """List names of frames that will be extracted from given videos.
+
+        Frames are counted exactly without being decoded, see ``count_video_frames``,
+        names are the same as the ones used by ``extract_batch``.
+
+        Args:
+            videos: paths to videos.
+
+        Returns:
+            names of extracted frames, in order in which frames are extracted
+
+        """
+        frame_names: List[str] = []
+        for video in videos:
+            no_video_frames = count_video_frames(str(video), exact=True, limit=self._get_limit())
+            frame_indices = range(0, no_video_frames, self._frame_stride)[: self._max_frames]
+            video_prefix = _get_video_prefix(video)
+            frame_names.extend(
+                _get_frame_name(video_prefix, frame_index) for frame_index in frame_indices
+            )
+        return frame_names
+
+    def _get_limit(self) -> Optional[int]:
+        """Get number of frames grabbed from video, frames after last extracted one are skipped."""
+        if self._max_frames is None:
+            return None
+        return (self._max_frames - 1) * self._frame_stride + 1
+
+    @staticmethod
+    def _select_videos(
+        input_path: Path, lower_bound: Optional[int], upper_bound: Optional[int]
+    ) -> List[Path]:
         all_input_videos = sorted(input_path.iterdir())
-        processed_input_videos = all_input_videos[lower_bound:upper_bound]
-        for video in tqdm(processed_input_videos, desc="extract frames"):
-            video_frames = convert_video_to_frames(filepath=str(video))
-            video_prefix = video.name.split(".")[0]
-            for frame_index, frame in enumerate(video_frames):
-                frame_path = output_path.joinpath("{0}_{1}.png".format(video_prefix, frame_index))
-                self._save_video_frame(frame, str(frame_path))
+        return all_input_videos[lower_bound:upper_bound]
+
+    def _map_videos(
+        self, extract_single_video: Callable[[Path], List[str]], videos: List[Path]
+    ) -> Iterator[Tuple[Path, List[str]]]:
+        if self._workers == 1:
+            for video in videos:
+                yield video, extract_single_video(video)
+            return
+        with futures.ProcessPoolExecutor(
+            max_workers=self._workers, initializer=_initialize_worker
+        ) as executor:
+            pending_extractions = {
+                executor.submit(extract_single_video, video): video for video in videos
+            }
+            # Yield as soon as any video is done, so progress is not blocked by slowest video
+            for extraction in futures.as_completed(pending_extractions):
+                yield pending_extractions[extraction], extraction.result()
 
     @staticmethod
     def _save_video_frame(frame: np.ndarray, filepath: str) -> None:
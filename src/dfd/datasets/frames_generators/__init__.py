@@ -1,3 +1,4 @@
 """Frames generators."""
 
+from .assignment import ModificationAssignment
 from .modification import ModificationGenerator
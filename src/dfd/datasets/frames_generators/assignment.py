@@ -0,0 +1,175 @@
+"""Assignment of modifications to frames."""
+import pathlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from dfd.exceptions import DfdError
+
+
+def assign_modifications(
+    shares: Sequence[float], no_frames: int, random_generator: np.random.Generator
+) -> np.ndarray:
+    """Assign modification to each frame, so each modification is used on its share of frames.
+
+    Frames are randomly permuted and permuted indices are split into consecutive ranges,
+    one per modification, frames not covered by shares are assigned last index,
+    i.e. ``len(shares)``, which stands for no modification.
+
+    Args:
+        shares: Share of frames assigned to each modification, must sum to at most one.
+        no_frames: Number of frames.
+        random_generator: Generator used to permute frames.
+
+    Returns:
+        Index of modification assigned to each frame.
+
+    """
+    lower_bounds = [0]
+    summed_share = 0.0
+    for share in shares:
+        summed_share += share
+        lower_bounds.append(int(summed_share * no_frames))
+    frames_permutation = random_generator.permutation(no_frames)
+    # Empty ranges have the same lower bound as next range, so they are never selected
+    modification_indices = np.searchsorted(lower_bounds, frames_permutation, side="right") - 1
+    return modification_indices.astype(np.uint16)
+
+
+class ModificationAssignment:
+    """Modification assigned to each frame, identified by name.
+
+    Assignment can be saved and loaded, so repeated, resumed or sharded runs use the same
+    modification for each frame and frames do not have to be listed again.
+
+    """
+
+    def __init__(
+        self,
+        modification_names: Sequence[str],
+        frame_names: Sequence[str],
+        modification_indices: np.ndarray,
+    ) -> None:
+        """Initialize ModificationAssignment.
+
+        Args:
+            modification_names: Names of modifications, as returned by ``str``.
+            frame_names: Names of frames, e.g. names of files.
+            modification_indices: Index of modification assigned to each frame.
+
+        """
+        self._modification_names = list(modification_names)
+        self._frame_names = list(frame_names)
+        self._modification_indices = modification_indices
+        self._frame_name_to_index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def create(
+        cls,
+        modification_names: Sequence[str],
+        shares: Sequence[float],
+        frame_names: Sequence[str],
+        seed: Optional[int] = None,
+    ) -> "ModificationAssignment":
+        """Assign modifications to frames, see ``assign_modifications``.
+
+        Args:
+            modification_names: Names of modifications, the last one is used
+                for frames not covered by shares.
+            shares: Share of frames assigned to each modification, except the last one.
+            frame_names: Names of frames.
+            seed: Seed used to permute frames.
+
+        Returns:
+            Created assignment.
+
+        """
+        modification_indices = assign_modifications(
+            shares, len(frame_names), np.random.default_rng(seed)
+        )
+        return cls(modification_names, frame_names, modification_indices)
+
+    @property
+    def modification_names(self) -> List[str]:
+        """Names of modifications, ordered by their index."""
+        return self._modification_names
+
+    @property
+    def frame_names(self) -> List[str]:
+        """Names of frames in order in which they were assigned."""
+        return self._frame_names
+
+    def get_modification_index(self, frame_name: str) -> Optional[int]:
+        """Get index of modification assigned to frame, None if frame is not assigned."""
+        if self._frame_name_to_index is None:
+            self._frame_name_to_index = {
+                name: index for index, name in enumerate(self._frame_names)
+            }
+        frame_index = self._frame_name_to_index.get(frame_name)
+        if frame_index is None:
+            return None
+        return int(self._modification_indices[frame_index])
+
+    def extend(
+        self, frame_names: Sequence[str], shares: Sequence[float], seed: Optional[int] = None
+    ) -> "ModificationAssignment":
+        """Assign modifications to frames not assigned yet, keeping existing assignment.
+
+        New frames are assigned among themselves, so shares hold for them separately.
+
+        Args:
+            frame_names: Names of frames, already assigned frames are skipped.
+            shares: Share of frames assigned to each modification, see ``create``.
+            seed: Seed used to permute new frames, combined with number of assigned frames
+                so each extension is permuted differently.
+
+        Returns:
+            Extended assignment, or the same assignment if there are no new frames.
+
+        """
+        new_frame_names = [
+            name for name in frame_names if self.get_modification_index(name) is None
+        ]
+        if not new_frame_names:
+            return self
+        random_generator = np.random.default_rng(
+            None if seed is None else [seed, len(self._frame_names)]
+        )
+        new_modification_indices = assign_modifications(
+            shares, len(new_frame_names), random_generator
+        )
+        return ModificationAssignment(
+            self._modification_names,
+            self._frame_names + new_frame_names,
+            np.concatenate([self._modification_indices, new_modification_indices]),
+        )
+
+    def save(self, path: pathlib.Path) -> None:
+        """Save assignment, file is replaced atomically so it is never left incomplete."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.tmp")
+        with temporary_path.open("wb") as file:
+            np.savez(
+                file,
+                modification_names=np.array(self._modification_names, dtype=str),
+                frame_names=np.array(self._frame_names, dtype=str),
+                modification_indices=self._modification_indices,
+            )
+        temporary_path.replace(path)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "ModificationAssignment":
+        """Load saved assignment.
+
+        Raises:
+            DfdError: If file does not exist.
+
+        """
+        if not path.is_file():
+            raise DfdError(f"Modification assignment {path} does not exist.")
+        with np.load(path) as assignment:
+            return cls(
+                modification_names=assignment["modification_names"].tolist(),
+                frame_names=assignment["frame_names"].tolist(),
+                modification_indices=assignment["modification_indices"],
+            )
@@ -1,17 +1,49 @@
 """Generate new frames after performing set non malicious modifications on original frames."""
+import collections
+import concurrent.futures
 import functools
 import itertools
 import pathlib
-from typing import Generator, List, NamedTuple, Optional
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import cv2 as cv
 import numpy as np
-
-from dfd.exceptions import DfdError
-from dfd.datasets.modifications.definitions import IdentityModification
-from dfd.datasets.modifications.interfaces import ModificationInterface
+import structlog
+
+from dfd.datasets.dataset_index import IMAGE_SUFFIXES, DatasetIndex
+from dfd.datasets.face_location import FaceLocation
+from dfd.datasets.frames_generators.assignment import ModificationAssignment, assign_modifications
+from dfd.datasets.modifications.definitions.identity import IdentityModification
+from dfd.datasets.modifications.interfaces import (
+    FaceDetection,
+    ModificationInterface,
+    ModificationResult,
+)
 from dfd.datasets.modifications.register import ModificationRegister
-from dfd.datasets.settings import GeneratorSettings
+from dfd.datasets.settings import GeneratorSettings, ModificationOrder
+from dfd.exceptions import DfdError
+
+LOGGER = structlog.get_logger()
+
+FrameAndPathPair = Tuple[np.ndarray, pathlib.Path]
+FaceLocator = Callable[[np.ndarray], Optional[FaceLocation]]
+CropLocator = Callable[[Tuple[int, ...], FaceLocation], FaceLocation]
+
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
 
 
 class ModificationShare(NamedTuple):
@@ -21,27 +53,114 @@ class ModificationShare(NamedTuple):
     share: float
 
 
-class ModificationRange(NamedTuple):
-    """Range of frames on which set modification will be performed.
+class ModifiedFrame(NamedTuple):
+    """Modified frame.
 
     Args:
-        modification: Modification to be performed
-        lower_bound: lower range bound, inclusive
-        upper_bound: upper range bound, inclusive
+        modification_used: name of modification performed
+        frame: modified frame
+        original_path: path identifying original frame
+        original_frame: frame before modification
+        preserves_geometry: whether modification kept content of original frame in place
+        face_detection: face found on modified frame, None if face was not searched for
+        is_cropped: whether only area around face was modified and frame is already
+            cropped around face, face detection is then relative to cropped frame
 
     """
 
-    modification: ModificationInterface
-    lower_bound: int
-    upper_bound: int
+    modification_used: str
+    frame: np.ndarray
+    original_path: pathlib.Path
+    original_frame: Optional[np.ndarray] = None
+    preserves_geometry: bool = False
+    face_detection: Optional[FaceDetection] = None
+    is_cropped: bool = False
 
 
-class ModifiedFrame(NamedTuple):
-    """Modified frame."""
+class _PendingFrame(NamedTuple):
+    """Frame waiting for its batch to be modified.
 
-    modification_used: str
+    Args:
+        modification: modification to be performed
+        frame: frame to be modified, area around face if face is cropped before modification
+        path: path identifying original frame
+        face_detection: face found on frame
+        original_frame: frame before face was cropped
+        crop_location: area cropped after modification, relative to frame,
+            None if face is cropped after frame is modified
+
+    """
+
+    modification: ModificationInterface
     frame: np.ndarray
-    original_path: pathlib.Path
+    path: pathlib.Path
+    face_detection: Optional[FaceDetection]
+    original_frame: np.ndarray
+    crop_location: Optional[FaceLocation] = None
+
+
+def _translate_face_location(face_location: FaceLocation, origin: FaceLocation) -> FaceLocation:
+    """Translate face location to coordinates of area starting at given origin."""
+    return FaceLocation(
+        top=face_location.top - origin.top,
+        right=face_location.right - origin.left,
+        bottom=face_location.bottom - origin.top,
+        left=face_location.left - origin.left,
+    )
+
+
+def _translate_face_detection(face_detection: FaceDetection, origin: FaceLocation) -> FaceDetection:
+    """Translate face detection to coordinates of area starting at given origin."""
+    face_location, landmarks = face_detection
+    if face_location is not None:
+        face_location = _translate_face_location(face_location, origin)
+    if landmarks is not None:
+        landmarks = landmarks - np.array([origin.left, origin.top])
+    return FaceDetection(face_location=face_location, landmarks=landmarks)
+
+
+def _read_frame(frame_path: pathlib.Path) -> FrameAndPathPair:
+    """Read frame paired with its path.
+
+    Raises:
+        DfdError: If frame cannot be read.
+
+    """
+    frame: Optional[np.ndarray] = cv.imread(str(frame_path))
+    if frame is None:
+        raise DfdError(f"Cannot read frame {frame_path}.")
+    return frame, frame_path
+
+
+def _map_bounded(
+    executor: concurrent.futures.Executor,
+    function: Callable[[_Item], _Result],
+    items: Iterable[_Item],
+    max_pending: int,
+    preserve_order: bool,
+) -> Generator[_Result, None, None]:
+    """Map function over items in executor, keeping at most given number of pending calls.
+
+    Unlike ``Executor.map`` items are submitted lazily, so memory used by
+    results waiting to be consumed is bounded.
+
+    """
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) < max_pending:
+            continue
+        if preserve_order:
+            yield pending.popleft().result()
+        else:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                pending.remove(future)
+                yield future.result()
+    while pending:
+        yield pending.popleft().result()
 
 
 class ModificationGenerator:
@@ -51,16 +170,45 @@ class ModificationGenerator:
         self,
         settings: GeneratorSettings,
         register: Optional[ModificationRegister] = None,
+        batch_size: int = 16,
+        workers: int = 1,
+        prefetch: Optional[int] = None,
+        preserve_order: bool = True,
+        seed: Optional[int] = None,
     ) -> None:
         """Initialize FramesGenerator.
 
         Args:
             settings: Generator settings.
             register: Modifications register.
+            batch_size: Number of consecutive frames modified together, frames of the batch
+                with the same modification and shape are modified in single call.
+            workers: Number of threads used to load and modify frames, OpenCV releases GIL
+                so frames are processed in parallel. If 1 frames are processed in caller thread.
+            prefetch: Max number of batches loaded or modified ahead of consumer,
+                defaults to twice the number of workers.
+            preserve_order: Whether modified frames are yielded in the same order as input
+                frames, otherwise batches are yielded as soon as they are modified.
+            seed: Seed used to assign modifications to frames, if not provided
+                modifications are assigned differently on each run.
+
+        Raises:
+            DfdError: If batch size, number of workers or prefetch is not positive.
 
         """
+        if batch_size < 1:
+            raise DfdError(f"Batch size must be positive, got {batch_size}.")
+        if workers < 1:
+            raise DfdError(f"Number of workers must be positive, got {workers}.")
+        if prefetch is not None and prefetch < 1:
+            raise DfdError(f"Prefetch must be positive, got {prefetch}.")
         self._setting = settings
         self._register = register or ModificationRegister.default()
+        self._batch_size = batch_size
+        self._workers = workers
+        self._prefetch = prefetch or 2 * workers
+        self._preserve_order = preserve_order
+        self._seed = seed
 
     # TODO: make it more generic, each generator should only have method generate that takes as
     # input iterable and outputs generated frames. It should be some other objects that handles
@@ -68,11 +216,18 @@ class ModificationGenerator:
     def from_directory(
         self,
         input_path: pathlib.Path,
+        face_locator: Optional[FaceLocator] = None,
+        assignment: Optional[ModificationAssignment] = None,
+        crop_locator: Optional[CropLocator] = None,
     ) -> Generator[ModifiedFrame, None, None]:
         """Generate modified frames from directory.
 
         Args:
              input_path: Path to original frames.
+             face_locator: Function used to find face on original frames, see ``from_frames``.
+             assignment: Modifications assigned to frames, if provided only assigned frames
+                are modified and directory is not listed.
+             crop_locator: Function used to find area cropped around face, see ``from_frames``.
 
         Raises:
             DfdError: when modification for frame could not be retrieved
@@ -83,28 +238,344 @@ class ModificationGenerator:
         """
         if not input_path.is_dir():
             raise DfdError("Input path is not a directory.")
-        no_frames = sum(1 for _ in input_path.iterdir())
-        for frame_index, input_frame_path in enumerate(input_path.iterdir()):
-            modification = self._choose_modification(
-                frame_index=frame_index,
-                input_frame_path=input_frame_path,
-                no_frames=no_frames,
+        if assignment is not None:
+            frame_paths = [input_path.joinpath(name) for name in assignment.frame_names]
+        else:
+            frame_paths = DatasetIndex.build(
+                input_path, recursive=False, suffixes=IMAGE_SUFFIXES
+            ).file_paths
+        yield from self.from_paths(
+            frame_paths, face_locator=face_locator, assignment=assignment, crop_locator=crop_locator
+        )
+
+    def from_paths(
+        self,
+        frame_paths: Sequence[pathlib.Path],
+        face_locator: Optional[FaceLocator] = None,
+        assignment: Optional[ModificationAssignment] = None,
+        crop_locator: Optional[CropLocator] = None,
+    ) -> Generator[ModifiedFrame, None, None]:
+        """Generate modified frames from frames saved under provided paths.
+
+        If more than one worker is used frames are loaded in parallel, see ``from_frames``.
+
+        Args:
+             frame_paths: Paths to original frames.
+             face_locator: Function used to find face on original frames, see ``from_frames``.
+             assignment: Modifications assigned to frames, see ``from_frames``.
+             crop_locator: Function used to find area cropped around face, see ``from_frames``.
+
+        Raises:
+            DfdError: when frame could not be read or its modification could not be retrieved
+
+        Yields:
+            modified frames
+
+        """
+        if self._workers == 1:
+            input_frames: Iterable[FrameAndPathPair] = map(_read_frame, frame_paths)
+            yield from self.from_frames(
+                input_frames,
+                no_frames=len(frame_paths),
+                face_locator=face_locator,
+                assignment=assignment,
+                crop_locator=crop_locator,
+            )
+            return
+        with concurrent.futures.ThreadPoolExecutor(self._workers) as executor:
+            # Frames must be passed further in order, so modifications assignment does not change
+            input_frames = _map_bounded(
+                executor,
+                _read_frame,
+                frame_paths,
+                max_pending=self._prefetch * self._batch_size,
+                preserve_order=True,
+            )
+            yield from self._modify_in_parallel(
+                executor,
+                input_frames,
+                no_frames=len(frame_paths),
+                face_locator=face_locator,
+                assignment=assignment,
+                crop_locator=crop_locator,
+            )
+
+    def from_frames(
+        self,
+        input_frames: Iterable[FrameAndPathPair],
+        no_frames: int,
+        face_locator: Optional[FaceLocator] = None,
+        assignment: Optional[ModificationAssignment] = None,
+        crop_locator: Optional[CropLocator] = None,
+    ) -> Generator[ModifiedFrame, None, None]:
+        """Generate modified frames from frames already loaded into memory.
+
+        If face locator is provided face is searched for once per frame and shared with
+        modifications that need it, e.g. red-eyes effect. Found face is returned together
+        with modified frame, so it does not have to be searched for again.
+
+        If modifications are fanned out, each frame is modified with all modifications
+        and modified frames are yielded one after another, in order of modifications.
+
+        If face is cropped before frame is modified, see ``GeneratorSettings.order``,
+        only area around face is modified and yielded frame is already cropped.
+        Face cannot be cropped first if it is not found, or if face or crop locator
+        is not provided, whole frame is modified then.
+
+        Frames are modified in batches, see ``ModificationInterface.perform_batch``.
+        If more than one worker is used, batches are modified in parallel while next
+        batches are collected, modifications are assigned and faces are searched for
+        in caller thread, so both are the same as if frames were processed serially.
+        Frames are yielded in the same order as input frames, unless order
+        is not preserved, then batches are yielded in order in which they are modified.
+
+        Args:
+            input_frames: Original frames paired with paths identifying them,
+                paths are used only to name frames and do not need to exist.
+            no_frames: Expected number of frames, used to assign modifications.
+                Frames exceeding expected number are not modified.
+                Ignored if assignment is provided.
+            face_locator: Function used to find face on original frames. Face is searched for
+                only if modification preserves geometry, otherwise it has to be searched for
+                on modified frame anyway.
+            assignment: Modifications assigned to frames, identified by names of their paths.
+                If not provided modifications are assigned by position of frames.
+            crop_locator: Function used to find area cropped around face on original frame,
+                e.g. ``FaceExtractor.get_crop_location``.
+
+        Raises:
+            DfdError: when modification for frame could not be retrieved
+
+        Yields:
+            modified frames
+
+        """
+        if assignment is not None:
+            self._check_assignment(assignment)
+        if self._workers == 1:
+            for pending_frames in self._generate_pending_batches(
+                input_frames, no_frames, face_locator, assignment, crop_locator
+            ):
+                yield from self._modify_batch(pending_frames)
+            return
+        with concurrent.futures.ThreadPoolExecutor(self._workers) as executor:
+            yield from self._modify_in_parallel(
+                executor, input_frames, no_frames, face_locator, assignment, crop_locator
             )
-            input_frame = cv.imread(str(input_frame_path))
-            modified_frame = modification.perform(input_frame)
+
+    @property
+    def fans_out(self) -> bool:
+        """Whether each frame is modified with all modifications, see ``GeneratorSettings``."""
+        return bool(self._setting.fan_out)
+
+    @property
+    def no_variants_per_frame(self) -> int:
+        """Number of modified frames generated from each original frame."""
+        if self.fans_out:
+            return len(self._setting.modifications)
+        return 1
+
+    def create_assignment(self, frame_names: Sequence[str]) -> ModificationAssignment:
+        """Assign modifications to frames, so it can be saved and reused.
+
+        Args:
+            frame_names: Names of frames, e.g. names of their files.
+
+        Raises:
+            DfdError: If modifications are fanned out, so they are not assigned to frames.
+
+        Returns:
+            Modifications assigned to frames using generator seed.
+
+        """
+        if self.fans_out:
+            raise DfdError("Modifications are fanned out, they cannot be assigned to frames.")
+        return ModificationAssignment.create(
+            self._get_modification_names(), self._get_shares(), frame_names, seed=self._seed
+        )
+
+    def extend_assignment(
+        self, assignment: ModificationAssignment, frame_names: Sequence[str]
+    ) -> ModificationAssignment:
+        """Assign modifications to frames missing in assignment, see ``create_assignment``.
+
+        Raises:
+            DfdError: If assignment was created for different modifications.
+
+        """
+        self._check_assignment(assignment)
+        return assignment.extend(frame_names, self._get_shares(), seed=self._seed)
+
+    def _modify_in_parallel(
+        self,
+        executor: concurrent.futures.Executor,
+        input_frames: Iterable[FrameAndPathPair],
+        no_frames: int,
+        face_locator: Optional[FaceLocator],
+        assignment: Optional[ModificationAssignment],
+        crop_locator: Optional[CropLocator],
+    ) -> Generator[ModifiedFrame, None, None]:
+        for modified_frames in _map_bounded(
+            executor,
+            lambda pending_frames: list(self._modify_batch(pending_frames)),
+            self._generate_pending_batches(
+                input_frames, no_frames, face_locator, assignment, crop_locator
+            ),
+            max_pending=self._prefetch,
+            preserve_order=self._preserve_order,
+        ):
+            yield from modified_frames
+
+    def _generate_pending_batches(
+        self,
+        input_frames: Iterable[FrameAndPathPair],
+        no_frames: int,
+        face_locator: Optional[FaceLocator],
+        assignment: Optional[ModificationAssignment],
+        crop_locator: Optional[CropLocator],
+    ) -> Generator[List[_PendingFrame], None, None]:
+        pending_frames: List[_PendingFrame] = []
+        no_pending_input_frames = 0
+        for frame_index, (input_frame, input_frame_path) in enumerate(input_frames):
+            if self.fans_out:
+                modifications = self._get_modifications()[:-1]
+            elif assignment is not None:
+                modifications = [self._choose_assigned_modification(input_frame_path, assignment)]
+            elif frame_index < no_frames:
+                modifications = [
+                    self._choose_modification(frame_index=frame_index, no_frames=no_frames)
+                ]
+            else:
+                if frame_index == no_frames:
+                    # Shares hold only for expected frames, so miscounted frames are reported
+                    LOGGER.warning("frames_exceed_expected_number", no_frames=no_frames)
+                modifications = [IdentityModification()]
+            face_detection = None
+            # Face is searched for as soon as frame is received, so stateful face locators
+            # (e.g. face tracker) see frames in original order. It is searched for once
+            # and shared by all modifications of frame that preserve geometry
+            if face_locator is not None and any(
+                modification.preserves_geometry for modification in modifications
+            ):
+                face_detection = FaceDetection(face_location=face_locator(input_frame))
+            cropped_frame = None
+            if face_detection is not None and crop_locator is not None:
+                cropped_frame = self._crop_with_margin(
+                    input_frame, input_frame_path, face_detection, crop_locator
+                )
+            for modification in modifications:
+                if cropped_frame is not None and self._is_cropped_first(modification):
+                    pending_frames.append(cropped_frame._replace(modification=modification))
+                    continue
+                pending_frames.append(
+                    _PendingFrame(
+                        modification,
+                        input_frame,
+                        input_frame_path,
+                        face_detection if modification.preserves_geometry else None,
+                        original_frame=input_frame,
+                    )
+                )
+            no_pending_input_frames += 1
+            if no_pending_input_frames == self._batch_size:
+                yield pending_frames
+                pending_frames = []
+                no_pending_input_frames = 0
+        if pending_frames:
+            yield pending_frames
+
+    @staticmethod
+    def _modify_batch(
+        pending_frames: List[_PendingFrame],
+    ) -> Generator[ModifiedFrame, None, None]:
+        # Group frames that can be stacked and modified together
+        frame_groups: Dict[Tuple[str, Tuple[int, ...]], List[int]] = {}
+        for frame_index, pending_frame in enumerate(pending_frames):
+            group_key = (str(pending_frame.modification), pending_frame.frame.shape)
+            frame_groups.setdefault(group_key, []).append(frame_index)
+        modification_results: Dict[int, ModificationResult] = {}
+        for frame_indices in frame_groups.values():
+            modification = pending_frames[frame_indices[0]].modification
+            group_results = modification.perform_batch_with_face_detection(
+                np.stack([pending_frames[frame_index].frame for frame_index in frame_indices]),
+                [pending_frames[frame_index].face_detection for frame_index in frame_indices],
+            )
+            modification_results.update(zip(frame_indices, group_results))
+        for frame_index, pending_frame in enumerate(pending_frames):
+            modified_image, face_detection = modification_results[frame_index]
+            crop_location = pending_frame.crop_location
+            if crop_location is not None:
+                # Drop margin, which was added only so modification sees neighbouring pixels
+                top, right, bottom, left = crop_location
+                modified_image = modified_image[top:bottom, left:right]
+                if face_detection is not None:
+                    face_detection = _translate_face_detection(face_detection, crop_location)
             yield ModifiedFrame(
-                modification_used=str(modification),
-                frame=modified_frame,
-                original_path=input_frame_path,
+                modification_used=str(pending_frame.modification),
+                frame=modified_image,
+                original_path=pending_frame.path,
+                original_frame=pending_frame.original_frame,
+                preserves_geometry=pending_frame.modification.preserves_geometry,
+                face_detection=face_detection,
+                is_cropped=crop_location is not None,
             )
 
+    def _crop_with_margin(
+        self,
+        frame: np.ndarray,
+        frame_path: pathlib.Path,
+        face_detection: FaceDetection,
+        crop_locator: CropLocator,
+    ) -> Optional[_PendingFrame]:
+        """Crop area around face with margin, so it can be modified instead of whole frame."""
+        if face_detection.face_location is None:
+            return None
+        frame_height, frame_width = frame.shape[:2]
+        crop_location = crop_locator(frame.shape, face_detection.face_location)
+        margin = self._setting.crop_margin
+        area_location = FaceLocation(
+            top=max(crop_location.top - margin, 0),
+            right=min(crop_location.right + margin, frame_width),
+            bottom=min(crop_location.bottom + margin, frame_height),
+            left=max(crop_location.left - margin, 0),
+        )
+        top, right, bottom, left = area_location
+        return _PendingFrame(
+            modification=IdentityModification(),
+            frame=frame[top:bottom, left:right],
+            path=frame_path,
+            face_detection=_translate_face_detection(face_detection, area_location),
+            original_frame=frame,
+            crop_location=_translate_face_location(crop_location, area_location),
+        )
+
+    @functools.lru_cache(maxsize=1)
+    def _get_cropped_first_modification_names(self) -> Set[str]:
+        cropped_first_modification_names = set()
+        modifications = self._get_modifications()
+        modifications_settings = [*self._setting.modifications, None]
+        for modification, modification_settings in zip(modifications, modifications_settings):
+            order = modification_settings.order if modification_settings is not None else None
+            if order is None:
+                order = self._setting.order
+                # Modifications using global statistics would give different result on face area
+                if modification.uses_global_statistics:
+                    order = ModificationOrder.MODIFY_THEN_CROP
+            if order == ModificationOrder.CROP_THEN_MODIFY and modification.preserves_geometry:
+                cropped_first_modification_names.add(str(modification))
+        return cropped_first_modification_names
+
+    def _is_cropped_first(self, modification: ModificationInterface) -> bool:
+        return str(modification) in self._get_cropped_first_modification_names()
+
     @functools.lru_cache(maxsize=1)
     def _get_modifications_share(self) -> List[ModificationShare]:
         modifications_share: List[ModificationShare] = []
         for modification_settings in self._setting.modifications:
             mame = modification_settings.name
             options = modification_settings.options
-            share = modification_settings.share
+            # Share is not set if modifications are fanned out
+            share = modification_settings.share or 0.0
 
             modification_class = self._register.get_modification_class(mame)
             # TODO: fix typing
@@ -130,43 +601,49 @@ class ModificationGenerator:
         return modifications
 
     @functools.lru_cache(maxsize=1)
-    def _get_modifications_range(self, no_frames: int) -> List[ModificationRange]:
-        modifications_share: List[ModificationShare] = self._get_modifications_share()
-        modifications_range: List[ModificationRange] = []
-        current_summed_share = 0.0
-        for modification, share in modifications_share:
-            new_summed_share = current_summed_share + share
-            modifications_range.append(
-                ModificationRange(
-                    modification=modification,
-                    lower_bound=int(current_summed_share * no_frames),
-                    upper_bound=int(new_summed_share * no_frames) - 1,
-                )
-            )
-            current_summed_share = new_summed_share
-        # Add identity modification for remaining frames
-        modifications_range.append(
-            ModificationRange(
-                modification=IdentityModification(),
-                lower_bound=int(current_summed_share * no_frames),
-                upper_bound=no_frames,
+    def _get_modifications(self) -> List[ModificationInterface]:
+        # Identity modification is used for frames not covered by shares
+        return [
+            modification_share.modification
+            for modification_share in self._get_modifications_share()
+        ] + [IdentityModification()]
+
+    def _get_modification_names(self) -> List[str]:
+        return [str(modification) for modification in self._get_modifications()]
+
+    def _get_shares(self) -> List[float]:
+        return [modification_share.share for modification_share in self._get_modifications_share()]
+
+    def _check_assignment(self, assignment: ModificationAssignment) -> None:
+        """Check if assignment was created for modifications of this generator.
+
+        Raises:
+            DfdError: If assignment was created for different modifications
+                or modifications are fanned out.
+
+        """
+        if self.fans_out:
+            raise DfdError("Modifications are fanned out, they cannot be assigned to frames.")
+        if assignment.modification_names != self._get_modification_names():
+            raise DfdError(
+                f"Assignment was created for modifications {assignment.modification_names}, "
+                + f"but generator uses {self._get_modification_names()}."
             )
-        )
-        return modifications_range
 
     @functools.lru_cache(maxsize=1)
-    def _get_frames_permutation(self, no_frames: int) -> np.ndarray:
-        return np.random.permutation(no_frames)
+    def _get_modification_indices(self, no_frames: int) -> np.ndarray:
+        return np.asarray(
+            assign_modifications(self._get_shares(), no_frames, np.random.default_rng(self._seed))
+        )
+
+    def _choose_modification(self, frame_index: int, no_frames: int) -> ModificationInterface:
+        modification_index = self._get_modification_indices(no_frames)[frame_index]
+        return self._get_modifications()[modification_index]
 
-    def _choose_modification(
-        self, frame_index: int, input_frame_path: pathlib.Path, no_frames: int
+    def _choose_assigned_modification(
+        self, input_frame_path: pathlib.Path, assignment: ModificationAssignment
     ) -> ModificationInterface:
-        frames_permutation = self._get_frames_permutation(no_frames)
-        modifications_range = self._get_modifications_range(no_frames)
-        permuted_index = frames_permutation[frame_index]
-        for modification, lower_bound, upper_bound in modifications_range:
-            if lower_bound <= permuted_index <= upper_bound:
-                return modification
-        # TODO: log error
-        # This should never happen
-        raise DfdError("Could not select modification.")
+        modification_index = assignment.get_modification_index(input_frame_path.name)
+        if modification_index is None:
+            raise DfdError(f"No modification is assigned to frame {input_frame_path.name}.")
+        return self._get_modifications()[modification_index]
@@ -0,0 +1,221 @@
+"""Manifest of completed preprocessing work."""
+import hashlib
+import json
+import pathlib
+import sqlite3
+from typing import Iterable, List, NamedTuple, Optional, Sequence, cast
+
+from .dataset_index import DatasetIndex
+
+_FINGERPRINT_CHUNK_SIZE = 1024 * 1024
+
+
+class ManifestEntry(NamedTuple):
+    """Item processed in given stage.
+
+    Args:
+        fingerprint: fingerprint of item content at the time it was processed
+        outputs: paths to files generated from item
+
+    """
+
+    fingerprint: str
+    outputs: List[str]
+
+
+class PendingItem(NamedTuple):
+    """Item that was not processed yet or changed since it was processed."""
+
+    path: pathlib.Path
+    fingerprint: str
+
+
+class PreprocessingManifest:
+    """Persistent record of items processed in preprocessing stages.
+
+    Each item (e.g. video or frame) is recorded together with fingerprint of its content
+    and outputs generated from it, separately for each stage and output directory.
+    Items already processed are skipped when preprocessing is repeated,
+    so only new or changed items are processed.
+
+    Manifest is backed by SQLite database, each item is committed as soon as it is processed,
+    so progress is preserved even if processing is interrupted.
+
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        """Initialize PreprocessingManifest.
+
+        Args:
+            path: Path to manifest file, created if it does not exist.
+
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS completed_items ("
+            + "stage TEXT NOT NULL, "
+            + "output_path TEXT NOT NULL, "
+            + "item TEXT NOT NULL, "
+            + "fingerprint TEXT NOT NULL, "
+            + "outputs TEXT NOT NULL, "
+            + "PRIMARY KEY (stage, output_path, item))"
+        )
+        # Fingerprints are calculated once per file version, identified by size & modification time
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            + "path TEXT NOT NULL PRIMARY KEY, "
+            + "size INTEGER NOT NULL, "
+            + "modification_time INTEGER NOT NULL, "
+            + "fingerprint TEXT NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS directory_indices ("
+            + "directory TEXT NOT NULL PRIMARY KEY, "
+            + "dataset_index TEXT NOT NULL)"
+        )
+
+    def __enter__(self) -> "PreprocessingManifest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def fingerprint(self, path: pathlib.Path) -> str:
+        """Calculate fingerprint of file content.
+
+        File is hashed only if it was not hashed before or its size or modification time changed.
+
+        Args:
+            path: Path to file.
+
+        Returns:
+            Hash of file content.
+
+        """
+        file_stat = path.stat()
+        row = self._connection.execute(
+            "SELECT fingerprint FROM fingerprints "
+            + "WHERE path = ? AND size = ? AND modification_time = ?",
+            (str(path), file_stat.st_size, file_stat.st_mtime_ns),
+        ).fetchone()
+        if row is not None:
+            return cast(str, row[0])
+        file_hash = hashlib.blake2b(digest_size=16)
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(_FINGERPRINT_CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+        fingerprint = file_hash.hexdigest()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)",
+            (str(path), file_stat.st_size, file_stat.st_mtime_ns, fingerprint),
+        )
+        return fingerprint
+
+    def get(self, stage: str, output_path: pathlib.Path, item: str) -> Optional[ManifestEntry]:
+        """Get processed item.
+
+        Args:
+            stage: Name of preprocessing stage.
+            output_path: Path to directory where stage outputs are saved.
+            item: Key identifying item, e.g. path to video.
+
+        Returns:
+            Processed item, None if item was not processed in given stage yet.
+
+        """
+        row = self._connection.execute(
+            "SELECT fingerprint, outputs FROM completed_items "
+            + "WHERE stage = ? AND output_path = ? AND item = ?",
+            (stage, str(output_path), item),
+        ).fetchone()
+        if row is None:
+            return None
+        return ManifestEntry(fingerprint=row[0], outputs=json.loads(row[1]))
+
+    def put(
+        self,
+        stage: str,
+        output_path: pathlib.Path,
+        item: str,
+        fingerprint: str,
+        outputs: Iterable[str],
+    ) -> None:
+        """Record processed item.
+
+        Args:
+            stage: Name of preprocessing stage.
+            output_path: Path to directory where stage outputs are saved.
+            item: Key identifying item, e.g. path to video.
+            fingerprint: Fingerprint of processed item content.
+            outputs: Paths to files generated from item.
+
+        """
+        self._connection.execute(
+            "INSERT OR REPLACE INTO completed_items VALUES (?, ?, ?, ?, ?)",
+            (stage, str(output_path), item, fingerprint, json.dumps(list(outputs))),
+        )
+
+    def select_pending(
+        self, stage: str, output_path: pathlib.Path, paths: Iterable[pathlib.Path]
+    ) -> List[PendingItem]:
+        """Select items that were not processed yet or changed since they were processed.
+
+        Outputs generated from changed items are removed, so no stale outputs are left
+        if changed item generates fewer outputs.
+
+        Args:
+            stage: Name of preprocessing stage.
+            output_path: Path to directory where stage outputs are saved.
+            paths: Paths to all items, used as item keys.
+
+        Returns:
+            Items that need to be processed, in the same order as provided paths.
+
+        """
+        pending_items: List[PendingItem] = []
+        for path in paths:
+            fingerprint = self.fingerprint(path)
+            manifest_entry = self.get(stage, output_path, str(path))
+            if manifest_entry is not None and manifest_entry.fingerprint == fingerprint:
+                continue
+            if manifest_entry is not None:
+                for output in manifest_entry.outputs:
+                    pathlib.Path(output).unlink(missing_ok=True)
+            pending_items.append(PendingItem(path=path, fingerprint=fingerprint))
+        return pending_items
+
+    def index_directory(
+        self, root: pathlib.Path, class_names: Sequence[str] = (), recursive: bool = True
+    ) -> DatasetIndex:
+        """Get index of directory, directory is listed only if it changed since it was indexed.
+
+        Args:
+            root: Path to indexed directory.
+            class_names: Names of class sub-directories, see ``DatasetIndex.build``.
+            recursive: Whether files in nested directories are indexed as well.
+
+        Returns:
+            Up-to-date index of directory.
+
+        """
+        key = json.dumps([str(root), list(class_names), recursive])
+        row = self._connection.execute(
+            "SELECT dataset_index FROM directory_indices WHERE directory = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            saved_index = DatasetIndex.from_json(row[0])
+            if saved_index.is_up_to_date():
+                return saved_index
+        dataset_index = DatasetIndex.build(root, class_names=class_names, recursive=recursive)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO directory_indices VALUES (?, ?)",
+            (key, dataset_index.to_json()),
+        )
+        return dataset_index
+
+    def close(self) -> None:
+        """Close underlying database connection."""
+        self._connection.close()
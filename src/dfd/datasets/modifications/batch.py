@@ -0,0 +1,57 @@
+"""Helpers used to perform modifications on batches of images."""
+from typing import Callable
+
+import cv2 as cv
+import numpy as np
+
+
+def apply_pixelwise(
+    images: np.ndarray, operation: Callable[[np.ndarray], np.ndarray]
+) -> np.ndarray:
+    """Apply OpenCV operation that processes each pixel independently to batch of images.
+
+    OpenCV does not accept 4D arrays, but since result of operation does not depend on
+    neighbouring pixels, images can be stacked vertically and processed in single call.
+
+    Args:
+        images: Stack of OpenCV images, i.e. (N, H, W, C) array.
+        operation: Pixelwise operation, e.g. color conversion or look-up table.
+
+    Returns:
+        Stack of processed images.
+
+    """
+    no_images, height, width, _ = images.shape
+    stacked_images = np.ascontiguousarray(images).reshape(no_images * height, width, -1)
+    processed_images = operation(stacked_images)
+    return processed_images.reshape(no_images, height, width, -1)
+
+
+def equalize_luma(
+    images: np.ndarray, equalize: Callable[[np.ndarray, np.ndarray], None]
+) -> np.ndarray:
+    """Equalize luma channel of batch of BGR images.
+
+    Equalization depends on histogram of whole image, so images are processed one by one.
+    Color conversions of whole batch at once are slower, since batch does not fit in cache,
+    instead intermediate buffers are reused and results are written into single output array.
+
+    Args:
+        images: Stack of OpenCV images, i.e. (N, H, W, 3) uint8 array.
+        equalize: Function equalizing single channel image, takes source and destination array.
+
+    Returns:
+        Stack of images after equalization.
+
+    """
+    equalized_images = np.empty_like(images)
+    ycrcb_image = np.empty_like(images[0])
+    luma_channel = np.empty(images.shape[1:3], dtype=images.dtype)
+    equalized_luma_channel = np.empty_like(luma_channel)
+    for image, equalized_image in zip(images, equalized_images):
+        cv.cvtColor(image, cv.COLOR_BGR2YCrCb, dst=ycrcb_image)
+        cv.extractChannel(ycrcb_image, 0, dst=luma_channel)
+        equalize(luma_channel, equalized_luma_channel)
+        cv.insertChannel(equalized_luma_channel, ycrcb_image, 0)
+        cv.cvtColor(ycrcb_image, cv.COLOR_YCrCb2BGR, dst=equalized_image)
+    return equalized_images
@@ -1,10 +1,38 @@
-"""Modifications definitions."""
-
-from .clahe import CLAHEModification
-from .gamma_correction import GammaCorrectionModification
-from .gaussian_blur import GaussianBlurModification
-from .gaussian_noise import GaussianNoiseModification
-from .histogram_equalization import HistogramEqualizationModification
-from .identity import IdentityModification
-from .median_filter import MedianFilterModification
-from .red_eyes_effect import RedEyesEffectModification
+"""Modifications definitions.
+
+Definitions are imported on first access, so e.g. dlib is imported only
+when red eyes effect is used.
+
+"""
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .clahe import CLAHEModification
+    from .gamma_correction import GammaCorrectionModification
+    from .gaussian_blur import GaussianBlurModification
+    from .gaussian_noise import GaussianNoiseModification
+    from .histogram_equalization import HistogramEqualizationModification
+    from .identity import IdentityModification
+    from .median_filter import MedianFilterModification
+    from .red_eyes_effect import RedEyesEffectModification
+
+_NAME_TO_MODULE_MAP = {
+    "CLAHEModification": "clahe",
+    "GammaCorrectionModification": "gamma_correction",
+    "GaussianBlurModification": "gaussian_blur",
+    "GaussianNoiseModification": "gaussian_noise",
+    "HistogramEqualizationModification": "histogram_equalization",
+    "IdentityModification": "identity",
+    "MedianFilterModification": "median_filter",
+    "RedEyesEffectModification": "red_eyes_effect",
+}
+
+__all__ = sorted(_NAME_TO_MODULE_MAP)
+
+
+def __getattr__(name: str) -> t.Any:
+    module_name = _NAME_TO_MODULE_MAP.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    return getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
@@ -1,14 +1,20 @@
 """Modification CLAHE (Contrast Limited Adaptive Histogram Equalization)."""
 
+import threading
+from typing import cast
+
 import cv2 as cv
 import numpy as np
 
+from dfd.datasets.modifications.batch import equalize_luma
 from dfd.datasets.modifications.interfaces import ModificationInterface
 
 
 class CLAHEModification(ModificationInterface):
     """Modification CLAHE (Contrast Limited Adaptive Histogram Equalization)"""
 
+    uses_global_statistics = True
+
     def __init__(self, clip_limit: float, grid_width: int, grid_height: int) -> None:
         """Initialize AdaptiveHistogramEqualizationModification.
 
@@ -20,6 +26,8 @@ class CLAHEModification(ModificationInterface):
 
         self._clip_limit = clip_limit
         self._title_grid_size = (grid_width, grid_height)
+        # OpenCV CLAHE object keeps intermediate buffers, so it is created once per thread
+        self._thread_state = threading.local()
 
     def perform(self, image: np.ndarray) -> np.ndarray:
         """Perform CLAHE on image.
@@ -36,13 +44,33 @@ class CLAHEModification(ModificationInterface):
         """
         # Convert from BGR color space to YCrCb
         ycrcb_image = cv.cvtColor(image, cv.COLOR_BGR2YCrCb)
-        # Prepare CLAHE
-        clahe = cv.createCLAHE(clipLimit=self._clip_limit, tileGridSize=self._title_grid_size)
         # Equalize y channel
-        ycrcb_image[:, :, 0] = clahe.apply(ycrcb_image[:, :, 0])
+        ycrcb_image[:, :, 0] = self._get_clahe().apply(ycrcb_image[:, :, 0])
         # Convert back to BGR
         return cv.cvtColor(ycrcb_image, cv.COLOR_YCrCb2BGR)
 
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Perform CLAHE on batch of images, see ``perform``.
+
+        Args:
+            images: Stack of OpenCV images.
+
+        Returns:
+            Stack of images after equalization.
+
+        """
+        clahe = self._get_clahe()
+        return cast(
+            np.ndarray, equalize_luma(images, lambda channel, dst: clahe.apply(channel, dst=dst))
+        )
+
+    def _get_clahe(self) -> cv.CLAHE:
+        clahe = getattr(self._thread_state, "clahe", None)
+        if clahe is None:
+            clahe = cv.createCLAHE(clipLimit=self._clip_limit, tileGridSize=self._title_grid_size)
+            self._thread_state.clahe = clahe
+        return clahe
+
     def __str__(self) -> str:
         width, height = self._title_grid_size
         return f"clahe_{width}_{height}_{self._clip_limit}"
@@ -1,7 +1,10 @@
 """Modification Gamma Correction."""
+from typing import cast
+
 import cv2 as cv
 import numpy as np
 
+from dfd.datasets.modifications.batch import apply_pixelwise
 from dfd.datasets.modifications.interfaces import ModificationInterface
 
 
@@ -16,6 +19,10 @@ class GammaCorrectionModification(ModificationInterface):
 
         """
         self._gamma_value = gamma_value
+        rgb_max_value = 255
+        self._look_up_table = (
+            ((np.arange(0, 256) / rgb_max_value) ** (1.0 / gamma_value)) * rgb_max_value
+        ).astype("uint8")
 
     def perform(self, image: np.ndarray) -> np.ndarray:
         """Perform gamma correction on provided image.
@@ -27,15 +34,22 @@ class GammaCorrectionModification(ModificationInterface):
             Image after gamma correction.
 
         """
-        rgb_max_value = 255
-        look_up_table = np.array(
-            [
-                int(((i / rgb_max_value) ** (1.0 / self._gamma_value)) * rgb_max_value)
-                for i in np.arange(0, 256)
-            ]
-        ).astype("uint8")
         # apply gamma correction using lookup table
-        return cv.LUT(image, look_up_table)
+        return cv.LUT(image, self._look_up_table)
+
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Perform gamma correction on batch of images.
+
+        Args:
+            images: Stack of OpenCV images.
+
+        Returns:
+            Stack of images after gamma correction.
+
+        """
+        return cast(
+            np.ndarray, apply_pixelwise(images, lambda image: cv.LUT(image, self._look_up_table))
+        )
 
     def __str__(self) -> str:
         return f"gamma_correction_{self._gamma_value}"
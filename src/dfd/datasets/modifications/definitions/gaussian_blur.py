@@ -46,3 +46,27 @@ class GaussianBlurModification(ModificationInterface):
         return cv.GaussianBlur(
             image, ksize=self._kernel_size, sigmaX=self._sigma_x, sigmaY=self._sigma_y
         )
+
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Perform Gaussian blur on batch of images.
+
+        Images are blurred one by one, since blur must not cross image boundaries,
+        but all results are written directly into single output array.
+
+        Args:
+            images: Stack of OpenCV images.
+
+        Returns:
+            Stack of images after applying Gaussian blur.
+
+        """
+        blurred_images = np.empty_like(images)
+        for image, blurred_image in zip(images, blurred_images):
+            cv.GaussianBlur(
+                image,
+                ksize=self._kernel_size,
+                sigmaX=self._sigma_x,
+                sigmaY=self._sigma_y,
+                dst=blurred_image,
+            )
+        return blurred_images
@@ -1,7 +1,11 @@
 """Modification Gaussian noise."""
 
+from typing import Optional, cast
+
+import cv2 as cv
 import numpy as np
 
+from dfd.datasets.modifications.batch import apply_pixelwise
 from dfd.datasets.modifications.interfaces import ModificationInterface
 
 
@@ -12,6 +16,7 @@ class GaussianNoiseModification(ModificationInterface):
         self,
         mean: float = 0.0,
         standard_deviation: float = 1.0,
+        seed: Optional[int] = None,
     ) -> None:
         """Initialize GaussianNoiseModification.
 
@@ -19,10 +24,12 @@ class GaussianNoiseModification(ModificationInterface):
             mean: Mean of Gaussian distribution used to draw sample from.
             standard_deviation: Standard deviation of Gaussian distribution
                 used to draw sample from.
+            seed: Seed of random generator used to draw noise.
 
         """
         self._mean = mean
         self._standard_deviation = standard_deviation
+        self._random_generator = np.random.default_rng(seed)
 
     def perform(self, image: np.ndarray) -> np.ndarray:
         """Add Gaussian noise to provided image.
@@ -34,8 +41,21 @@ class GaussianNoiseModification(ModificationInterface):
             Image with Gaussian noise added.
 
         """
-        drawn_samples = np.random.normal(self._mean, self._standard_deviation, image.shape)
-        noise = drawn_samples.reshape(image.shape)
-        modified_image = image + noise
-        # Convert returned image to uint8 since float values are valid for noise added
-        return modified_image.astype("uint8")
+        # Noise is drawn in single precision and added with saturation,
+        # so pixel values are clipped to valid range instead of wrapping around
+        noise = self._random_generator.standard_normal(image.shape, dtype=np.float32)
+        noise *= self._standard_deviation
+        noise += self._mean
+        return cv.add(image, noise, dtype=cv.CV_8U)
+
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Add Gaussian noise to batch of images, noise for whole batch is drawn at once.
+
+        Args:
+            images: Stack of OpenCV images.
+
+        Returns:
+            Stack of images with Gaussian noise added.
+
+        """
+        return cast(np.ndarray, apply_pixelwise(images, self.perform))
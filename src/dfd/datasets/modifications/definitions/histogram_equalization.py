@@ -1,14 +1,19 @@
 """Modification Histogram Equalization."""
 
+from typing import cast
+
 import cv2 as cv
 import numpy as np
 
+from dfd.datasets.modifications.batch import equalize_luma
 from dfd.datasets.modifications.interfaces import ModificationInterface
 
 
 class HistogramEqualizationModification(ModificationInterface):
     """Modification Histogram Equalization."""
 
+    uses_global_statistics = True
+
     def perform(self, image: np.ndarray) -> np.ndarray:
         """Perform Histogram Equalization on image.
 
@@ -29,5 +34,20 @@ class HistogramEqualizationModification(ModificationInterface):
         # Convert back to BGR
         return cv.cvtColor(ycrcb_image, cv.COLOR_YCrCb2BGR)
 
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Perform Histogram Equalization on batch of images, see ``perform``.
+
+        Args:
+            images: Stack of OpenCV images.
+
+        Returns:
+            Stack of images after equalization.
+
+        """
+        return cast(
+            np.ndarray,
+            equalize_luma(images, lambda channel, dst: cv.equalizeHist(channel, dst=dst)),
+        )
+
     def __str__(self) -> str:
         return "histogram_equalization"
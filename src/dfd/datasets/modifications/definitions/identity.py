@@ -16,5 +16,14 @@ class IdentityModification(ModificationInterface):
         """
         return image
 
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Perform identity modification on batch of images.
+
+        Returns:
+            original images.
+
+        """
+        return images
+
     def __str__(self) -> str:
         return "identity"
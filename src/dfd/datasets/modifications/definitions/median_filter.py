@@ -31,3 +31,21 @@ class MedianFilterModification(ModificationInterface):
             Image after Median filter.
         """
         return cv.medianBlur(image, ksize=self._aperture_size)
+
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Perform Median filter modification on batch of images.
+
+        Images are filtered one by one, since filter must not cross image boundaries,
+        but all results are written directly into single output array.
+
+        Args:
+            images: Stack of OpenCV images.
+
+        Returns:
+            Stack of images after Median filter.
+
+        """
+        filtered_images = np.empty_like(images)
+        for image, filtered_image in zip(images, filtered_images):
+            cv.medianBlur(image, ksize=self._aperture_size, dst=filtered_image)
+        return filtered_images
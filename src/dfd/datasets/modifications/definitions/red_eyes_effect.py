@@ -1,11 +1,17 @@
 """Modification red-eyes effect."""
-from typing import Tuple
+import threading
+from typing import List, Optional, Sequence, Tuple, cast
 
 import cv2 as cv
 import dlib
 import numpy as np
 
-from dfd.datasets.modifications.interfaces import ModificationInterface
+from dfd.datasets.face_location import FaceLocation
+from dfd.datasets.modifications.interfaces import (
+    FaceDetection,
+    ModificationInterface,
+    ModificationResult,
+)
 
 
 def _convert_dlib_shape_to_np_array(dlib_shape) -> np.array:
@@ -21,6 +27,27 @@ def _convert_dlib_shape_to_np_array(dlib_shape) -> np.array:
     return np.array([[point.x, point.y] for point in dlib_shape.parts()], dtype="int")
 
 
+def _convert_dlib_rectangle_to_face_location(
+    dlib_rectangle, image_shape: Tuple[int, ...]
+) -> FaceLocation:
+    """Convert dlib rectangle into face location trimmed to image bounds.
+
+    Args:
+        dlib_rectangle: dlib rectangle, e.g. output of dlib face detector
+        image_shape: shape of image on which rectangle was found
+
+    Returns:
+        face location corresponding to provided rectangle
+
+    """
+    return FaceLocation(
+        top=max(dlib_rectangle.top(), 0),
+        right=min(dlib_rectangle.right(), image_shape[1]),
+        bottom=min(dlib_rectangle.bottom(), image_shape[0]),
+        left=max(dlib_rectangle.left(), 0),
+    )
+
+
 class RedEyesEffectModification(ModificationInterface):
     """Modification  red-eyes effect."""
 
@@ -33,6 +60,8 @@ class RedEyesEffectModification(ModificationInterface):
         """
 
         self._face_detector = dlib.get_frontal_face_detector()
+        # dlib face detector must not be used concurrently, landmarks detector is thread-safe
+        self._face_detector_lock = threading.Lock()
         self._face_landmarks_detector = dlib.shape_predictor(face_landmarks_detector_path)
         self._brightness_threshold = brightness_threshold
 
@@ -49,13 +78,39 @@ class RedEyesEffectModification(ModificationInterface):
             Image with red-eyes effect added, if no face found in image
                 original image is returned instead.
 
+        """
+        return cast(np.ndarray, self.perform_with_face_detection(image, face_detection=None).image)
+
+    def perform_with_face_detection(
+        self, image: np.ndarray, face_detection: Optional[FaceDetection]
+    ) -> ModificationResult:
+        """Add red-eyes effect to image, reuse face found on image if provided.
+
+        Args:
+            image: OpenCV image.
+            face_detection: Face found on image, if not provided face is searched for.
+
+        Returns:
+            Image with red-eyes effect added and face found on it, if no face found in image
+                original image is returned instead.
+
         """
         # Convert from BGR color space to YCrCb
         gray_image = cv.cvtColor(image, cv.COLOR_BGR2GRAY)
-        faces = self._face_detector(gray_image, 1)
-        if not faces:
-            return image
-        face = faces[0]
+        if face_detection is None:
+            with self._face_detector_lock:
+                faces = self._face_detector(gray_image, 1)
+            if not faces:
+                return ModificationResult(image=image, face_detection=FaceDetection(None))
+            face = faces[0]
+            face_location = _convert_dlib_rectangle_to_face_location(face, image.shape)
+        elif face_detection.face_location is None:
+            return ModificationResult(image=image, face_detection=face_detection)
+        else:
+            face_location = face_detection.face_location
+            face = dlib.rectangle(
+                face_location.left, face_location.top, face_location.right, face_location.bottom
+            )
         shape = self._face_landmarks_detector(gray_image, face)
         landmarks = _convert_dlib_shape_to_np_array(shape)
         # Select eyes landmarks
@@ -63,7 +118,30 @@ class RedEyesEffectModification(ModificationInterface):
         right_eye_landmarks = landmarks[42:48]
         modified_image = self._add_red_eye_effect_to_single_eye(image, left_eye_landmarks)
         modified_image = self._add_red_eye_effect_to_single_eye(modified_image, right_eye_landmarks)
-        return modified_image
+        return ModificationResult(
+            image=modified_image,
+            face_detection=FaceDetection(face_location=face_location, landmarks=landmarks),
+        )
+
+    def perform_batch_with_face_detection(
+        self, images: np.ndarray, face_detections: Sequence[Optional[FaceDetection]]
+    ) -> List[ModificationResult]:
+        """Add red-eyes effect to batch of images, reuse faces found on images if provided.
+
+        Landmarks are detected separately on each image.
+
+        Args:
+            images: Stack of OpenCV images.
+            face_detections: Face found on each image, see ``perform_with_face_detection``.
+
+        Returns:
+            Images with red-eyes effect added and faces found on them.
+
+        """
+        return [
+            self.perform_with_face_detection(image, face_detection)
+            for image, face_detection in zip(images, face_detections)
+        ]
 
     @staticmethod
     def _create_eye_mask(eye_landmarks: np.ndarray, image_shape: Tuple[int, ...]) -> np.ndarray:
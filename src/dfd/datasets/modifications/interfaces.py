@@ -1,11 +1,45 @@
 """Interfaces used in modifications package."""
 import abc
+from typing import List, NamedTuple, Optional, Sequence
 
 import numpy as np
 
+from dfd.datasets.face_location import FaceLocation
+
+
+class FaceDetection(NamedTuple):
+    """Face found on image, shared between modifications and face extraction.
+
+    Args:
+        face_location: location of face, None if no face was found
+        landmarks: face landmarks as (x, y) points, None if landmarks were not found
+
+    """
+
+    face_location: Optional[FaceLocation]
+    landmarks: Optional[np.ndarray] = None
+
+
+class ModificationResult(NamedTuple):
+    """Modified image together with face found on it, if known."""
+
+    image: np.ndarray
+    face_detection: Optional[FaceDetection]
+
 
 class ModificationInterface(abc.ABC):
-    """Modification interface."""
+    """Modification interface.
+
+    Attributes:
+        preserves_geometry: Whether modification keeps content of image in place, i.e. face
+            found on original image is located in the same place on modified image.
+        uses_global_statistics: Whether result depends on statistics of whole image,
+            e.g. its histogram, so modifying only area around face changes result.
+
+    """
+
+    preserves_geometry: bool = True
+    uses_global_statistics: bool = False
 
     @classmethod
     def name(cls) -> str:
@@ -23,3 +57,61 @@ class ModificationInterface(abc.ABC):
         Returns:
             Modified image.
         """
+
+    def perform_with_face_detection(
+        self, image: np.ndarray, face_detection: Optional[FaceDetection]
+    ) -> ModificationResult:
+        """Perform modification on image on which face was already searched for.
+
+        Modifications that need to find face should use provided face detection instead
+        of searching for face again, and return face detection they made otherwise.
+
+        Args:
+            image: OpenCV image.
+            face_detection: Face found on image, None if face was not searched for.
+
+        Returns:
+            Modified image and face found on it, face detection is dropped
+                if modification does not preserve geometry.
+
+        """
+        modified_image = self.perform(image)
+        if not self.preserves_geometry:
+            return ModificationResult(image=modified_image, face_detection=None)
+        return ModificationResult(image=modified_image, face_detection=face_detection)
+
+    def perform_batch(self, images: np.ndarray) -> np.ndarray:
+        """Perform modification on batch of images.
+
+        By default modification is performed on each image separately,
+        modifications should override it with vectorised implementation where possible.
+
+        Args:
+            images: Stack of OpenCV images of the same shape, i.e. (N, H, W, 3) uint8 array.
+
+        Returns:
+            Stack of modified images.
+
+        """
+        return np.stack([self.perform(image) for image in images])
+
+    def perform_batch_with_face_detection(
+        self, images: np.ndarray, face_detections: Sequence[Optional[FaceDetection]]
+    ) -> List[ModificationResult]:
+        """Perform modification on batch of images on which faces were already searched for.
+
+        Args:
+            images: Stack of OpenCV images of the same shape, i.e. (N, H, W, 3) uint8 array.
+            face_detections: Face found on each image, see ``perform_with_face_detection``.
+
+        Returns:
+            Modified images and faces found on them.
+
+        """
+        modified_images = self.perform_batch(images)
+        if not self.preserves_geometry:
+            face_detections = [None] * len(modified_images)
+        return [
+            ModificationResult(image=modified_image, face_detection=face_detection)
+            for modified_image, face_detection in zip(modified_images, face_detections)
+        ]
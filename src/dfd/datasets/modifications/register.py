@@ -1,60 +1,69 @@
 """Modifications register."""
-from typing import Dict, Type
+from typing import List, Mapping, Type, cast
 
 from ...exceptions import DfdError
-from .definitions import (
-    CLAHEModification,
-    GammaCorrectionModification,
-    GaussianBlurModification,
-    GaussianNoiseModification,
-    HistogramEqualizationModification,
-    MedianFilterModification,
-    RedEyesEffectModification,
-)
+from ...plugins import ClassReference, LazyClassRegistry, add_entry_point_references
 from .interfaces import ModificationInterface
 
-NameToModificationTypeMap = Dict[str, Type[ModificationInterface]]
+# Map from name to modification class or reference to it, e.g. "package.module:Class"
+NameToModificationTypeMap = Mapping[str, ClassReference]
+
+ENTRY_POINTS_GROUP = "dfd.modifications"
+
+_DEFINITIONS_MODULE = "dfd.datasets.modifications.definitions"
+
+DEFAULT_MODIFICATIONS: Mapping[str, ClassReference] = {
+    "CLAHEModification": f"{_DEFINITIONS_MODULE}.clahe:CLAHEModification",
+    "GammaCorrectionModification": (
+        f"{_DEFINITIONS_MODULE}.gamma_correction:GammaCorrectionModification"
+    ),
+    "GaussianBlurModification": f"{_DEFINITIONS_MODULE}.gaussian_blur:GaussianBlurModification",
+    "GaussianNoiseModification": (
+        f"{_DEFINITIONS_MODULE}.gaussian_noise:GaussianNoiseModification"
+    ),
+    "HistogramEqualizationModification": (
+        f"{_DEFINITIONS_MODULE}.histogram_equalization:HistogramEqualizationModification"
+    ),
+    "MedianFilterModification": f"{_DEFINITIONS_MODULE}.median_filter:MedianFilterModification",
+    "RedEyesEffectModification": (
+        f"{_DEFINITIONS_MODULE}.red_eyes_effect:RedEyesEffectModification"
+    ),
+}
 
 
 class ModificationRegister:
-    """Define available modifications."""
+    """Define available modifications, modification is imported when first requested."""
 
     def __init__(self, name_to_modification_map: NameToModificationTypeMap) -> None:
-        self._name_to_modification_type_map = name_to_modification_map
+        self._registry = LazyClassRegistry(ModificationInterface, name_to_modification_map)
 
     @classmethod
     def default(cls) -> "ModificationRegister":
         """Create ModificationRegister with default modifications.
 
+        Modifications registered by installed packages in ``dfd.modifications`` entry points
+        group are included as well.
+
         Returns:
             ModificationRegister with default modifications registered.
         """
+        return cls(add_entry_point_references(DEFAULT_MODIFICATIONS, ENTRY_POINTS_GROUP))
 
-        default_modifications = {
-            CLAHEModification,
-            GammaCorrectionModification,
-            HistogramEqualizationModification,
-            RedEyesEffectModification,
-            GaussianBlurModification,
-            MedianFilterModification,
-            GaussianNoiseModification,
-        }
-
-        return cls(
-            {modification.name(): modification for modification in default_modifications},
-        )
+    def names(self) -> List[str]:
+        """Get names of registered modifications, sorted alphabetically."""
+        return self._registry.names()
 
     def get_modification_class(self, modification_name: str) -> Type[ModificationInterface]:
         """Get registered modification via name.
 
         Raises:
-            DfdError: when targeted modification is not registered
+            DfdError: when targeted modification is not registered or cannot be imported
 
         Returns:
             Type of registered modification.
 
         """
-        try:
-            return self._name_to_modification_type_map[modification_name]
-        except KeyError:
+        modification_class = self._registry.get(modification_name)
+        if modification_class is None:
             raise DfdError(f"Modification {modification_name} is not registered.")
+        return cast(Type[ModificationInterface], modification_class)
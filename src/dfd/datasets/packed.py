@@ -0,0 +1,138 @@
+"""Dataset of faces packed into single memory-mappable array."""
+import json
+import pathlib
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import cv2 as cv
+import numpy as np
+import structlog
+from tqdm import tqdm
+
+from dfd.consts import MODEL_INPUT_SIZE
+from dfd.exceptions import DfdError
+
+from .dataset_index import IMAGE_SUFFIXES, DatasetIndex
+
+LOGGER = structlog.get_logger()
+
+INDEX_FILE_NAME = "index.json"
+IMAGES_FILE_NAME = "images.npy"
+LABELS_FILE_NAME = "labels.npy"
+DEFAULT_CLASS_NAMES = ("reals", "fakes")
+
+
+class PackedDataset(NamedTuple):
+    """Faces packed into single array, together with their labels.
+
+    Args:
+        images: memory-mapped array of RGB images, shape (no_images, height, width, 3), uint8
+        labels: index of class of each image, None if images are not labeled
+        file_paths: paths to files from which images were packed
+        class_names: names of classes, ordered by their index
+
+    """
+
+    images: np.ndarray
+    labels: Optional[np.ndarray]
+    file_paths: List[str]
+    class_names: List[str]
+
+    @staticmethod
+    def is_packed(path: pathlib.Path) -> bool:
+        """Check if directory contains packed dataset."""
+        return path.joinpath(INDEX_FILE_NAME).is_file()
+
+    @classmethod
+    def open(cls, path: pathlib.Path) -> "PackedDataset":
+        """Open packed dataset, images are not loaded into memory until accessed.
+
+        Args:
+            path: Path to directory containing packed dataset.
+
+        Raises:
+            DfdError: If directory does not contain packed dataset.
+
+        Returns:
+            Opened dataset.
+
+        """
+        if not cls.is_packed(path):
+            raise DfdError(f"Directory {path} does not contain packed dataset.")
+        with path.joinpath(INDEX_FILE_NAME).open() as index_file:
+            index = json.load(index_file)
+        labels = None
+        if index["labeled"]:
+            labels = np.load(path.joinpath(LABELS_FILE_NAME))
+        return cls(
+            images=np.load(path.joinpath(IMAGES_FILE_NAME), mmap_mode="r"),
+            labels=labels,
+            file_paths=index["file_paths"],
+            class_names=index["class_names"],
+        )
+
+
+def pack_directory(
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    image_size: Tuple[int, int] = MODEL_INPUT_SIZE,
+    class_names: Sequence[str] = DEFAULT_CLASS_NAMES,
+    seed: Optional[int] = None,
+) -> None:
+    """Pack images from directory into single memory-mappable array.
+
+    If input directory contains class sub-directories, images are labeled by class
+    of directory they are placed in, otherwise images are packed without labels.
+    Images are resized and converted to RGB, so they can be fed directly into model.
+
+    Labeled images are shuffled while packing, so contiguous batches of packed images
+    contain mixed classes and can be read sequentially during training.
+
+    Args:
+        input_path: Path to directory containing images.
+        output_path: Path to directory where packed dataset is saved.
+        image_size: Size (height, width) to which images are resized.
+        class_names: Names of class sub-directories, ordered by class index.
+        seed: Seed used to shuffle images.
+
+    Raises:
+        DfdError: If there are no images or image cannot be loaded.
+
+    """
+    LOGGER.info("packing_directory", input_path=str(input_path), output_path=str(output_path))
+    dataset_index = DatasetIndex.build(input_path, class_names, suffixes=IMAGE_SUFFIXES)
+    image_paths, labels = dataset_index.file_paths, dataset_index.labels
+    if not image_paths:
+        raise DfdError(f"No images found in {input_path}.")
+    if labels is not None:
+        permutation = np.random.default_rng(seed).permutation(len(image_paths))
+        image_paths = [image_paths[index] for index in permutation]
+        labels = [labels[index] for index in permutation]
+    output_path.mkdir(parents=True, exist_ok=True)
+    # Index marks packed dataset as complete, remove it before files are overwritten
+    output_path.joinpath(INDEX_FILE_NAME).unlink(missing_ok=True)
+    height, width = image_size
+    images = np.lib.format.open_memmap(
+        output_path.joinpath(IMAGES_FILE_NAME),
+        mode="w+",
+        dtype=np.uint8,
+        shape=(len(image_paths), height, width, 3),
+    )
+    for image_index, image_path in enumerate(tqdm(image_paths, desc="packing")):
+        image = cv.imread(str(image_path))
+        if image is None:
+            raise DfdError(f"Cannot load image {image_path}.")
+        image = cv.resize(image, (width, height), interpolation=cv.INTER_LINEAR)
+        images[image_index] = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+    images.flush()
+    del images
+    if labels is not None:
+        np.save(output_path.joinpath(LABELS_FILE_NAME), np.array(labels, dtype=np.uint8))
+    with output_path.joinpath(INDEX_FILE_NAME).open("w") as index_file:
+        json.dump(
+            {
+                "labeled": labels is not None,
+                "class_names": list(class_names),
+                "file_paths": [str(image_path) for image_path in image_paths],
+            },
+            index_file,
+        )
@@ -4,10 +4,11 @@ Facade that collects different preprocessing related activities (e.g. face extra
 and exposes simple interface.
 
 """
+import enum
 import math
 import pathlib
 import random
-from typing import Generator, List, Optional, Tuple
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Tuple, Union, cast
 
 import cv2 as cv
 import numpy as np
@@ -16,19 +17,168 @@ from tqdm import tqdm
 
 from dfd.exceptions import DfdError
 
+from .dataset_index import DatasetIndex
 from .face_extractor import FaceExtractor
+from .face_location import FaceLocation
+from .face_tracker import FaceTracker
 from .frame_extractor import FrameExtractor
-from .frames_generators import ModificationGenerator
+from .frames_generators import ModificationAssignment, ModificationGenerator
+from .frames_generators.modification import ModifiedFrame
+from .manifest import PendingItem, PreprocessingManifest
+from .packed import pack_directory
 
 FrameAndNamePair = Tuple[np.ndarray, str]
+FaceFinder = Union[FaceExtractor, FaceTracker]
+FaceSavedCallback = Callable[[str, pathlib.Path], None]
+
+FACES_STAGE = "faces"
+MODIFIED_FACES_STAGE = "modified-faces"
+MODIFICATION_ASSIGNMENT_SUFFIX = ".modifications.npz"
 
 LOGGER = structlog.get_logger()
 
 
+class DatasetFormat(enum.Enum):
+    """Format in which preprocessed dataset is saved."""
+
+    PNG = "png"
+    PACKED = "packed"
+
+
+class _CompletedItemsRecorder:
+    """Record items in manifest once faces extracted from all their frames are saved.
+
+    Faces must be saved in the same order in which frames were generated from items,
+    item is recorded as soon as face from frame of next item is saved. Items from which
+    no face was saved, e.g. videos without frames, are recorded once all items are processed,
+    so they are not processed again.
+
+    """
+
+    def __init__(
+        self,
+        manifest: PreprocessingManifest,
+        stage: str,
+        output_path: pathlib.Path,
+        items: Dict[str, PendingItem],
+        get_item_name: Callable[[str], str],
+    ) -> None:
+        self._manifest = manifest
+        self._stage = stage
+        self._output_path = output_path
+        self._items = items
+        self._get_item_name = get_item_name
+        self._unrecorded_item_names = set(items)
+        self._current_item_name: Optional[str] = None
+        self._current_item_outputs: List[str] = []
+
+    def record_face(self, frame_name: str, face_path: pathlib.Path) -> None:
+        item_name = self._get_item_name(frame_name)
+        if item_name != self._current_item_name:
+            self._record_current_item()
+            self._current_item_name = item_name
+        self._current_item_outputs.append(str(face_path))
+
+    def finish(self) -> None:
+        """Record remaining items, must be called only once all items are processed."""
+        self._record_current_item()
+        for item_name in sorted(self._unrecorded_item_names):
+            self._record_item(item_name, [])
+
+    def _record_current_item(self) -> None:
+        if self._current_item_name is not None:
+            self._record_item(self._current_item_name, self._current_item_outputs)
+        self._current_item_name = None
+        self._current_item_outputs = []
+
+    def _record_item(self, item_name: str, outputs: List[str]) -> None:
+        item = self._items[item_name]
+        self._manifest.put(
+            self._stage, self._output_path, str(item.path), item.fingerprint, outputs
+        )
+        self._unrecorded_item_names.discard(item_name)
+
+
+def _get_video_prefix(frame_name: str) -> str:
+    return frame_name.rsplit("_", 1)[0]
+
+
+def _list_files(
+    input_path: pathlib.Path, manifest: Optional[PreprocessingManifest]
+) -> List[pathlib.Path]:
+    # Index saved in manifest is reused, so unchanged directory is not listed again
+    if manifest is None:
+        return DatasetIndex.build(input_path, recursive=False).file_paths
+    return manifest.index_directory(input_path, recursive=False).file_paths
+
+
+def _select_pending_videos(
+    manifest: Optional[PreprocessingManifest],
+    stage: str,
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+) -> Tuple[List[pathlib.Path], Optional[_CompletedItemsRecorder]]:
+    videos = _list_files(input_path, manifest)
+    if manifest is None:
+        return videos, None
+    pending_videos = manifest.select_pending(stage, output_path, videos)
+    recorder = _CompletedItemsRecorder(
+        manifest,
+        stage,
+        output_path,
+        items={video.path.name.split(".")[0]: video for video in pending_videos},
+        get_item_name=_get_video_prefix,
+    )
+    return [video.path for video in pending_videos], recorder
+
+
+def _select_pending_frames(
+    manifest: Optional[PreprocessingManifest],
+    stage: str,
+    frame_paths: List[pathlib.Path],
+    output_path: pathlib.Path,
+) -> Tuple[List[pathlib.Path], Optional[_CompletedItemsRecorder]]:
+    if manifest is None:
+        return frame_paths, None
+    pending_frames = manifest.select_pending(stage, output_path, frame_paths)
+    recorder = _CompletedItemsRecorder(
+        manifest,
+        stage,
+        output_path,
+        items={frame.path.name: frame for frame in pending_frames},
+        get_item_name=lambda frame_name: frame_name,
+    )
+    return [frame.path for frame in pending_frames], recorder
+
+
+def _update_modification_assignment(
+    modification_generator: ModificationGenerator,
+    frame_names: List[str],
+    output_path: pathlib.Path,
+) -> ModificationAssignment:
+    """Load assignment saved next to output directory and assign modifications to new frames.
+
+    Assignment is saved next to output directory, so frames keep their modifications
+    when preprocessing is repeated or resumed.
+
+    """
+    assignment_path = output_path.with_name(output_path.name + MODIFICATION_ASSIGNMENT_SUFFIX)
+    assignment: ModificationAssignment
+    if assignment_path.is_file():
+        saved_assignment = ModificationAssignment.load(assignment_path)
+        assignment = modification_generator.extend_assignment(saved_assignment, frame_names)
+        if assignment is saved_assignment:
+            return assignment
+    else:
+        assignment = modification_generator.create_assignment(frame_names)
+    assignment.save(assignment_path)
+    return assignment
+
+
 def _generate_frame_and_filename_pairs(
-    path: pathlib.Path,
+    frame_paths: Iterable[pathlib.Path],
 ) -> Generator[Tuple[np.ndarray, str], None, None]:
-    for frame_path in path.iterdir():
+    for frame_path in frame_paths:
         frame = cv.imread(str(frame_path))
         if frame is None:
             LOGGER.error(
@@ -39,21 +189,12 @@ def _generate_frame_and_filename_pairs(
         yield frame, frame_path.name
 
 
-def _generate_frame_and_filename_batches(
-    path: pathlib.Path,
+def _batch_frame_and_filename_pairs(
+    frame_and_name_pairs: Iterable[FrameAndNamePair],
     batch_size: int = 64,
 ) -> Generator[List[FrameAndNamePair], None, None]:
     batch: List[FrameAndNamePair] = []
-    for frame_path in path.iterdir():
-        frame = cv.imread(str(frame_path))
-        # OpenCV does not throw exception
-        if frame is None:
-            LOGGER.error(
-                "generate_frame_and_filename_batches:error_loading_frame",
-                frame_path=str(frame_path),
-            )
-            raise DfdError("Path {frame_path} does not exist.".format(frame_path=frame_path))
-        frame_and_name_pair = (frame, frame_path.name)
+    for frame_and_name_pair in frame_and_name_pairs:
         # Frame has different shape than previous ones (i.e. is from different video)
         # TODO: ugly use named tuple instead of [0][0]
         if len(batch) > 0 and batch[0][0].shape != frame_and_name_pair[0].shape:
@@ -71,71 +212,294 @@ def _generate_frame_and_filename_batches(
         yield batch
 
 
-def extract_faces_one_by_one(
-    face_extractor: FaceExtractor,
-    input_path: pathlib.Path,
+def _generate_frame_and_filename_pairs_from_videos(
+    frame_extractor: FrameExtractor,
+    videos: List[pathlib.Path],
+    face_tracker: Optional[FaceTracker] = None,
+) -> Generator[FrameAndNamePair, None, None]:
+    video_prefix = None
+    for extracted_frame in frame_extractor.generate_from_videos(videos):
+        # Frames are consumed one at the time, so tracker is reset
+        # before it receives first frame of next video
+        if face_tracker is not None and extracted_frame.video_prefix != video_prefix:
+            face_tracker.reset()
+            video_prefix = extracted_frame.video_prefix
+        yield extracted_frame.frame, extracted_frame.name
+
+
+def _save_face(face: np.ndarray, face_path: pathlib.Path) -> None:
+    is_frame_saved = cv.imwrite(str(face_path), face)
+    if not is_frame_saved:
+        LOGGER.error(
+            "save_face:error_saving_frame",
+            frame_path=str(face_path),
+            frame=face,
+        )
+        raise DfdError("Cannot save frame under path {frame_path}.".format(frame_path=face_path))
+
+
+def _save_faces_one_by_one(
+    face_extractor: FaceFinder,
+    frame_and_name_pairs: Iterable[FrameAndNamePair],
     output_path: pathlib.Path,
+    no_frames: int,
+    on_face_saved: Optional[FaceSavedCallback] = None,
 ):
-    LOGGER.info("extracting_faces_one_by_one", from_path=str(input_path))
-    no_frames = sum(1 for _ in input_path.iterdir())
-    for frame, file_name in tqdm(_generate_frame_and_filename_pairs(input_path), total=no_frames):
+    for frame, file_name in tqdm(frame_and_name_pairs, total=no_frames):
         extracted_face = face_extractor.extract(frame)
-        extracted_face_path = output_path.joinpath(file_name)
-        cv.imwrite(str(extracted_face_path), extracted_face)
+        face_path = output_path.joinpath(file_name)
+        _save_face(extracted_face, face_path)
+        if on_face_saved is not None:
+            on_face_saved(file_name, face_path)
 
 
-def extract_faces_in_batches(
+def _save_faces_in_batches(
     face_extractor: FaceExtractor,
-    input_path: pathlib.Path,
+    frame_and_name_pairs: Iterable[FrameAndNamePair],
     output_path: pathlib.Path,
     batch_size: int,
+    no_frames: int,
+    on_face_saved: Optional[FaceSavedCallback] = None,
 ):
-    LOGGER.info("extracting_faces_in_batches", from_path=str(input_path))
-    no_frames = sum(1 for _ in input_path.iterdir())
     no_batches = math.ceil(no_frames / batch_size)
     for batch in tqdm(
-        _generate_frame_and_filename_batches(input_path, batch_size=batch_size),
+        _batch_frame_and_filename_pairs(frame_and_name_pairs, batch_size=batch_size),
         total=no_batches,
     ):
         frames_batch, names_batch = zip(*batch)
         face_batch = face_extractor.extract_batch(frames_batch)
         for frame_index, face in enumerate(face_batch):
             face_path = output_path.joinpath(names_batch[frame_index])
-            is_frame_saved = cv.imwrite(str(face_path), face)
-            if not is_frame_saved:
-                LOGGER.error(
-                    "extract_faces_in_batches:error_saving_frame",
-                    frame_path=str(face_path),
-                    frame=face,
-                )
-                raise DfdError(
-                    "Cannot save frame under path {frame_path}.".format(frame_path=face_path)
-                )
+            _save_face(face, face_path)
+            if on_face_saved is not None:
+                on_face_saved(names_batch[frame_index], face_path)
+
+
+def _locate_modified_face(
+    face_extractor: FaceFinder, modified_frame: ModifiedFrame
+) -> Optional[FaceLocation]:
+    if modified_frame.face_detection is not None:
+        # Face was already found while modifying frame
+        return cast(FaceLocation, modified_frame.face_detection.face_location)
+    if modified_frame.preserves_geometry and modified_frame.original_frame is not None:
+        # Face is located on original frame, so found location can be reused (e.g. cached)
+        # regardless of modification performed
+        return face_extractor.locate(modified_frame.original_frame)
+    return face_extractor.locate(modified_frame.frame)
+
+
+def _save_modified_faces(
+    face_extractor: FaceFinder,
+    modified_frames: Iterable[ModifiedFrame],
+    output_path: pathlib.Path,
+    no_frames: int,
+    on_face_saved: Optional[FaceSavedCallback] = None,
+):
+    for modified_frame in tqdm(modified_frames, total=no_frames, desc="real frames"):
+        modified_frame_dir = output_path.joinpath(modified_frame.modification_used)
+        modified_frame_dir.mkdir(exist_ok=True, parents=True)
+        modified_frame_path = modified_frame_dir.joinpath(modified_frame.original_path.name)
+        if modified_frame.is_cropped:
+            # Only area around face was modified, so it is already cropped
+            frame_to_write = modified_frame.frame
+        else:
+            frame_to_write = face_extractor.crop(
+                modified_frame.frame, _locate_modified_face(face_extractor, modified_frame)
+            )
+        cv.imwrite(str(modified_frame_path), frame_to_write)
+        if on_face_saved is not None:
+            on_face_saved(modified_frame.original_path.name, modified_frame_path)
+
+
+def _preprocess_fakes_in_memory(
+    frame_extractor: FrameExtractor,
+    face_extractor: FaceExtractor,
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    batch_size: Optional[int],
+    keyframe_interval: Optional[int],
+    manifest: Optional[PreprocessingManifest],
+):
+    videos, recorder = _select_pending_videos(manifest, FACES_STAGE, input_path, output_path)
+    on_face_saved = recorder.record_face if recorder is not None else None
+    no_frames = frame_extractor.count_frames_in_videos(videos)
+    face_tracker = None
+    if keyframe_interval:
+        face_tracker = FaceTracker(face_extractor, keyframe_interval=keyframe_interval)
+    frame_and_name_pairs = _generate_frame_and_filename_pairs_from_videos(
+        frame_extractor, videos, face_tracker=face_tracker
+    )
+    if face_tracker is not None:
+        # Faces are tracked frame by frame, batches cannot be used
+        _save_faces_one_by_one(
+            face_tracker,
+            frame_and_name_pairs,
+            output_path=output_path,
+            no_frames=no_frames,
+            on_face_saved=on_face_saved,
+        )
+    elif not batch_size:
+        _save_faces_one_by_one(
+            face_extractor,
+            frame_and_name_pairs,
+            output_path=output_path,
+            no_frames=no_frames,
+            on_face_saved=on_face_saved,
+        )
+    else:
+        _save_faces_in_batches(
+            face_extractor,
+            frame_and_name_pairs,
+            output_path=output_path,
+            batch_size=batch_size,
+            no_frames=no_frames,
+            on_face_saved=on_face_saved,
+        )
+    if recorder is not None:
+        recorder.finish()
+
+
+def _preprocess_reals_in_memory(
+    frame_extractor: FrameExtractor,
+    face_extractor: FaceExtractor,
+    modification_generator: ModificationGenerator,
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    keyframe_interval: Optional[int],
+    manifest: Optional[PreprocessingManifest],
+):
+    videos, recorder = _select_pending_videos(
+        manifest, MODIFIED_FACES_STAGE, input_path, output_path
+    )
+    # Frames are listed without being decoded, so modifications can be assigned by their names
+    frame_names = frame_extractor.list_frame_names(videos)
+    assignment = None
+    if not modification_generator.fans_out:
+        assignment = _update_modification_assignment(
+            modification_generator, frame_names, output_path
+        )
+    face_finder: FaceFinder = face_extractor
+    face_tracker = None
+    if keyframe_interval:
+        face_finder = face_tracker = FaceTracker(
+            face_extractor, keyframe_interval=keyframe_interval
+        )
+    input_frames = (
+        (frame, pathlib.Path(name))
+        for frame, name in _generate_frame_and_filename_pairs_from_videos(
+            frame_extractor, videos, face_tracker=face_tracker
+        )
+    )
+    _save_modified_faces(
+        face_finder,
+        modification_generator.from_frames(
+            input_frames,
+            no_frames=len(frame_names),
+            face_locator=face_finder.locate,
+            assignment=assignment,
+            crop_locator=face_finder.get_crop_location,
+        ),
+        output_path=output_path,
+        no_frames=len(frame_names) * modification_generator.no_variants_per_frame,
+        on_face_saved=recorder.record_face if recorder is not None else None,
+    )
+    if recorder is not None:
+        recorder.finish()
+
+
+def extract_faces_one_by_one(
+    face_extractor: FaceExtractor,
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    manifest: Optional[PreprocessingManifest] = None,
+):
+    LOGGER.info("extracting_faces_one_by_one", from_path=str(input_path))
+    frame_paths, recorder = _select_pending_frames(
+        manifest, FACES_STAGE, _list_files(input_path, manifest), output_path
+    )
+    _save_faces_one_by_one(
+        face_extractor,
+        _generate_frame_and_filename_pairs(frame_paths),
+        output_path=output_path,
+        no_frames=len(frame_paths),
+        on_face_saved=recorder.record_face if recorder is not None else None,
+    )
+    if recorder is not None:
+        recorder.finish()
+
+
+def extract_faces_in_batches(
+    face_extractor: FaceExtractor,
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    batch_size: int,
+    manifest: Optional[PreprocessingManifest] = None,
+):
+    LOGGER.info("extracting_faces_in_batches", from_path=str(input_path))
+    frame_paths, recorder = _select_pending_frames(
+        manifest, FACES_STAGE, _list_files(input_path, manifest), output_path
+    )
+    _save_faces_in_batches(
+        face_extractor,
+        _generate_frame_and_filename_pairs(frame_paths),
+        output_path=output_path,
+        batch_size=batch_size,
+        no_frames=len(frame_paths),
+        on_face_saved=recorder.record_face if recorder is not None else None,
+    )
+    if recorder is not None:
+        recorder.finish()
 
 
 def preprocess_fakes(
     frame_extractor: FrameExtractor,
     face_extractor: FaceExtractor,
     input_path: pathlib.Path,
-    storage_path: pathlib.Path,
+    storage_path: Optional[pathlib.Path],
     output_path: pathlib.Path,
     batch_size: Optional[int] = None,
+    keyframe_interval: Optional[int] = None,
+    manifest: Optional[PreprocessingManifest] = None,
 ):
+    """Extract faces from fake videos.
+
+    If storage path is not specified frames are extracted in memory and passed
+    directly to face extraction, only extracted faces are saved. In such case,
+    if keyframe interval is specified, faces are detected only on keyframes
+    and tracked on remaining frames, see ``FaceTracker``.
+
+    If manifest is provided only videos (or frames) not processed yet or changed
+    since are processed, see ``PreprocessingManifest``.
+
+    """
     LOGGER.info(
         "preprocessing_fakes",
         input_path=str(input_path),
         storage_path=str(storage_path),
         output_path=str(output_path),
     )
+    if storage_path is None:
+        _preprocess_fakes_in_memory(
+            frame_extractor,
+            face_extractor,
+            input_path=input_path,
+            output_path=output_path,
+            batch_size=batch_size,
+            keyframe_interval=keyframe_interval,
+            manifest=manifest,
+        )
+        return
     frame_extractor.extract_batch(
         input_path,
         storage_path,
+        manifest=manifest,
     )
     if not batch_size:
         extract_faces_one_by_one(
             face_extractor,
             input_path=storage_path,
             output_path=output_path,
+            manifest=manifest,
         )
     else:
         extract_faces_in_batches(
@@ -143,6 +507,7 @@ def preprocess_fakes(
             input_path=storage_path,
             output_path=output_path,
             batch_size=batch_size,
+            manifest=manifest,
         )
 
 
@@ -151,23 +516,44 @@ def modify_frames(
     modification_generator: ModificationGenerator,
     input_path: pathlib.Path,
     output_path: pathlib.Path,
+    manifest: Optional[PreprocessingManifest] = None,
 ):
+    """Modify frames from directory and extract faces from them.
+
+    Modifications assigned to frames are saved next to output directory, see
+    ``ModificationAssignment``, so repeated or resumed runs modify each frame the same way.
+    If modifications are fanned out each frame is modified with all of them,
+    so e.g. whole sweep over modification parameters is prepared in single pass.
+
+    """
     LOGGER.info(
         "modifying_frames",
         input_path=str(input_path),
         output_path=str(output_path),
     )
-    no_frames = sum(1 for path in input_path.rglob("*") if path.is_file())
-    for modified_frame in tqdm(
-        modification_generator.from_directory(input_path), total=no_frames, desc="real frames"
-    ):
-        modified_frame_dir = output_path.joinpath(modified_frame.modification_used)
-        modified_frame_dir.mkdir(exist_ok=True, parents=True)
-        modified_frame_path = modified_frame_dir.joinpath(modified_frame.original_path.name)
-        # Extract faces from modified frames if flag was set
-        frame_to_write = modified_frame.frame
-        frame_to_write = face_extractor.extract(frame_to_write)
-        cv.imwrite(str(modified_frame_path), frame_to_write)
+    all_frame_paths = _list_files(input_path, manifest)
+    assignment = None
+    if not modification_generator.fans_out:
+        assignment = _update_modification_assignment(
+            modification_generator, [frame_path.name for frame_path in all_frame_paths], output_path
+        )
+    frame_paths, recorder = _select_pending_frames(
+        manifest, MODIFIED_FACES_STAGE, all_frame_paths, output_path
+    )
+    _save_modified_faces(
+        face_extractor,
+        modification_generator.from_paths(
+            frame_paths,
+            face_locator=face_extractor.locate,
+            assignment=assignment,
+            crop_locator=face_extractor.get_crop_location,
+        ),
+        output_path=output_path,
+        no_frames=len(frame_paths) * modification_generator.no_variants_per_frame,
+        on_face_saved=recorder.record_face if recorder is not None else None,
+    )
+    if recorder is not None:
+        recorder.finish()
 
 
 def preprocess_reals(
@@ -175,20 +561,50 @@ def preprocess_reals(
     face_extractor: FaceExtractor,
     modification_generator: ModificationGenerator,
     input_path: pathlib.Path,
-    storage_path: pathlib.Path,
+    storage_path: Optional[pathlib.Path],
     output_path: pathlib.Path,
+    keyframe_interval: Optional[int] = None,
+    manifest: Optional[PreprocessingManifest] = None,
 ):
+    """Modify frames of real videos and extract faces from them.
+
+    If storage path is not specified frames are extracted in memory and passed
+    directly to modification generator, only extracted faces are saved. In such case,
+    if keyframe interval is specified, faces are detected only on keyframes
+    and tracked on remaining frames, see ``FaceTracker``.
+
+    Either way modifications assigned to frames are saved next to output directory,
+    see ``modify_frames``.
+
+    If manifest is provided only videos (or frames) not processed yet or changed
+    since are processed, see ``PreprocessingManifest``.
+
+    """
     LOGGER.info(
         "preprocessing_reals",
         input_path=str(input_path),
         storage_path=str(storage_path),
         output_path=str(output_path),
     )
+    if storage_path is None:
+        _preprocess_reals_in_memory(
+            frame_extractor,
+            face_extractor,
+            modification_generator,
+            input_path=input_path,
+            output_path=output_path,
+            keyframe_interval=keyframe_interval,
+            manifest=manifest,
+        )
+        return
     frame_extractor.extract_batch(
         input_path,
         storage_path,
+        manifest=manifest,
+    )
+    modify_frames(
+        face_extractor, modification_generator, storage_path, output_path, manifest=manifest
     )
-    modify_frames(face_extractor, modification_generator, storage_path, output_path)
 
 
 def split(
@@ -279,9 +695,10 @@ def preprocess_single_directory(
     face_extractor: FaceExtractor,
     modification_generator: ModificationGenerator,
     input_path: pathlib.Path,
-    storage_path: pathlib.Path,
+    storage_path: Optional[pathlib.Path],
     output_path: pathlib.Path,
     batch_size: Optional[int] = None,
+    manifest: Optional[PreprocessingManifest] = None,
 ) -> None:
     """Preprocess single directory containing real & fakes videos.
 
@@ -290,6 +707,9 @@ def preprocess_single_directory(
             reals: original videos
             fakes: synthesized videos
 
+    If storage path is not specified frames extracted from videos are not saved.
+    If manifest is provided work completed in previous runs is skipped.
+
     """
     LOGGER.info(
         "preprocessing_directory",
@@ -297,9 +717,13 @@ def preprocess_single_directory(
         storage_path=str(storage_path),
         output_path=str(output_path),
     )
-    # Create storage paths
-    storage_path.joinpath("reals").mkdir(parents=True, exist_ok=True)
-    storage_path.joinpath("fakes").mkdir(parents=True, exist_ok=True)
+    reals_storage_path, fakes_storage_path = None, None
+    if storage_path is not None:
+        reals_storage_path = storage_path / "reals"
+        fakes_storage_path = storage_path / "fakes"
+        # Create storage paths
+        reals_storage_path.mkdir(parents=True, exist_ok=True)
+        fakes_storage_path.mkdir(parents=True, exist_ok=True)
     # Create output paths
     output_path.joinpath("reals").mkdir(parents=True, exist_ok=True)
     output_path.joinpath("fakes").mkdir(parents=True, exist_ok=True)
@@ -308,16 +732,18 @@ def preprocess_single_directory(
         face_extractor=face_extractor,
         modification_generator=modification_generator,
         input_path=input_path / "reals",
-        storage_path=storage_path / "reals",
+        storage_path=reals_storage_path,
         output_path=output_path / "reals",
+        manifest=manifest,
     )
     preprocess_fakes(
         frame_extractor=frame_extractor,
         face_extractor=face_extractor,
         input_path=input_path / "fakes",
-        storage_path=storage_path / "fakes",
+        storage_path=fakes_storage_path,
         output_path=output_path / "fakes",
         batch_size=batch_size,
+        manifest=manifest,
     )
 
 
@@ -332,6 +758,9 @@ def preprocess_whole_dataset(
     train_ds_share: Optional[float] = None,
     validation_ds_share: Optional[float] = None,
     test_ds_share: Optional[float] = None,
+    in_memory: bool = False,
+    manifest: Optional[PreprocessingManifest] = None,
+    dataset_format: DatasetFormat = DatasetFormat.PNG,
 ) -> None:
     """Preprocess single directory containing real & fakes videos.
 
@@ -340,6 +769,17 @@ def preprocess_whole_dataset(
             reals: original videos
             fakes: synthesized videos
 
+    Storage path is used to store split videos and, unless ``in_memory`` is set,
+    frames extracted from them.
+
+    Split moves videos out of input directory, so when preprocessing is repeated only
+    newly added videos are split. If manifest is provided only videos not processed yet
+    (or changed since) are preprocessed, so dataset can be extended incrementally
+    and interrupted preprocessing can be resumed.
+
+    If packed format is used extracted faces are saved in storage path and each dataset
+    is then packed into output path, see ``pack_directory``.
+
     """
     LOGGER.info(
         "preprocessing_dataset",
@@ -355,12 +795,18 @@ def preprocess_whole_dataset(
         test_ds_share=test_ds_share,
     )
     for dataset in ("train", "validation", "test"):
+        faces_path = output_path / dataset
+        if dataset_format == DatasetFormat.PACKED:
+            faces_path = storage_path / "faces" / dataset
         preprocess_single_directory(
             frame_extractor=frame_extractor,
             face_extractor=face_extractor,
             modification_generator=modification_generator,
             input_path=storage_path / "videos" / dataset,
-            storage_path=storage_path / "frames" / dataset,
-            output_path=output_path / dataset,
+            storage_path=None if in_memory else storage_path / "frames" / dataset,
+            output_path=faces_path,
             batch_size=batch_size,
+            manifest=manifest,
         )
+        if dataset_format == DatasetFormat.PACKED:
+            pack_directory(faces_path, output_path / dataset)
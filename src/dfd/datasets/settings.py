@@ -1,6 +1,7 @@
 """Generator settings."""
+import enum
 import pathlib
-from typing import List
+from typing import List, Optional
 
 import pydantic
 import yaml
@@ -9,25 +10,63 @@ import yaml
 from dfd import assets
 
 
+class ModificationOrder(str, enum.Enum):
+    """Order in which frame is modified and face is cropped from it."""
+
+    MODIFY_THEN_CROP = "modify_then_crop"
+    CROP_THEN_MODIFY = "crop_then_modify"
+
+
 class ModificationSettings(pydantic.BaseModel):
     """Settings for single modification.
 
     Args:
         modification_name: name, used to retrieve modification from ModificationRegistry
-        share: share of frames on which modification should be applied
+        share: share of frames on which modification should be applied,
+            not used if modifications are fanned out
         options: modification options, i.e. parameters provided to modification __init__
+        order: order in which frame is modified and face is cropped, if not set
+            order defined in generator settings is used
 
     """
 
     name: str
-    share: float
+    share: Optional[float] = None
     options: dict = {}
+    order: Optional[ModificationOrder] = None
 
 
 class GeneratorSettings(pydantic.BaseModel):
-    """Generator settings."""
+    """Generator settings.
+
+    Args:
+        modifications: settings of modifications
+        fan_out: whether each frame is modified with all modifications, e.g. to prepare sweep
+            over modification parameters, otherwise each frame is modified with single
+            modification, chosen according to shares
+        order: default order in which frame is modified and face is cropped, if face is
+            cropped first only area around face is modified, which is much faster for large
+            frames. Modifications that use global statistics of frame, e.g. histogram
+            equalization, are performed on whole frame unless their order is set explicitly.
+        crop_margin: margin in pixels added to each side of cropped area before it is
+            modified, so modifications using neighbouring pixels, e.g. blur,
+            give the same result as on whole frame
+
+    """
 
     modifications: List[ModificationSettings]
+    fan_out: bool = False
+    order: ModificationOrder = ModificationOrder.MODIFY_THEN_CROP
+    crop_margin: int = 16
+
+    @pydantic.root_validator(skip_on_failure=True)
+    def _check_shares_are_set(cls, values):
+        if values["fan_out"]:
+            return values
+        for modification_settings in values["modifications"]:
+            if modification_settings.share is None:
+                raise ValueError(f"Share of modification {modification_settings.name} is not set.")
+        return values
 
     @classmethod
     def from_yaml(cls, yaml_filepath: pathlib.Path) -> "GeneratorSettings":
@@ -1,4 +1,4 @@
 """ML models."""
 
-from .interface import ModelInterface
+from .interface import CacheMode, ModelInterface, TrainingSettings
 from .registry import ModelRegistry
@@ -5,4 +5,20 @@ in this package. Instead higher level interface should be used to reduce couplin
 
 """
 
-from .meso_net import MesoNet
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .meso_net import MesoNet
+
+# Models are imported on first access, so e.g. model run by OpenCV doesn't import TensorFlow
+_NAME_TO_MODULE_MAP = {"MesoNet": "meso_net"}
+
+__all__ = sorted(_NAME_TO_MODULE_MAP)
+
+
+def __getattr__(name: str) -> t.Any:
+    module_name = _NAME_TO_MODULE_MAP.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    return getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
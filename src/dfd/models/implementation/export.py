@@ -0,0 +1,422 @@
+"""Export MesoNet as frozen, inference-only graph."""
+import enum
+import functools
+import pathlib
+import tempfile
+import time
+import typing as t
+
+import numpy as np
+import structlog
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from dfd.exceptions import DfdError
+
+from ..interface import ModelInterface
+
+LOGGER = structlog.get_logger()
+
+_MODEL_INPUT_SHAPE: t.Final = (256, 256, 3)
+_ACTIVATIONS: t.Final = {"linear": tf.identity, "relu": tf.nn.relu, "sigmoid": tf.sigmoid}
+
+
+class ExportFormat(str, enum.Enum):
+    """Format of exported model."""
+
+    SAVED_MODEL = "saved-model"
+    TFLITE = "tflite"
+    # TensorFlow graph with weights embedded as constants, it can be run by OpenCV DNN
+    FROZEN_GRAPH = "frozen-graph"
+
+
+class Quantization(str, enum.Enum):
+    """Post-training quantization of exported weights, supported only by TFLite format.
+
+    INT8 quantizes activations as well, their ranges are calibrated on sample faces.
+
+    """
+
+    NONE = "none"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+
+
+class _Convolution(t.NamedTuple):
+    kernel: np.ndarray
+    bias: np.ndarray
+    strides: t.Tuple[int, int]
+    padding: str
+    activation: str
+
+
+class _ChannelAffine(t.NamedTuple):
+    """Per-channel ``x * scale + shift``, scale is omitted once folded into convolution."""
+
+    scale: t.Optional[np.ndarray]
+    shift: np.ndarray
+
+
+class _MaxPooling(t.NamedTuple):
+    pool_size: t.Tuple[int, int]
+    strides: t.Tuple[int, int]
+    padding: str
+
+
+class _Flatten(t.NamedTuple):
+    pass
+
+
+class _Dense(t.NamedTuple):
+    kernel: np.ndarray
+    bias: np.ndarray
+    activation: str
+
+
+class _LeakyReLU(t.NamedTuple):
+    negative_slope: float
+
+
+_Operation = t.Union[_Convolution, _ChannelAffine, _MaxPooling, _Flatten, _Dense, _LeakyReLU]
+
+
+def fold_batch_normalization(model: keras.Sequential) -> t.List[_Operation]:
+    """Translate model into inference-only operations with batch normalization folded.
+
+    Batch normalization at inference is per-channel affine transformation. In Meso-4 it
+    follows ReLU of convolution, so only its scale can be folded into convolution
+    (``scale * relu(x) == relu(scale * x)`` for positive scale) and its shift is added
+    after ReLU. Shift of last block passes through max pooling and flattening and is folded
+    into bias of dense layer. Dropout is dropped.
+
+    Raises:
+        DfdError: If model contains unsupported layer.
+
+    Returns:
+        Operations computing the same output as model.
+
+    """
+    operations = _fold_shifts_into_dense(_fold_scales_into_convolutions(_read_operations(model)))
+    LOGGER.info(
+        "folded_batch_normalization",
+        no_layers=len(model.layers),
+        no_operations=len(operations),
+    )
+    return operations
+
+
+def build_inference_module(operations: t.Sequence[_Operation]) -> tf.Module:
+    """Build module predicting confidences, weights are embedded into graph as constants."""
+    module = tf.Module()
+
+    @tf.function(input_signature=[tf.TensorSpec([None, *_MODEL_INPUT_SHAPE], tf.float32)])
+    def predict(faces: tf.Tensor) -> tf.Tensor:
+        outputs = faces
+        for operation in operations:
+            outputs = _apply(operation, outputs)
+        return outputs
+
+    module.predict = predict
+    return module
+
+
+def export_meso_net(
+    model: keras.Sequential,
+    output_path: pathlib.Path,
+    export_format: ExportFormat = ExportFormat.SAVED_MODEL,
+    quantization: Quantization = Quantization.NONE,
+    calibration_faces: t.Optional[t.Callable[[], t.Iterable[np.ndarray]]] = None,
+) -> pathlib.Path:
+    """Export model with batch normalization folded, see ``fold_batch_normalization``.
+
+    Args:
+        model: Trained Meso-4 model.
+        output_path: Path to exported model, ``.tflite`` suffix is added for TFLite format
+            and ``.pb`` suffix for frozen graph.
+        export_format: Format of exported model.
+        quantization: Post-training quantization of exported model.
+        calibration_faces: Function returning sample RGB faces of model input size,
+            required by INT8 quantization.
+
+    Raises:
+        DfdError: If quantization is not supported by format or calibration faces are missing.
+
+    Returns:
+        Path to exported model.
+
+    """
+    if export_format != ExportFormat.TFLITE and quantization != Quantization.NONE:
+        raise DfdError("Quantization is supported only by TFLite format.")
+    representative_dataset = None
+    if quantization == Quantization.INT8:
+        if calibration_faces is None:
+            raise DfdError("Calibration faces are required by INT8 quantization.")
+        representative_dataset = functools.partial(
+            _generate_representative_dataset, calibration_faces
+        )
+    operations = fold_batch_normalization(model)
+    if export_format == ExportFormat.FROZEN_GRAPH:
+        output_path = output_path.with_suffix(".pb")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(_freeze_graph(build_inference_module(_add_unit_scales(operations))))
+        return output_path
+    module = build_inference_module(operations)
+    if export_format == ExportFormat.SAVED_MODEL:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tf.saved_model.save(module, str(output_path))
+        return output_path
+    with tempfile.TemporaryDirectory() as saved_model_path:
+        tf.saved_model.save(module, saved_model_path)
+        converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_path)
+        if quantization == Quantization.FLOAT16:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantization == Quantization.INT8:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        tflite_model = converter.convert()
+    output_path = output_path.with_suffix(".tflite")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(tflite_model)
+    return output_path
+
+
+def _generate_representative_dataset(
+    calibration_faces: t.Callable[[], t.Iterable[np.ndarray]],
+) -> t.Iterator[t.List[np.ndarray]]:
+    for face in calibration_faces():
+        yield [np.asarray(face, dtype=np.float32)[np.newaxis]]
+
+
+def _add_unit_scales(operations: t.Sequence[_Operation]) -> t.List[_Operation]:
+    """Add unit scale to per-channel shifts, OpenCV DNN imports shift only after scale."""
+    return [
+        (
+            _ChannelAffine(np.ones_like(operation.shift), operation.shift)
+            if isinstance(operation, _ChannelAffine) and operation.scale is None
+            else operation
+        )
+        for operation in operations
+    ]
+
+
+def _freeze_graph(module: tf.Module) -> bytes:
+    """Serialize graph of module prediction, weights are already embedded as constants."""
+    graph_def = module.predict.get_concrete_function().graph.as_graph_def()
+    for node in graph_def.node:
+        if node.op == "Const":
+            # OpenCV DNN reads constants only from tensor content, while TensorFlow keeps
+            # e.g. single element tensors in typed value fields
+            tensor = node.attr["value"].tensor
+            values = tf.make_ndarray(tensor)
+            for field_name in ["float_val", "int_val", "int64_val"]:
+                tensor.ClearField(field_name)
+            tensor.tensor_content = values.tobytes()
+    return t.cast(bytes, graph_def.SerializeToString())
+
+
+def _read_operations(model: keras.Sequential) -> t.List[_Operation]:
+    operations: t.List[_Operation] = []
+    for layer in model.layers:
+        config = layer.get_config()
+        weights = layer.get_weights()
+        if isinstance(layer, layers.Conv2D):
+            kernel, bias = _get_kernel_and_bias(weights, config)
+            operations.append(
+                _Convolution(
+                    kernel,
+                    bias,
+                    tuple(config["strides"]),
+                    config["padding"].upper(),
+                    _get_activation_name(config),
+                )
+            )
+        elif isinstance(layer, layers.BatchNormalization):
+            gamma = weights.pop(0) if config["scale"] else 1
+            beta = weights.pop(0) if config["center"] else 0
+            moving_mean, moving_variance = weights
+            scale = gamma / np.sqrt(moving_variance + config["epsilon"])
+            operations.append(_ChannelAffine(scale, beta - moving_mean * scale))
+        elif isinstance(layer, layers.MaxPooling2D):
+            operations.append(
+                _MaxPooling(
+                    tuple(config["pool_size"]),
+                    tuple(config["strides"] or config["pool_size"]),
+                    config["padding"].upper(),
+                )
+            )
+        elif isinstance(layer, layers.Flatten):
+            operations.append(_Flatten())
+        elif isinstance(layer, layers.Dense):
+            kernel, bias = _get_kernel_and_bias(weights, config)
+            operations.append(_Dense(kernel, bias, _get_activation_name(config)))
+        elif isinstance(layer, layers.LeakyReLU):
+            # Argument was renamed in Keras 3
+            operations.append(_LeakyReLU(config.get("negative_slope", config.get("alpha"))))
+        elif not isinstance(layer, layers.Dropout):
+            raise DfdError(f"Layer {type(layer).__name__} cannot be exported.")
+    return operations
+
+
+def _get_kernel_and_bias(
+    weights: t.List[np.ndarray], config: t.Dict[str, t.Any]
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    kernel = weights[0]
+    bias = weights[1] if config["use_bias"] else np.zeros(kernel.shape[-1], dtype=kernel.dtype)
+    return kernel, bias
+
+
+def _get_activation_name(config: t.Dict[str, t.Any]) -> str:
+    activation: str = config["activation"]
+    if activation not in _ACTIVATIONS:
+        raise DfdError(f"Activation {activation} cannot be exported.")
+    return activation
+
+
+def _fold_scales_into_convolutions(operations: t.List[_Operation]) -> t.List[_Operation]:
+    folded_operations: t.List[_Operation] = []
+    for operation in operations:
+        previous_operation = folded_operations[-1] if folded_operations else None
+        if (
+            not isinstance(operation, _ChannelAffine)
+            or operation.scale is None
+            or not isinstance(previous_operation, _Convolution)
+        ):
+            folded_operations.append(operation)
+        elif previous_operation.activation == "linear":
+            folded_operations[-1] = previous_operation._replace(
+                kernel=previous_operation.kernel * operation.scale,
+                bias=previous_operation.bias * operation.scale + operation.shift,
+            )
+        elif previous_operation.activation == "relu" and np.all(operation.scale > 0):
+            folded_operations[-1] = previous_operation._replace(
+                kernel=previous_operation.kernel * operation.scale,
+                bias=previous_operation.bias * operation.scale,
+            )
+            folded_operations.append(_ChannelAffine(None, operation.shift))
+        else:
+            # Negative scale does not commute with ReLU, affine is kept
+            folded_operations.append(operation)
+    return folded_operations
+
+
+def _fold_shifts_into_dense(operations: t.List[_Operation]) -> t.List[_Operation]:
+    """Fold per-channel affine followed only by max pooling and flattening into dense layer.
+
+    Max pooling commutes with per-channel affine of positive scale, flattening turns it
+    into per-feature affine, which is folded into dense kernel and bias.
+
+    """
+    folded_operations = list(operations)
+    for affine_index in reversed(range(len(folded_operations))):
+        affine = folded_operations[affine_index]
+        if not isinstance(affine, _ChannelAffine) or (
+            affine.scale is not None and not np.all(affine.scale > 0)
+        ):
+            continue
+        dense_index = affine_index + 1
+        while dense_index < len(folded_operations) and isinstance(
+            folded_operations[dense_index], _MaxPooling
+        ):
+            dense_index += 1
+        if dense_index + 1 >= len(folded_operations):
+            continue
+        flatten, dense = folded_operations[dense_index], folded_operations[dense_index + 1]
+        if not isinstance(flatten, _Flatten) or not isinstance(dense, _Dense):
+            continue
+        # Features are flattened in channels last order, so channels repeat for each position
+        no_positions = len(dense.kernel) // len(affine.shift)
+        shift = np.tile(affine.shift, no_positions)
+        kernel = dense.kernel
+        if affine.scale is not None:
+            kernel = kernel * np.tile(affine.scale, no_positions)[:, np.newaxis]
+        folded_operations[dense_index + 1] = dense._replace(
+            kernel=kernel, bias=dense.bias + shift @ dense.kernel
+        )
+        del folded_operations[affine_index]
+    return folded_operations
+
+
+def _apply(operation: _Operation, inputs: tf.Tensor) -> tf.Tensor:
+    if isinstance(operation, _Convolution):
+        outputs = tf.nn.conv2d(
+            inputs, operation.kernel, strides=operation.strides, padding=operation.padding
+        )
+        return _ACTIVATIONS[operation.activation](tf.nn.bias_add(outputs, operation.bias))
+    if isinstance(operation, _ChannelAffine):
+        if operation.scale is not None:
+            return inputs * operation.scale + operation.shift
+        return tf.nn.bias_add(inputs, operation.shift)
+    if isinstance(operation, _MaxPooling):
+        return tf.nn.max_pool2d(
+            inputs, operation.pool_size, strides=operation.strides, padding=operation.padding
+        )
+    if isinstance(operation, _Flatten):
+        return tf.reshape(inputs, [-1, int(np.prod(inputs.shape[1:]))])
+    if isinstance(operation, _Dense):
+        outputs = tf.nn.bias_add(tf.matmul(inputs, operation.kernel), operation.bias)
+        return _ACTIVATIONS[operation.activation](outputs)
+    return tf.nn.leaky_relu(inputs, alpha=operation.negative_slope)
+
+
+def compare_models(
+    original_model: ModelInterface,
+    exported_model: ModelInterface,
+    faces: np.ndarray,
+    labels: t.Optional[t.Sequence[int]] = None,
+    no_latency_runs: int = 20,
+    batch_size: int = 32,
+) -> t.Dict[str, float]:
+    """Compare confidences, accuracy and latency of exported model with original model.
+
+    Args:
+        original_model: Model before export.
+        exported_model: Exported model.
+        faces: RGB faces of model input size.
+        labels: Label of each face, 1 for fake, if not given accuracy is not compared.
+        no_latency_runs: Number of runs over which median latency is measured.
+        batch_size: Number of faces scored together when batch latency is measured.
+
+    Returns:
+        Metrics of both models and their differences.
+
+    """
+    original_confidences = np.fromiter(original_model.predict_iter(faces, batch_size), np.float64)
+    exported_confidences = np.fromiter(exported_model.predict_iter(faces, batch_size), np.float64)
+    confidence_differences = np.abs(original_confidences - exported_confidences)
+    comparison = {
+        "max_confidence_difference": float(np.max(confidence_differences)),
+        "mean_confidence_difference": float(np.mean(confidence_differences)),
+        "prediction_agreement": float(
+            np.mean((original_confidences >= 0.5) == (exported_confidences >= 0.5))
+        ),
+    }
+    if labels is not None:
+        labels_array = np.asarray(labels, dtype=bool)
+        original_accuracy = float(np.mean((original_confidences >= 0.5) == labels_array))
+        exported_accuracy = float(np.mean((exported_confidences >= 0.5) == labels_array))
+        comparison["original_accuracy"] = original_accuracy
+        comparison["exported_accuracy"] = exported_accuracy
+        comparison["accuracy_delta"] = exported_accuracy - original_accuracy
+    # Faces are repeated if there is less of them than batch size
+    batch = np.resize(faces, (batch_size, *faces.shape[1:])).astype(np.float32)
+    for name, latency_batch in [("latency_ms", batch[:1]), ("batch_latency_ms", batch)]:
+        original_latency = _measure_latency(original_model, latency_batch, no_latency_runs)
+        exported_latency = _measure_latency(exported_model, latency_batch, no_latency_runs)
+        comparison[f"original_{name}"] = original_latency
+        comparison[f"exported_{name}"] = exported_latency
+        comparison[f"{name}_delta"] = exported_latency - original_latency
+    return comparison
+
+
+def _measure_latency(model: ModelInterface, faces: np.ndarray, no_runs: int) -> float:
+    """Measure median latency of scoring faces in milliseconds, first run is not measured."""
+    model.predict_arrays(faces)
+    latencies = []
+    for _ in range(no_runs):
+        start_time = time.perf_counter()
+        model.predict_arrays(faces)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    return float(np.median(latencies))
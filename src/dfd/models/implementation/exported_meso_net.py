@@ -0,0 +1,82 @@
+"""Run MesoNet exported as SavedModel or TFLite model."""
+import pathlib
+import typing as t
+
+import numpy as np
+import tensorflow as tf
+
+from dfd.exceptions import DfdError
+
+from ..interface import ModelInterface
+from .inference_only import InferenceOnlyModel
+from .meso_net import set_intra_op_threads
+
+
+class _TFLiteRunner:
+    """Run TFLite model, input tensor is resized only when batch size changes."""
+
+    def __init__(self, path: pathlib.Path, num_threads: t.Optional[int] = None) -> None:
+        self._interpreter = tf.lite.Interpreter(model_path=str(path), num_threads=num_threads)
+        self._input_index = self._interpreter.get_input_details()[0]["index"]
+        self._output_index = self._interpreter.get_output_details()[0]["index"]
+        self._batch_size: t.Optional[int] = None
+
+    def __call__(self, faces: np.ndarray) -> np.ndarray:
+        if len(faces) != self._batch_size:
+            self._interpreter.resize_tensor_input(self._input_index, faces.shape)
+            self._interpreter.allocate_tensors()
+            self._batch_size = len(faces)
+        self._interpreter.set_tensor(self._input_index, faces)
+        self._interpreter.invoke()
+        return t.cast(np.ndarray, self._interpreter.get_tensor(self._output_index))
+
+
+class ExportedMesoNet(InferenceOnlyModel):
+    """MesoNet exported with ``export_meso_net``.
+
+    Model is loaded as frozen graph, Keras model is neither built nor compiled.
+
+    """
+
+    def __init__(
+        self, path: pathlib.Path, predict_function: t.Callable[[np.ndarray], t.Any]
+    ) -> None:
+        """Initialize ExportedMesoNet.
+
+        Args:
+            path: Path to exported model.
+            predict_function: Function mapping batch of faces to confidences.
+
+        """
+        super().__init__(path)
+        self._predict_function = predict_function
+
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        confidences = self._predict_function(np.ascontiguousarray(faces, dtype=np.float32))
+        return np.array(confidences, dtype=np.float32).ravel()
+
+    @classmethod
+    def load(cls, path: pathlib.Path, num_threads: t.Optional[int] = None) -> ModelInterface:
+        """Load model exported as SavedModel directory or ``.tflite`` file.
+
+        Args:
+            path: Path to exported model.
+            num_threads: Number of threads model is run with. TFLite interpreter uses them
+                only for this model, while for SavedModel setting is global for the process,
+                see ``set_intra_op_threads``.
+
+        Raises:
+            DfdError: If path does not point to exported model.
+
+        Returns:
+            Loaded model.
+
+        """
+        if path.suffix == ".tflite":
+            return cls(path, _TFLiteRunner(path, num_threads))
+        if not tf.saved_model.contains_saved_model(str(path)):
+            raise DfdError(f"{path} is neither SavedModel nor TFLite model.")
+        if num_threads is not None:
+            set_intra_op_threads(num_threads)
+        saved_model = tf.saved_model.load(str(path))
+        return cls(path, saved_model.predict)
@@ -0,0 +1,108 @@
+"""Base of models loaded from exported artefacts, which support only inference."""
+import abc
+import pathlib
+import shutil
+import typing as t
+
+import cv2 as cv
+import numpy as np
+
+from dfd.datasets.dataset_index import IMAGE_SUFFIXES, DatasetIndex
+from dfd.datasets.packed import DEFAULT_CLASS_NAMES, PackedDataset
+from dfd.exceptions import DfdError
+
+from ..interface import ModelInterface, Prediction, TrainingSettings
+from ..metrics import BINARY_METRICS_NAMES, compute_binary_metrics
+from ..video import to_model_input
+
+
+class InferenceOnlyModel(ModelInterface):
+    """Model loaded from exported artefact, no optimizer or metrics are set up.
+
+    Subclasses implement only ``predict_arrays`` and ``load``, frames are read from disk
+    and scored in batches via ``predict_iter``.
+
+    """
+
+    def __init__(self, path: pathlib.Path, batch_size: int = 32) -> None:
+        """Initialize InferenceOnlyModel.
+
+        Args:
+            path: Path to exported artefact model was loaded from.
+            batch_size: Number of faces read from disk scored together.
+
+        """
+        self._path = path
+        self._batch_size = batch_size
+
+    @abc.abstractmethod
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        """See ``ModelInterface.predict_arrays``."""
+
+    def train(
+        self,
+        train_ds_path: pathlib.Path,
+        validation_ds_path: pathlib.Path,
+        settings: TrainingSettings = TrainingSettings(),
+    ) -> None:
+        raise DfdError("Exported model supports only inference, train original model instead.")
+
+    def test(self, test_ds_path: pathlib.Path) -> t.Dict[str, float]:
+        if PackedDataset.is_packed(test_ds_path):
+            packed_dataset = PackedDataset.open(test_ds_path)
+            if packed_dataset.labels is None:
+                raise DfdError(f"Packed dataset {test_ds_path} is not labeled.")
+            faces: t.Iterable[np.ndarray] = iter(packed_dataset.images)
+            labels = packed_dataset.labels.tolist()
+        else:
+            dataset_index = DatasetIndex.build(
+                test_ds_path, DEFAULT_CLASS_NAMES, suffixes=IMAGE_SUFFIXES
+            )
+            if dataset_index.labels is None:
+                raise DfdError(
+                    f"Directory {test_ds_path} does not contain reals and fakes directories."
+                )
+            faces = read_faces(dataset_index.file_paths)
+            labels = dataset_index.labels
+        confidences = list(self.predict_iter(faces, self._batch_size))
+        return compute_binary_metrics(labels, confidences)
+
+    def predict(self, sample_path: pathlib.Path) -> t.Dict[pathlib.Path, Prediction]:
+        if PackedDataset.is_packed(sample_path):
+            packed_dataset = PackedDataset.open(sample_path)
+            paths = [pathlib.Path(path) for path in packed_dataset.file_paths]
+            faces: t.Iterable[np.ndarray] = iter(packed_dataset.images)
+        else:
+            paths = DatasetIndex.build(sample_path, suffixes=IMAGE_SUFFIXES).file_paths
+            faces = read_faces(paths)
+        return {
+            path: Prediction.from_confidence(confidence)
+            for path, confidence in zip(paths, self.predict_iter(faces, self._batch_size))
+        }
+
+    def save(self, path: pathlib.Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self._path.is_dir():
+            shutil.copytree(self._path, path)
+        else:
+            shutil.copyfile(self._path, path.with_suffix(self._path.suffix))
+
+    def get_available_metrics_names(self) -> t.List[str]:
+        return list(BINARY_METRICS_NAMES)
+
+
+def read_faces(paths: t.Iterable[pathlib.Path]) -> t.Iterator[np.ndarray]:
+    """Read faces saved as images, e.g. by ``extract-faces`` command.
+
+    Raises:
+        DfdError: If image cannot be read.
+
+    Yields:
+        RGB faces of model input size.
+
+    """
+    for path in paths:
+        image = cv.imread(str(path))
+        if image is None:
+            raise DfdError(f"Cannot read image {path}.")
+        yield to_model_input(image)
@@ -1,57 +1,184 @@
+import math
 import pathlib
 import typing as t
 
+import numpy as np
+import tensorflow as tf
 from tensorflow import keras, metrics
-from tensorflow.keras import callbacks, layers, models, optimizers, preprocessing
+from tensorflow.keras import callbacks, layers, models, optimizers
 
-from ..interface import ModelInterface, Prediction
+from dfd.datasets.dataset_index import IMAGE_SUFFIXES, DatasetIndex
+from dfd.datasets.packed import DEFAULT_CLASS_NAMES, PackedDataset
+from dfd.exceptions import DfdError
+
+from ..interface import CacheMode, ModelInterface, Prediction, TrainingSettings
+from .export import ExportFormat, Quantization, export_meso_net
 
 _IMAGE_SIZE: t.Final = (256, 256)
 _MODEL_INPUT_SHAPE: t.Final = (*_IMAGE_SIZE, 3)
 _MODEL_THRESHOLD: t.Final = (*_IMAGE_SIZE, 3)
+_SHUFFLE_BUFFER_SIZE: t.Final = 1024
 
 
-def _build_meso_net_model() -> keras.Sequential:
+def _build_meso_net_model(mixed_precision: bool = False) -> keras.Sequential:
+    # Mixed precision layers compute in float16 and keep variables in float32,
+    # output is computed in float32 so loss is numerically stable
+    dtype = "mixed_float16" if mixed_precision else None
     model = keras.Sequential()
     model.add(layers.InputLayer(_MODEL_INPUT_SHAPE))
     # First block
-    model.add(layers.Conv2D(8, (3, 3), padding="same", activation="relu"))
-    model.add(layers.BatchNormalization())
-    model.add(layers.MaxPool2D(pool_size=(2, 2), padding="same"))
+    model.add(layers.Conv2D(8, (3, 3), padding="same", activation="relu", dtype=dtype))
+    model.add(layers.BatchNormalization(dtype=dtype))
+    model.add(layers.MaxPool2D(pool_size=(2, 2), padding="same", dtype=dtype))
     # Second block
-    model.add(layers.Conv2D(8, (5, 5), padding="same", activation="relu"))
-    model.add(layers.BatchNormalization())
-    model.add(layers.MaxPool2D(pool_size=(2, 2), padding="same"))
+    model.add(layers.Conv2D(8, (5, 5), padding="same", activation="relu", dtype=dtype))
+    model.add(layers.BatchNormalization(dtype=dtype))
+    model.add(layers.MaxPool2D(pool_size=(2, 2), padding="same", dtype=dtype))
     # Third block
-    model.add(layers.Conv2D(16, (5, 5), padding="same", activation="relu"))
-    model.add(layers.BatchNormalization())
-    model.add(layers.MaxPool2D(pool_size=(2, 2), padding="same"))
+    model.add(layers.Conv2D(16, (5, 5), padding="same", activation="relu", dtype=dtype))
+    model.add(layers.BatchNormalization(dtype=dtype))
+    model.add(layers.MaxPool2D(pool_size=(2, 2), padding="same", dtype=dtype))
     # Fourth layer
-    model.add(layers.Conv2D(16, (5, 5), padding="same", activation="relu"))
-    model.add(layers.BatchNormalization())
-    model.add(layers.MaxPool2D(pool_size=(4, 4), padding="same"))
+    model.add(layers.Conv2D(16, (5, 5), padding="same", activation="relu", dtype=dtype))
+    model.add(layers.BatchNormalization(dtype=dtype))
+    model.add(layers.MaxPool2D(pool_size=(4, 4), padding="same", dtype=dtype))
     # Top
-    model.add(layers.Flatten())
-    model.add(layers.Dropout(0.5))
-    model.add(layers.Dense(16))
-    model.add(layers.LeakyReLU(alpha=0.1))
-    model.add(layers.Dropout(0.5))
-    model.add(layers.Dense(1, activation="sigmoid"))
+    model.add(layers.Flatten(dtype=dtype))
+    model.add(layers.Dropout(0.5, dtype=dtype))
+    model.add(layers.Dense(16, dtype=dtype))
+    model.add(layers.LeakyReLU(alpha=0.1, dtype=dtype))
+    model.add(layers.Dropout(0.5, dtype=dtype))
+    model.add(layers.Dense(1, activation="sigmoid", dtype="float32"))
 
     return model
 
 
+def set_intra_op_threads(num_threads: int) -> None:
+    """Set number of threads TensorFlow runs single operation with, it is global for process.
+
+    Raises:
+        DfdError: If TensorFlow already runs operations with different number of threads.
+
+    """
+    if tf.config.threading.get_intra_op_parallelism_threads() == num_threads:
+        return
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+    except RuntimeError as error:
+        # Number of threads can be set only before TensorFlow runs first operation
+        raise DfdError(f"TensorFlow already runs, threads cannot be set: {error}") from error
+
+
+def _decode_image(file_path: tf.Tensor) -> tf.Tensor:
+    image = tf.io.decode_image(tf.io.read_file(file_path), channels=3, expand_animations=False)
+    # Images are kept as uint8 until batched, so cached images take four times less space
+    return tf.saturate_cast(tf.round(tf.image.resize(image, _IMAGE_SIZE)), tf.uint8)
+
+
+def _load_images_dataset(
+    image_paths: t.Sequence[pathlib.Path],
+    labels: t.Optional[t.Sequence[int]],
+    batch_size: int,
+    shuffle: bool = False,
+    cache: CacheMode = CacheMode.NONE,
+    cache_path: t.Optional[pathlib.Path] = None,
+) -> tf.data.Dataset:
+    """Load images from files, images are decoded in parallel and batches are prefetched.
+
+    Decoded images can be cached, so files are read and decoded only during first epoch.
+    Cache is read in the same order each epoch, so to mix classes files are shuffled once
+    before caching and cached images are shuffled again within bounded buffer.
+
+    Raises:
+        DfdError: If images are cached on disk and cache path is not given.
+
+    """
+    file_paths = [str(image_path) for image_path in image_paths]
+    if labels is None:
+        dataset = tf.data.Dataset.from_tensor_slices(file_paths)
+        dataset = dataset.map(_decode_image, num_parallel_calls=tf.data.AUTOTUNE)
+    else:
+        dataset = tf.data.Dataset.from_tensor_slices(
+            (file_paths, np.asarray(labels, dtype=np.float32).reshape(-1, 1))
+        )
+        if shuffle:
+            dataset = dataset.shuffle(
+                len(file_paths), reshuffle_each_iteration=cache == CacheMode.NONE
+            )
+        dataset = dataset.map(
+            lambda file_path, label: (_decode_image(file_path), label),
+            num_parallel_calls=tf.data.AUTOTUNE,
+            # Order does not matter since images are shuffled anyway
+            deterministic=not shuffle,
+        )
+    if cache == CacheMode.MEMORY:
+        dataset = dataset.cache()
+    elif cache == CacheMode.DISK:
+        if cache_path is None:
+            raise DfdError("Path to cache is required to cache images on disk.")
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        dataset = dataset.cache(str(cache_path))
+    if shuffle and cache != CacheMode.NONE:
+        dataset = dataset.shuffle(min(len(file_paths), _SHUFFLE_BUFFER_SIZE))
+    dataset = dataset.batch(batch_size)
+    if labels is None:
+        dataset = dataset.map(lambda images: tf.cast(images, tf.float32))
+    else:
+        dataset = dataset.map(lambda images, labels: (tf.cast(images, tf.float32), labels))
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def _load_packed_dataset(
+    packed_dataset: PackedDataset, batch_size: int, shuffle: bool = False
+) -> tf.data.Dataset:
+    """Load packed dataset, each batch is read from disk as single contiguous slice.
+
+    Images are shuffled while packing, so only order of batches is shuffled.
+
+    """
+    no_batches = math.ceil(len(packed_dataset.images) / batch_size)
+    _, height, width, channels = packed_dataset.images.shape
+
+    def _read_images(batch_index: np.int64) -> np.ndarray:
+        lower_bound = int(batch_index) * batch_size
+        return np.asarray(packed_dataset.images[lower_bound : lower_bound + batch_size])
+
+    def _read_labels(batch_index: np.int64) -> np.ndarray:
+        lower_bound = int(batch_index) * batch_size
+        labels = packed_dataset.labels[lower_bound : lower_bound + batch_size]
+        return np.asarray(labels, dtype=np.float32).reshape(-1, 1)
+
+    def _load_batch(batch_index: tf.Tensor):
+        images = tf.numpy_function(_read_images, [batch_index], tf.uint8)
+        images.set_shape([None, height, width, channels])
+        images = tf.cast(images, tf.float32)
+        if packed_dataset.labels is None:
+            return images
+        labels = tf.numpy_function(_read_labels, [batch_index], tf.float32)
+        labels.set_shape([None, 1])
+        return images, labels
+
+    dataset = tf.data.Dataset.range(no_batches)
+    if shuffle:
+        dataset = dataset.shuffle(no_batches, reshuffle_each_iteration=True)
+    return dataset.map(_load_batch, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+
+
 class MesoNet(ModelInterface):
     """Define Meso-4 model.
 
     Meso-4 is a relatively shallow DN introduced by Afchar et al..
     ref: "MesoNet: a Compact Facial Video Forgery Detection Network".
 
+    Faces scored in memory are converted in input buffer reused between calls, so single
+    instance must not score faces in many threads at once, see ``DynamicBatcher``.
+
     """
 
     def __init__(self, model: t.Optional[keras.Sequential] = None) -> None:
         self._model: keras.Sequential = model or _build_meso_net_model()
         self._batch_size = 32
+        self._input_buffer: t.Optional[np.ndarray] = None
         self._metrics = [
             metrics.BinaryAccuracy(),
             metrics.AUC(),
@@ -69,31 +196,25 @@ class MesoNet(ModelInterface):
                 restore_best_weights=True,
             ),
         ]
-        optimizer = optimizers.Adam(
-            learning_rate=1e-3,
-            epsilon=1e-08,
-        )
-        self._model.compile(optimizer=optimizer, loss="binary_crossentropy", metrics=self._metrics)
+        self._compile()
 
-    def train(self, train_ds_path: pathlib.Path, validation_ds_path: pathlib.Path) -> None:
+    def train(
+        self,
+        train_ds_path: pathlib.Path,
+        validation_ds_path: pathlib.Path,
+        settings: TrainingSettings = TrainingSettings(),
+    ) -> None:
+        if settings.mixed_precision:
+            # Layers of already built model cannot change their policy, so model is rebuilt
+            mixed_precision_model = _build_meso_net_model(mixed_precision=True)
+            mixed_precision_model.set_weights(self._model.get_weights())
+            self._model = mixed_precision_model
+        self._compile(mixed_precision=settings.mixed_precision, jit_compile=settings.jit_compile)
         # Load datasets
-        train_ds = preprocessing.image_dataset_from_directory(
-            train_ds_path,
-            batch_size=self._batch_size,
-            image_size=_IMAGE_SIZE,
-            label_mode="binary",
-            class_names=["reals", "fakes"],
+        train_ds, no_reals, no_fakes = self._load_labeled_dataset(train_ds_path, settings)
+        validation_ds, _, _ = self._load_labeled_dataset(
+            validation_ds_path, settings, validation=True
         )
-        validation_ds = preprocessing.image_dataset_from_directory(
-            validation_ds_path,
-            batch_size=self._batch_size,
-            image_size=_IMAGE_SIZE,
-            label_mode="binary",
-            class_names=["reals", "fakes"],
-        )
-        # Calculate reals to fakes ratio
-        no_reals = sum(1 for path in train_ds_path.joinpath("reals").rglob("*") if path.is_file())
-        no_fakes = sum(1 for path in train_ds_path.joinpath("fakes").rglob("*") if path.is_file())
         reals_to_fake_ratio = no_reals / no_fakes
         self._model.fit(
             train_ds,
@@ -103,30 +224,102 @@ class MesoNet(ModelInterface):
                 0: 1,
                 1: reals_to_fake_ratio,
             },
-            epochs=10,
+            epochs=settings.epochs,
             callbacks=self._callbacks,
         )
 
     def test(self, test_ds_path: pathlib.Path) -> t.Dict[str, float]:
-        test_ds = preprocessing.image_dataset_from_directory(
-            test_ds_path,
-            batch_size=self._batch_size,
-            image_size=_IMAGE_SIZE,
-            label_mode="binary",
-            class_names=["reals", "fakes"],
+        test_ds, _, _ = self._load_labeled_dataset(
+            test_ds_path, TrainingSettings(batch_size=self._batch_size), validation=True
         )
         return self._model.evaluate(test_ds, return_dict=True)
 
     def predict(self, sample_path: pathlib.Path) -> t.Dict[pathlib.Path, Prediction]:
-        sample_data = preprocessing.image_dataset_from_directory(
-            sample_path,
-            batch_size=self._batch_size,
-            image_size=_IMAGE_SIZE,
-            labels=None,
-        )
+        if PackedDataset.is_packed(sample_path):
+            packed_dataset = PackedDataset.open(sample_path)
+            confidences = self._model.predict(
+                _load_packed_dataset(packed_dataset, batch_size=self._batch_size)
+            )
+            return {
+                pathlib.Path(path): Prediction.from_confidence(confidence)
+                for path, confidence in zip(packed_dataset.file_paths, confidences)
+            }
+        image_paths = DatasetIndex.build(sample_path, suffixes=IMAGE_SUFFIXES).file_paths
+        sample_data = _load_images_dataset(image_paths, None, batch_size=self._batch_size)
         confidences = self._model.predict(sample_data)
-        predictions = [Prediction.from_confidence(confidence).name for confidence in confidences]
-        return {path: predictions[idx] for idx, path in enumerate(sample_data.file_paths)}
+        predictions = [Prediction.from_confidence(confidence) for confidence in confidences]
+        return {path: predictions[idx] for idx, path in enumerate(image_paths)}
+
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        if faces.dtype != np.float32:
+            # Faces, e.g. decoded as uint8, are converted in buffer kept between calls
+            input_buffer = self._get_input_buffer(faces.shape)
+            np.copyto(input_buffer, faces, casting="unsafe")
+            faces = input_buffer
+        confidences = self._model.predict_on_batch(faces)
+        return np.asarray(confidences).ravel()
+
+    def _get_input_buffer(self, shape: t.Tuple[int, ...]) -> np.ndarray:
+        """Get float32 buffer of given shape, buffer is allocated again only if it is too small."""
+        if (
+            self._input_buffer is None
+            or self._input_buffer.shape[1:] != shape[1:]
+            or len(self._input_buffer) < shape[0]
+        ):
+            self._input_buffer = np.empty(shape, dtype=np.float32)
+        return self._input_buffer[: shape[0]]
+
+    def _compile(self, mixed_precision: bool = False, jit_compile: bool = False) -> None:
+        optimizer = optimizers.Adam(
+            learning_rate=1e-3,
+            epsilon=1e-08,
+        )
+        if mixed_precision:
+            # Loss is scaled so small float16 gradients do not underflow
+            optimizer = keras.mixed_precision.LossScaleOptimizer(optimizer)
+        # Argument is passed only if set, so TensorFlow versions without it are supported
+        compile_kwargs = {"jit_compile": True} if jit_compile else {}
+        self._model.compile(
+            optimizer=optimizer,
+            loss="binary_crossentropy",
+            metrics=self._metrics,
+            **compile_kwargs,
+        )
+
+    def _load_labeled_dataset(
+        self, path: pathlib.Path, settings: TrainingSettings, validation: bool = False
+    ) -> t.Tuple[tf.data.Dataset, int, int]:
+        """Load labeled dataset, training dataset is shuffled.
+
+        Returns:
+            Dataset, number of reals and number of fakes.
+
+        """
+        if PackedDataset.is_packed(path):
+            # Packed images are already decoded and read from memory-mapped array,
+            # so they are not cached
+            packed_dataset = PackedDataset.open(path)
+            no_fakes = int(np.count_nonzero(packed_dataset.labels))
+            dataset = _load_packed_dataset(
+                packed_dataset, batch_size=settings.batch_size, shuffle=not validation
+            )
+            return dataset, len(packed_dataset.images) - no_fakes, no_fakes
+        dataset_index = DatasetIndex.build(path, DEFAULT_CLASS_NAMES, suffixes=IMAGE_SUFFIXES)
+        labels = dataset_index.labels
+        if labels is None:
+            raise DfdError(f"Directory {path} does not contain reals and fakes directories.")
+        cache_path = None
+        if settings.cache_path is not None:
+            cache_path = settings.cache_path.joinpath("validation" if validation else "train")
+        dataset = _load_images_dataset(
+            dataset_index.file_paths,
+            labels,
+            batch_size=settings.batch_size,
+            shuffle=not validation,
+            cache=settings.cache,
+            cache_path=cache_path,
+        )
+        return dataset, dataset_index.count(0), dataset_index.count(1)
 
     def save(self, path: pathlib.Path):
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -135,7 +328,37 @@ class MesoNet(ModelInterface):
     def get_available_metrics_names(self) -> t.List[str]:
         return [metric.name for metric in self._metrics]
 
+    def export(
+        self,
+        output_path: pathlib.Path,
+        export_format: ExportFormat = ExportFormat.SAVED_MODEL,
+        quantization: Quantization = Quantization.NONE,
+        calibration_faces: t.Optional[t.Callable[[], t.Iterable[np.ndarray]]] = None,
+    ) -> pathlib.Path:
+        """Export model as inference-only graph, see ``export_meso_net``.
+
+        Returns:
+            Path to exported model, it can be loaded by ``ExportedMesoNet``.
+
+        """
+        return export_meso_net(
+            self._model, output_path, export_format, quantization, calibration_faces
+        )
+
     @classmethod
-    def load(cls, path: pathlib.Path) -> ModelInterface:
+    def load(cls, path: pathlib.Path, num_threads: t.Optional[int] = None) -> ModelInterface:
+        """Load model saved in Keras format.
+
+        Args:
+            path: Path to saved model.
+            num_threads: Number of threads single operation is run with, setting is global
+                for the process, see ``set_intra_op_threads``.
+
+        Returns:
+            Loaded model.
+
+        """
+        if num_threads is not None:
+            set_intra_op_threads(num_threads)
         model = models.load_model(path, compile=False)
         return cls(model=model)
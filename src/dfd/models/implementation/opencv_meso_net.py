@@ -0,0 +1,101 @@
+"""Run exported MesoNet with OpenCV DNN, TensorFlow is not imported."""
+import pathlib
+import typing as t
+
+import cv2 as cv
+import numpy as np
+import structlog
+
+from dfd.exceptions import DfdError
+
+from ..interface import ModelInterface
+from .inference_only import InferenceOnlyModel
+
+LOGGER = structlog.get_logger()
+
+
+class OpenCvMesoNet(InferenceOnlyModel):
+    """MesoNet exported as frozen graph or TFLite model and run on CPU by OpenCV DNN.
+
+    OpenCV is already used to read frames, so model is run without loading TensorFlow,
+    which takes more memory and time to start than the inference itself.
+
+    Number of threads OpenCV runs layers with is global for the process, so setting it
+    while loading model affects all models run by OpenCV and e.g. frame processing.
+
+    Faces are converted to channels first layout in input buffer reused between calls,
+    so single instance must not score faces in many threads at once, see ``DynamicBatcher``.
+
+    """
+
+    def __init__(self, path: pathlib.Path, net: cv.dnn.Net) -> None:
+        """Initialize OpenCvMesoNet.
+
+        Args:
+            path: Path to exported model.
+            net: Network read from exported model.
+
+        """
+        super().__init__(path)
+        self._net = net
+        self._input_buffer: t.Optional[np.ndarray] = None
+
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        input_buffer = self._get_input_buffer((len(faces), faces.shape[3], *faces.shape[1:3]))
+        np.copyto(input_buffer, faces.transpose(0, 3, 1, 2), casting="unsafe")
+        self._net.setInput(input_buffer)
+        return np.array(self._net.forward(), dtype=np.float32).ravel()
+
+    def _get_input_buffer(self, shape: t.Tuple[int, ...]) -> np.ndarray:
+        """Get float32 buffer of given shape, buffer is allocated again only if it is too small."""
+        if (
+            self._input_buffer is None
+            or self._input_buffer.shape[1:] != shape[1:]
+            or len(self._input_buffer) < shape[0]
+        ):
+            self._input_buffer = np.empty(shape, dtype=np.float32)
+        return self._input_buffer[: shape[0]]
+
+    @classmethod
+    def load(cls, path: pathlib.Path, num_threads: t.Optional[int] = None) -> ModelInterface:
+        """Load model exported as frozen graph (``.pb``) or TFLite model (``.tflite``).
+
+        Args:
+            path: Path to exported model.
+            num_threads: Number of threads OpenCV runs layers with, by default it is left
+                unchanged. It is set by ``cv.setNumThreads``, which is global for the process.
+
+        Raises:
+            DfdError: If model cannot be read by installed OpenCV.
+
+        Returns:
+            Loaded model.
+
+        """
+        if path.suffix not in {".pb", ".tflite"} or (
+            path.suffix == ".tflite" and not hasattr(cv.dnn, "readNetFromTFLite")
+        ):
+            raise DfdError(f"{path} cannot be read by OpenCV {cv.__version__}.")
+        if num_threads is not None:
+            cv.setNumThreads(num_threads)
+        try:
+            net = cls._read_net(path)
+        except cv.error as error:
+            raise DfdError(f"{path} cannot be read by OpenCV: {error}") from error
+        net.setPreferableBackend(cv.dnn.DNN_BACKEND_OPENCV)
+        net.setPreferableTarget(cv.dnn.DNN_TARGET_CPU)
+        LOGGER.info("loaded_opencv_model", path=str(path), num_threads=cv.getNumThreads())
+        return cls(path, net)
+
+    @staticmethod
+    def _read_net(path: pathlib.Path) -> cv.dnn.Net:
+        """Read network with reader matching model format."""
+        # Since OpenCV 5 new engine is used by default, it is slower and takes more memory
+        # for this model, older versions have only the classic engine
+        if not hasattr(cv.dnn, "ENGINE_CLASSIC"):
+            if path.suffix == ".pb":
+                return cv.dnn.readNetFromTensorflow(str(path))
+            return cv.dnn.readNetFromTFLite(str(path))
+        if path.suffix == ".pb":
+            return cv.dnn.readNetFromTensorflow(str(path), engine=cv.dnn.ENGINE_CLASSIC)
+        return cv.dnn.readNetFromTFLite(str(path), engine=cv.dnn.ENGINE_CLASSIC)
@@ -5,6 +5,10 @@ import enum
 import pathlib
 import typing as t
 
+import numpy as np
+
+from dfd.exceptions import DfdError
+
 
 class Prediction(enum.Enum):
     """Represents model prediction."""
@@ -31,6 +35,35 @@ class Prediction(enum.Enum):
         return cls.UNCERTAIN
 
 
+class CacheMode(str, enum.Enum):
+    """Where decoded training images are cached after first epoch."""
+
+    NONE = "none"
+    MEMORY = "memory"
+    DISK = "disk"
+
+
+class TrainingSettings(t.NamedTuple):
+    """Settings of training and its input pipeline.
+
+    Args:
+        batch_size: Number of images in single batch.
+        epochs: Maximal number of epochs, training can be stopped early.
+        cache: Where decoded images are cached, so they are decoded only once.
+        cache_path: Directory used to cache images on disk, required if cache is on disk.
+        mixed_precision: Compute in float16 while keeping variables in float32.
+        jit_compile: Compile training step with XLA.
+
+    """
+
+    batch_size: int = 32
+    epochs: int = 10
+    cache: CacheMode = CacheMode.NONE
+    cache_path: t.Optional[pathlib.Path] = None
+    mixed_precision: bool = False
+    jit_compile: bool = False
+
+
 class ModelInterface(abc.ABC):
     """Height level wrapper around actual models used underneath.
 
@@ -41,7 +74,12 @@ class ModelInterface(abc.ABC):
     """
 
     @abc.abstractmethod
-    def train(self, train_ds_path: pathlib.Path, validation_ds_path: pathlib.Path) -> None:
+    def train(
+        self,
+        train_ds_path: pathlib.Path,
+        validation_ds_path: pathlib.Path,
+        settings: TrainingSettings = TrainingSettings(),
+    ) -> None:
         """Train model using given train and validation data."""
 
     @abc.abstractmethod
@@ -57,6 +95,61 @@ class ModelInterface(abc.ABC):
     def predict(self, sample_path: pathlib.Path) -> t.Dict[pathlib.Path, Prediction]:
         """Make predictions over provided sample of frames."""
 
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        """Predict confidence that faces already loaded into memory are fake.
+
+        Models that do not override it, e.g. models of plugins written before in-memory
+        prediction was added, support only prediction of files via ``predict``.
+
+        Args:
+            faces: Batch of RGB faces of model input size, pixel values range from 0 to 255.
+
+        Raises:
+            DfdError: If model does not support in-memory prediction.
+
+        Returns:
+            Confidence for each face, from 0 (real) to 1 (fake). Returned array does not
+            share memory with faces, so caller can reuse them.
+
+        """
+        raise DfdError(f"{type(self).__name__} does not support in-memory prediction.")
+
+    def predict_iter(
+        self, faces: t.Iterable[np.ndarray], batch_size: int = 32
+    ) -> t.Iterator[float]:
+        """Predict confidence that faces are fake, faces are scored in batches as they come.
+
+        Faces are copied into single input buffer reused by all batches, so neither memory
+        usage nor number of allocations depends on number of faces.
+
+        Args:
+            faces: RGB faces of model input size, pixel values range from 0 to 255.
+            batch_size: Number of faces scored together.
+
+        Raises:
+            DfdError: If batch size is not positive or faces differ in shape.
+
+        Yields:
+            Confidence for each face, in order of faces.
+
+        """
+        if batch_size < 1:
+            raise DfdError(f"Batch size must be positive, got {batch_size}.")
+        input_buffer: t.Optional[np.ndarray] = None
+        no_buffered_faces = 0
+        for face in faces:
+            if input_buffer is None:
+                input_buffer = np.empty((batch_size, *face.shape), dtype=np.float32)
+            elif face.shape != input_buffer.shape[1:]:
+                raise DfdError(f"Face of shape {face.shape} differs from previous faces.")
+            input_buffer[no_buffered_faces] = face
+            no_buffered_faces += 1
+            if no_buffered_faces == batch_size:
+                yield from self.predict_arrays(input_buffer).tolist()
+                no_buffered_faces = 0
+        if input_buffer is not None and no_buffered_faces:
+            yield from self.predict_arrays(input_buffer[:no_buffered_faces]).tolist()
+
     @abc.abstractmethod
     def save(self, path: pathlib.Path):
         """Save model under given path."""
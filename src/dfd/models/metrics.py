@@ -0,0 +1,72 @@
+"""Metrics of binary classification computed without ML framework."""
+import typing as t
+
+import numpy as np
+
+# Names match metrics reported by Keras, so results of different models can be compared
+BINARY_METRICS_NAMES: t.Final = [
+    "loss",
+    "binary_accuracy",
+    "auc",
+    "precision",
+    "recall",
+    "true_positives",
+    "true_negatives",
+    "false_positives",
+    "false_negatives",
+]
+
+_EPSILON = 1e-7
+
+
+def compute_binary_metrics(
+    labels: t.Sequence[int], confidences: t.Sequence[float], threshold: float = 0.5
+) -> t.Dict[str, float]:
+    """Compute metrics of binary classification, fakes are positives.
+
+    Args:
+        labels: True label of each sample, 1 for fake.
+        confidences: Confidence that sample is fake.
+        threshold: Min confidence of sample classified as fake.
+
+    Returns:
+        Metrics named as in ``BINARY_METRICS_NAMES``.
+
+    """
+    labels_array = np.asarray(labels, dtype=bool)
+    confidences_array = np.asarray(confidences, dtype=np.float64)
+    predictions = confidences_array >= threshold
+    true_positives = int(np.count_nonzero(predictions & labels_array))
+    true_negatives = int(np.count_nonzero(~predictions & ~labels_array))
+    false_positives = int(np.count_nonzero(predictions & ~labels_array))
+    false_negatives = int(np.count_nonzero(~predictions & labels_array))
+    clipped_confidences = np.clip(confidences_array, _EPSILON, 1 - _EPSILON)
+    losses = -np.where(labels_array, np.log(clipped_confidences), np.log(1 - clipped_confidences))
+    return {
+        "loss": float(np.mean(losses)) if len(losses) else 0.0,
+        "binary_accuracy": (true_positives + true_negatives) / max(len(labels_array), 1),
+        "auc": _compute_auc(labels_array, confidences_array),
+        "precision": true_positives / max(true_positives + false_positives, 1),
+        "recall": true_positives / max(true_positives + false_negatives, 1),
+        "true_positives": float(true_positives),
+        "true_negatives": float(true_negatives),
+        "false_positives": float(false_positives),
+        "false_negatives": float(false_negatives),
+    }
+
+
+def _compute_auc(labels: np.ndarray, confidences: np.ndarray) -> float:
+    """Compute area under ROC curve as probability that fake is ranked above real."""
+    no_fakes = int(np.count_nonzero(labels))
+    no_reals = len(labels) - no_fakes
+    if not no_fakes or not no_reals:
+        return 0.0
+    # Ties get mean rank, ranks are counted from one
+    sorted_indexes = np.argsort(confidences, kind="mergesort")
+    ranks = np.empty(len(confidences), dtype=np.float64)
+    ranks[sorted_indexes] = np.arange(1, len(confidences) + 1)
+    _, inverse, counts = np.unique(confidences, return_inverse=True, return_counts=True)
+    rank_sums = np.bincount(inverse, weights=ranks)
+    ranks = (rank_sums / counts)[inverse]
+    fakes_rank_sum = float(np.sum(ranks[labels]))
+    return (fakes_rank_sum - no_fakes * (no_fakes + 1) / 2) / (no_fakes * no_reals)
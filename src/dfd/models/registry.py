@@ -1,46 +1,89 @@
 from __future__ import annotations
 
+import inspect
+import pathlib
 import typing as t
 from types import MappingProxyType
 
-from . import implementation
-
 from ..exceptions import DfdError
+from ..plugins import ClassReference, LazyClassRegistry, add_entry_point_references
 from .interface import ModelInterface
 
-NameToModelClassMap = MappingProxyType[str, t.Type[ModelInterface]]
+# Map from name to model class or reference to it, e.g. "package.module:Class"
+NameToModelClassMap = t.Mapping[str, ClassReference]
+
+ENTRY_POINTS_GROUP = "dfd.models"
+
+# Models are referenced by import path, so e.g. TensorFlow is imported only when model is used
+DEFAULT_MODELS: NameToModelClassMap = MappingProxyType(
+    {
+        "meso_net": "dfd.models.implementation.meso_net:MesoNet",
+        "meso_net_exported": "dfd.models.implementation.exported_meso_net:ExportedMesoNet",
+        "meso_net_opencv": "dfd.models.implementation.opencv_meso_net:OpenCvMesoNet",
+    }
+)
 
 
 class ModelRegistry:
-    """Register available models."""
+    """Register available models, model is imported when first requested."""
 
     def __init__(self, name_to_model_class_map: NameToModelClassMap) -> None:
-        self._name_to_model_class_map = name_to_model_class_map
+        self._registry = LazyClassRegistry(ModelInterface, name_to_model_class_map)
 
     @classmethod
     def default(cls) -> ModelRegistry:
         """Create `ModelRegistry` with default models.
 
+        Models registered by installed packages in `dfd.models` entry points group
+        are included as well.
+
         Returns:
             `ModelRegistry` instance with default models registered.
 
         """
+        return cls(add_entry_point_references(DEFAULT_MODELS, ENTRY_POINTS_GROUP))
 
-        return cls(
-            MappingProxyType({"meso_net": implementation.MesoNet}),
-        )
+    def names(self) -> t.List[str]:
+        """Get names of registered models, sorted alphabetically."""
+        return self._registry.names()
 
     def get_model_class(self, model_name: str) -> t.Type[ModelInterface]:
         """Get registered model via name.
 
         Raises:
-            DfdError: when targeted modification is not registered
+            DfdError: when targeted model is not registered or cannot be imported
 
         Returns:
             Class of registered model.
 
         """
-        try:
-            return self._name_to_model_class_map[model_name]
-        except KeyError:
+        model_class = self._registry.get(model_name)
+        if model_class is None:
             raise DfdError(f"Model {model_name} is not registered.")
+        return t.cast(t.Type[ModelInterface], model_class)
+
+    def load_model(
+        self, model_name: str, model_path: pathlib.Path, num_threads: t.Optional[int] = None
+    ) -> ModelInterface:
+        """Load registered model.
+
+        Args:
+            model_name: Name of registered model.
+            model_path: Path model is loaded from.
+            num_threads: Number of threads model runs inference with, by default it is
+                chosen by model. Built-in models set it for the whole process.
+
+        Raises:
+            DfdError: when model is not registered or number of threads cannot be set.
+
+        Returns:
+            Loaded model.
+
+        """
+        model_class = self.get_model_class(model_name)
+        if num_threads is None:
+            return model_class.load(model_path)
+        # Number of threads is optional argument of load, models of plugins may not accept it
+        if "num_threads" not in inspect.signature(model_class.load).parameters:
+            raise DfdError(f"Number of threads of model {model_name} cannot be set.")
+        return model_class.load(model_path, num_threads=num_threads)  # type: ignore[call-arg]
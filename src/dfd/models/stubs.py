@@ -3,13 +3,18 @@
 import pathlib
 import typing as t
 
+import numpy as np
+
 from dfd.models import ModelInterface
-from dfd.models.interface import Prediction
+from dfd.models.interface import Prediction, TrainingSettings
 
 
 class ModelStub(ModelInterface):
     def train(
-        self, train_ds_path: pathlib.Path, validation_ds_path: pathlib.Path
+        self,
+        train_ds_path: pathlib.Path,
+        validation_ds_path: pathlib.Path,
+        settings: TrainingSettings = TrainingSettings(),
     ) -> t.Dict[str, float]:
         return {"metric": 0}
 
@@ -23,6 +28,9 @@ class ModelStub(ModelInterface):
             pathlib.Path("uncertain"): Prediction.UNCERTAIN,
         }
 
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        return np.full(len(faces), 0.5, dtype=np.float32)
+
     def save(self, path: pathlib.Path):
         return
 
@@ -0,0 +1,274 @@
+"""Predict whether whole video is DeepFake."""
+import enum
+import math
+import pathlib
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple, cast
+
+import cv2 as cv
+import numpy as np
+import structlog
+
+from dfd.consts import MODEL_INPUT_SIZE
+from dfd.datasets.converters import generate_video_frames, get_video_fps
+from dfd.datasets.face_extractor import FaceExtractor
+from dfd.exceptions import DfdError
+
+from .interface import ModelInterface, Prediction
+
+LOGGER = structlog.get_logger()
+
+
+class Aggregation(str, enum.Enum):
+    """Method used to aggregate confidences of single frames into score of whole video.
+
+    MEAN and TRIMMED_MEAN average confidences, the latter ignores given share of lowest
+    and highest confidences, so few frames with badly cropped faces do not sway the score.
+    VOTE scores video with share of frames classified as fake.
+
+    """
+
+    MEAN = "mean"
+    TRIMMED_MEAN = "trimmed-mean"
+    VOTE = "vote"
+
+
+class VideoPredictionSettings(NamedTuple):
+    """Settings of video prediction.
+
+    Args:
+        frame_stride: Only every n-th frame is scored.
+        frame_interval: Seconds of video between scored frames, overrides frame stride
+            if frame rate of video is known.
+        max_frames: Max number of sampled frames, by default whole video is sampled.
+        time_budget: Max number of seconds spent on single video, checked after each batch.
+        batch_size: Number of frames on which faces are found and scored together.
+        aggregation: Method used to aggregate confidences of frames.
+        trim_share: Share of lowest and highest confidences ignored by trimmed mean.
+        threshold: Threshold used to translate score of video into prediction.
+        min_frames: Min number of scored frames before prediction can be stopped early.
+        early_stop_z: Prediction is stopped once score is this many standard errors away
+            from threshold, None disables early stopping.
+
+    """
+
+    frame_stride: int = 1
+    frame_interval: Optional[float] = None
+    max_frames: Optional[int] = None
+    time_budget: Optional[float] = None
+    batch_size: int = 32
+    aggregation: Aggregation = Aggregation.TRIMMED_MEAN
+    trim_share: float = 0.1
+    threshold: float = 0.5
+    min_frames: int = 16
+    early_stop_z: Optional[float] = 3.0
+
+
+class VideoVerdict(NamedTuple):
+    """Prediction made for whole video.
+
+    Args:
+        prediction: Prediction for video, UNCERTAIN if no face was found.
+        score: Aggregated confidence that video is fake, from 0 to 1.
+        no_sampled_frames: Number of frames decoded and searched for faces.
+        no_scored_frames: Number of frames on which face was found and scored.
+        stopped_early: Whether prediction was confident before whole video was sampled.
+
+    """
+
+    prediction: Prediction
+    score: float
+    no_sampled_frames: int
+    no_scored_frames: int
+    stopped_early: bool
+
+
+def aggregate_confidences(
+    confidences: Sequence[float],
+    aggregation: Aggregation,
+    trim_share: float = 0.1,
+    threshold: float = 0.5,
+) -> Tuple[float, float]:
+    """Aggregate confidences of frames into score of video.
+
+    Args:
+        confidences: Confidence that frame is fake for each scored frame.
+        aggregation: Method used to aggregate confidences.
+        trim_share: Share of lowest and highest confidences ignored by trimmed mean.
+        threshold: Min confidence of frame classified as fake by vote.
+
+    Raises:
+        DfdError: If no confidences are given.
+
+    Returns:
+        Score of video and its standard error, infinite if it cannot be estimated.
+
+    """
+    if not confidences:
+        raise DfdError("At least one confidence is required to score video.")
+    sorted_confidences = np.sort(np.asarray(confidences, dtype=np.float64))
+    if aggregation == Aggregation.VOTE:
+        share_of_fakes = float(np.mean(sorted_confidences >= threshold))
+        standard_error = math.sqrt(share_of_fakes * (1 - share_of_fakes) / len(sorted_confidences))
+        return share_of_fakes, standard_error
+    if aggregation == Aggregation.TRIMMED_MEAN:
+        no_trimmed = int(len(sorted_confidences) * trim_share)
+        sorted_confidences = sorted_confidences[no_trimmed : len(sorted_confidences) - no_trimmed]
+    if len(sorted_confidences) < 2:
+        return float(sorted_confidences[0]), math.inf
+    # Standard error of trimmed mean is approximated by standard error of mean of kept values
+    standard_error = float(np.std(sorted_confidences, ddof=1)) / math.sqrt(len(sorted_confidences))
+    return float(np.mean(sorted_confidences)), standard_error
+
+
+class VideoPredictor:
+    """Predict whether video is DeepFake using model trained on single faces.
+
+    Video is decoded frame by frame, so memory usage does not depend on its length.
+    Sampled frames are gathered into batches, faces are found and cropped on whole batch
+    and scored by model in single call. Confidences of frames are aggregated into score
+    of video after each batch, sampling stops once score is confidently on one side of
+    threshold, so for most videos only their beginning is decoded.
+
+    """
+
+    def __init__(
+        self,
+        model: ModelInterface,
+        face_extractor: FaceExtractor,
+        settings: VideoPredictionSettings = VideoPredictionSettings(),
+    ) -> None:
+        """Initialize VideoPredictor.
+
+        Args:
+            model: Model used to score faces.
+            face_extractor: Face extractor used to crop faces from sampled frames.
+            settings: Settings of video prediction.
+
+        Raises:
+            DfdError: If settings are invalid.
+
+        """
+        if settings.batch_size < 1:
+            raise DfdError(f"Batch size must be positive, got {settings.batch_size}.")
+        if not 0 <= settings.trim_share < 0.5:
+            raise DfdError(f"Trim share must be in [0, 0.5) range, got {settings.trim_share}.")
+        if settings.frame_interval is not None and settings.frame_interval <= 0:
+            raise DfdError(f"Frame interval must be positive, got {settings.frame_interval}.")
+        self._model = model
+        self._face_extractor = face_extractor
+        self._settings = settings
+        self._faces_buffer: Optional[np.ndarray] = None
+
+    def predict(self, video_path: pathlib.Path) -> VideoVerdict:
+        """Predict whether video is DeepFake.
+
+        Args:
+            video_path: Path to video.
+
+        Returns:
+            Prediction for whole video.
+
+        """
+        start_time = time.monotonic()
+        settings = self._settings
+        confidences: List[float] = []
+        frames_batch: List[np.ndarray] = []
+        no_sampled_frames = 0
+        stopped_early = False
+        video_frames = generate_video_frames(
+            str(video_path), self._get_frame_stride(video_path), settings.max_frames
+        )
+        try:
+            for video_frame in video_frames:
+                frames_batch.append(video_frame.frame)
+                if len(frames_batch) < settings.batch_size:
+                    continue
+                confidences.extend(self._score_frames(frames_batch))
+                no_sampled_frames += len(frames_batch)
+                frames_batch = []
+                if self._is_confident(confidences):
+                    stopped_early = True
+                    break
+                if (
+                    settings.time_budget is not None
+                    and time.monotonic() - start_time > settings.time_budget
+                ):
+                    LOGGER.info("video_time_budget_exceeded", video_path=str(video_path))
+                    break
+            else:
+                confidences.extend(self._score_frames(frames_batch))
+                no_sampled_frames += len(frames_batch)
+        finally:
+            # Release video capture if sampling was stopped before end of video
+            video_frames.close()
+        if not confidences:
+            return VideoVerdict(Prediction.UNCERTAIN, 0.5, no_sampled_frames, 0, False)
+        score, _ = aggregate_confidences(
+            confidences, settings.aggregation, settings.trim_share, settings.threshold
+        )
+        return VideoVerdict(
+            prediction=Prediction.from_confidence(score, settings.threshold),
+            score=score,
+            no_sampled_frames=no_sampled_frames,
+            no_scored_frames=len(confidences),
+            stopped_early=stopped_early,
+        )
+
+    def _get_frame_stride(self, video_path: pathlib.Path) -> int:
+        if self._settings.frame_interval is None:
+            return self._settings.frame_stride
+        fps = get_video_fps(str(video_path))
+        if not fps:
+            return self._settings.frame_stride
+        return max(int(round(fps * self._settings.frame_interval)), 1)
+
+    def _score_frames(self, frames_batch: Sequence[np.ndarray]) -> List[float]:
+        """Score faces found on frames, frames without face are skipped."""
+        if not frames_batch:
+            return []
+        face_locations = self._face_extractor.locate_batch(frames_batch)
+        no_faces = 0
+        for frame, face_location in zip(frames_batch, face_locations):
+            if face_location is None:
+                continue
+            # Faces are converted straight into buffer reused by all batches
+            self._get_faces_buffer()[no_faces] = to_model_input(
+                self._face_extractor.crop(frame, face_location)
+            )
+            no_faces += 1
+        if not no_faces:
+            return []
+        confidences = self._model.predict_arrays(self._get_faces_buffer()[:no_faces])
+        return cast(List[float], confidences.tolist())
+
+    def _get_faces_buffer(self) -> np.ndarray:
+        if self._faces_buffer is None:
+            width, height = MODEL_INPUT_SIZE
+            self._faces_buffer = np.empty(
+                (self._settings.batch_size, height, width, 3), dtype=np.float32
+            )
+        return self._faces_buffer
+
+    def _is_confident(self, confidences: Sequence[float]) -> bool:
+        settings = self._settings
+        if settings.early_stop_z is None or len(confidences) < max(settings.min_frames, 1):
+            return False
+        score, standard_error = aggregate_confidences(
+            confidences, settings.aggregation, settings.trim_share, settings.threshold
+        )
+        margin = settings.early_stop_z * standard_error
+        return score - margin >= settings.threshold or score + margin <= 1 - settings.threshold
+
+
+def to_model_input(face: np.ndarray) -> np.ndarray:
+    """Convert cropped face to model input, i.e. RGB image of model input size.
+
+    Face is kept as uint8, it is converted to float when copied into batch.
+
+    """
+    face = cv.cvtColor(face, cv.COLOR_BGR2RGB)
+    width, height = MODEL_INPUT_SIZE
+    if face.shape[:2] != (height, width):
+        face = cv.resize(face, MODEL_INPUT_SIZE, interpolation=cv.INTER_LINEAR)
+    return face
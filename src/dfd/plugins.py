@@ -0,0 +1,139 @@
+"""Lazily imported plugins, referenced by import path or registered via entry points.
+
+Plugin is referenced as ``"package.module:Class"``, module is imported only when plugin
+is requested by name. Third-party packages can register plugins in entry points group,
+e.g. in ``setup.cfg``:
+
+    [options.entry_points]
+    dfd.modifications =
+        MyModification = my_package.modifications:MyModification
+
+"""
+import functools
+import importlib
+import typing as t
+from importlib import metadata
+from types import MappingProxyType
+
+import structlog
+
+from dfd.exceptions import DfdError
+
+LOGGER = structlog.get_logger()
+
+# Either class itself or reference to it in format "package.module:Class"
+ClassReference = t.Union[str, type]
+
+
+def import_object(reference: str) -> t.Any:
+    """Import object referenced as ``"package.module:attribute"``.
+
+    Raises:
+        DfdError: If reference is malformed or referenced object cannot be imported.
+
+    Returns:
+        Imported object.
+
+    """
+    module_name, separator, attribute_path = reference.partition(":")
+    if not separator or not module_name or not attribute_path:
+        raise DfdError(f"Reference {reference} is not in format 'package.module:attribute'.")
+    try:
+        imported_object = importlib.import_module(module_name)
+        for attribute in attribute_path.split("."):
+            imported_object = getattr(imported_object, attribute)
+    except (ImportError, AttributeError) as error:
+        raise DfdError(f"Cannot import {reference}: {error}") from error
+    return imported_object
+
+
+@functools.lru_cache(maxsize=None)
+def get_entry_point_references(group: str) -> t.Mapping[str, str]:
+    """Get references to plugins registered by installed distributions in entry points group.
+
+    Args:
+        group: Name of entry points group, e.g. ``dfd.modifications``.
+
+    Returns:
+        Map from plugin name to its reference, nothing is imported.
+
+    """
+    entry_points = metadata.entry_points()
+    group_entry_points: t.Iterable[metadata.EntryPoint]
+    if hasattr(entry_points, "select"):
+        group_entry_points = entry_points.select(group=group)
+    else:
+        # Python < 3.10 returns dictionary of groups
+        group_map = t.cast(t.Mapping[str, t.Iterable[metadata.EntryPoint]], entry_points)
+        group_entry_points = group_map.get(group, [])
+    return MappingProxyType(
+        {entry_point.name: entry_point.value for entry_point in group_entry_points}
+    )
+
+
+def add_entry_point_references(
+    name_to_reference_map: t.Mapping[str, ClassReference], group: str
+) -> t.Dict[str, ClassReference]:
+    """Add plugins registered in entry points group to given map.
+
+    Given classes take precedence, entry points shadowing them are skipped.
+
+    Args:
+        name_to_reference_map: Map from name to class or reference to class.
+        group: Name of entry points group.
+
+    Returns:
+        Merged map, nothing is imported.
+
+    """
+    merged_map = dict(name_to_reference_map)
+    for name, reference in get_entry_point_references(group).items():
+        if name in merged_map:
+            LOGGER.warning("Entry point shadows registered plugin.", group=group, name=name)
+            continue
+        merged_map[name] = reference
+    return merged_map
+
+
+class LazyClassRegistry:
+    """Map names to classes, classes given by reference are imported on first request."""
+
+    def __init__(
+        self, base_class: type, name_to_reference_map: t.Mapping[str, ClassReference]
+    ) -> None:
+        """Initialize LazyClassRegistry.
+
+        Args:
+            base_class: Class that each registered class has to subclass.
+            name_to_reference_map: Map from name to class or reference to class.
+
+        """
+        self._base_class = base_class
+        self._name_to_reference_map = dict(name_to_reference_map)
+        self._name_to_class_map: t.Dict[str, type] = {}
+
+    def names(self) -> t.List[str]:
+        """Get registered names, sorted alphabetically."""
+        return sorted(self._name_to_reference_map)
+
+    def get(self, name: str) -> t.Optional[type]:
+        """Get class registered under name, importing it if needed.
+
+        Raises:
+            DfdError: If referenced class cannot be imported or does not subclass base class.
+
+        Returns:
+            Registered class or None if name is not registered.
+
+        """
+        loaded_class = self._name_to_class_map.get(name)
+        if loaded_class is not None:
+            return loaded_class
+        reference = self._name_to_reference_map.get(name)
+        if reference is None:
+            return None
+        loaded_class = import_object(reference) if isinstance(reference, str) else reference
+        if not isinstance(loaded_class, type) or not issubclass(loaded_class, self._base_class):
+            raise DfdError(f"{reference} is not a subclass of {self._base_class.__name__}.")
+        self._name_to_class_map[name] = loaded_class
+        return loaded_class
@@ -0,0 +1,6 @@
+"""Long-lived inference server keeping models loaded between requests."""
+
+from .batcher import BatcherStats, DynamicBatcher
+from .client import InferenceClient
+from .server import InferenceServer
+from .service import InferenceService
@@ -0,0 +1,203 @@
+"""Gather concurrent prediction requests into batches."""
+import collections
+import math
+import queue
+import threading
+import time
+from concurrent import futures
+from typing import Deque, List, NamedTuple, Optional
+
+import numpy as np
+import structlog
+
+from dfd.exceptions import DfdError
+from dfd.models import ModelInterface
+
+LOGGER = structlog.get_logger()
+
+_NO_KEPT_LATENCIES = 1000
+
+
+class BatcherStats(NamedTuple):
+    """Throughput and latency of batcher.
+
+    Args:
+        no_requests: Number of completed requests.
+        no_faces: Number of scored faces.
+        no_batches: Number of batches passed to model.
+        mean_batch_size: Mean number of faces in batch.
+        faces_per_second: Number of scored faces per second of model computation.
+        latency_p50: Median of time from submitting request to its completion, in seconds.
+        latency_p95: 95th percentile of request latency, in seconds.
+        latency_max: Max request latency, in seconds.
+
+    Latencies are computed over most recent requests only.
+
+    """
+
+    no_requests: int
+    no_faces: int
+    no_batches: int
+    mean_batch_size: float
+    faces_per_second: float
+    latency_p50: float
+    latency_p95: float
+    latency_max: float
+
+
+class _PendingRequest(NamedTuple):
+    faces: np.ndarray
+    future: futures.Future
+    submit_time: float
+
+
+class DynamicBatcher:
+    """Score faces sent by many concurrent callers in shared batches.
+
+    Requests are queued and scored by single worker thread, so model does not have to be
+    thread-safe. Once first request is taken from queue, worker waits at most max latency
+    for more requests, unless batch is already full, and scores all of them in single call.
+    Under low load requests are scored almost immediately, under high load batches grow
+    and so does throughput.
+
+    """
+
+    def __init__(
+        self, model: ModelInterface, max_batch_size: int = 64, max_latency: float = 0.005
+    ) -> None:
+        """Initialize DynamicBatcher and start its worker.
+
+        Args:
+            model: Model used to score faces.
+            max_batch_size: Max number of faces scored in single call, larger requests
+                are split.
+            max_latency: Max number of seconds first request of batch waits for more requests.
+
+        Raises:
+            DfdError: If max batch size is not positive or max latency is negative.
+
+        """
+        if max_batch_size < 1:
+            raise DfdError(f"Max batch size must be positive, got {max_batch_size}.")
+        if max_latency < 0:
+            raise DfdError(f"Max latency cannot be negative, got {max_latency}.")
+        self._model = model
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency
+        self._queue: "queue.Queue[Optional[_PendingRequest]]" = queue.Queue()
+        # Guards closed flag, so no request is queued after worker is told to stop
+        self._closed_lock = threading.Lock()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._no_requests = 0
+        self._no_faces = 0
+        self._no_batches = 0
+        self._compute_time = 0.0
+        self._latencies: Deque[float] = collections.deque(maxlen=_NO_KEPT_LATENCIES)
+        self._worker = threading.Thread(target=self._run, name="dynamic-batcher", daemon=True)
+        self._worker.start()
+
+    @property
+    def model(self) -> ModelInterface:
+        """Model used to score faces."""
+        return self._model
+
+    def submit(self, faces: np.ndarray) -> futures.Future:
+        """Queue faces to be scored, see ``ModelInterface.predict_arrays``.
+
+        Raises:
+            DfdError: If batcher is already closed.
+
+        Returns:
+            Future resolved with confidence of each face.
+
+        """
+        future: futures.Future = futures.Future()
+        with self._closed_lock:
+            if self._closed:
+                raise DfdError("Batcher is closed, faces cannot be scored.")
+            if len(faces) == 0:
+                future.set_result(np.empty(0, dtype=np.float32))
+                return future
+            self._queue.put(_PendingRequest(faces, future, time.monotonic()))
+        return future
+
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        """Score faces and wait for result, see ``submit``."""
+        return np.asarray(self.submit(faces).result())
+
+    def stats(self) -> BatcherStats:
+        """Get throughput and latency of batcher."""
+        with self._stats_lock:
+            latencies = np.asarray(self._latencies) if self._latencies else np.zeros(1)
+            return BatcherStats(
+                no_requests=self._no_requests,
+                no_faces=self._no_faces,
+                no_batches=self._no_batches,
+                mean_batch_size=self._no_faces / self._no_batches if self._no_batches else 0.0,
+                faces_per_second=(
+                    self._no_faces / self._compute_time if self._compute_time else 0.0
+                ),
+                latency_p50=float(np.percentile(latencies, 50)),
+                latency_p95=float(np.percentile(latencies, 95)),
+                latency_max=float(np.max(latencies)),
+            )
+
+    def close(self) -> None:
+        """Score already queued requests and stop worker, later requests are rejected."""
+        with self._closed_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._worker.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            no_faces = len(request.faces)
+            deadline = request.submit_time + self._max_latency
+            while no_faces < self._max_batch_size:
+                try:
+                    # Requests queued after deadline are still added, if they are already waiting
+                    next_request = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if next_request is None:
+                    stopping = True
+                    break
+                batch.append(next_request)
+                no_faces += len(next_request.faces)
+            self._score_batch(batch)
+
+    def _score_batch(self, batch: List[_PendingRequest]) -> None:
+        start_time = time.monotonic()
+        batch_size = self._max_batch_size
+        try:
+            faces = np.concatenate([request.faces for request in batch])
+            confidences = np.concatenate(
+                [
+                    self._model.predict_arrays(faces[lower_bound : lower_bound + batch_size])
+                    for lower_bound in range(0, len(faces), batch_size)
+                ]
+            )
+        except Exception as error:  # Error is passed to every caller of batch
+            LOGGER.error("batch_scoring_failed", error=str(error))
+            for request in batch:
+                request.future.set_exception(error)
+            return
+        end_time = time.monotonic()
+        lower_bound = 0
+        for request in batch:
+            upper_bound = lower_bound + len(request.faces)
+            request.future.set_result(confidences[lower_bound:upper_bound])
+            lower_bound = upper_bound
+        with self._stats_lock:
+            self._no_requests += len(batch)
+            self._no_faces += len(faces)
+            self._no_batches += math.ceil(len(faces) / batch_size)
+            self._compute_time += end_time - start_time
+            self._latencies.extend(end_time - request.submit_time for request in batch)
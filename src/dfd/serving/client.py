@@ -0,0 +1,103 @@
+"""Client of inference server, see ``InferenceServer``."""
+import json
+import pathlib
+import typing as t
+import urllib.error
+import urllib.request
+
+from dfd.exceptions import DfdError
+from dfd.models.interface import Prediction
+from dfd.models.video import VideoPredictionSettings, VideoVerdict
+
+
+class InferenceClient:
+    """Send prediction requests to running inference server.
+
+    Paths are resolved before sending, since server runs in different working directory.
+
+    """
+
+    def __init__(self, url: str, timeout: t.Optional[float] = None) -> None:
+        """Initialize InferenceClient.
+
+        Args:
+            url: URL of server, e.g. ``http://127.0.0.1:8765``.
+            timeout: Max number of seconds to wait for response, by default waits indefinitely.
+
+        """
+        self._url = url.rstrip("/")
+        self._timeout = timeout
+
+    def predict_frames(
+        self, model_name: str, model_path: pathlib.Path, frame_paths: t.Sequence[pathlib.Path]
+    ) -> t.Dict[pathlib.Path, float]:
+        """Score faces saved as images.
+
+        Returns:
+            Confidence that face is fake mapped to path of each image.
+
+        """
+        response = self._send(
+            "/predict/frames",
+            {
+                "model_name": model_name,
+                "model_path": str(model_path.resolve()),
+                "paths": [str(frame_path.resolve()) for frame_path in frame_paths],
+            },
+        )
+        return dict(zip(frame_paths, response["confidences"]))
+
+    def predict_videos(
+        self,
+        model_name: str,
+        model_path: pathlib.Path,
+        video_paths: t.Sequence[pathlib.Path],
+        settings: VideoPredictionSettings = VideoPredictionSettings(),
+    ) -> t.Dict[pathlib.Path, VideoVerdict]:
+        """Predict whether videos are DeepFakes.
+
+        Returns:
+            Prediction mapped to path of each video.
+
+        """
+        response = self._send(
+            "/predict/videos",
+            {
+                "model_name": model_name,
+                "model_path": str(model_path.resolve()),
+                "paths": [str(video_path.resolve()) for video_path in video_paths],
+                "settings": settings._asdict(),
+            },
+        )
+        return {
+            video_path: VideoVerdict(**{**verdict, "prediction": Prediction[verdict["prediction"]]})
+            for video_path, verdict in zip(video_paths, response["verdicts"])
+        }
+
+    def stats(self) -> t.Dict[str, t.Dict[str, float]]:
+        """Get throughput and latency of each model loaded by server."""
+        return t.cast(t.Dict[str, t.Dict[str, float]], self._send("/stats")["models"])
+
+    def _send(self, endpoint: str, body: t.Optional[t.Dict[str, t.Any]] = None) -> t.Any:
+        """Send request, GET if no body is given and POST otherwise.
+
+        Raises:
+            DfdError: If server cannot be reached or request failed.
+
+        """
+        request = urllib.request.Request(
+            self._url + endpoint,
+            data=None if body is None else json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            try:
+                message = json.loads(error.read())["error"]
+            except (ValueError, KeyError):
+                message = error.reason
+            raise DfdError(f"Inference server failed to handle request: {message}") from error
+        except urllib.error.URLError as error:
+            raise DfdError(f"Cannot connect to inference server {self._url}.") from error
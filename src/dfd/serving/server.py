@@ -0,0 +1,113 @@
+"""HTTP server exposing inference service to local clients.
+
+Endpoints, all bodies are JSON:
+
+* ``POST /predict/frames`` with ``model_name``, ``model_path`` and ``paths`` to face images,
+  responds with ``confidences`` of images.
+* ``POST /predict/videos`` with ``model_name``, ``model_path``, ``paths`` to videos and
+  optional ``settings`` of ``VideoPredictionSettings``, responds with ``verdicts``.
+* ``GET /stats`` responds with throughput and latency of each loaded model.
+
+"""
+
+import http.server
+import json
+import pathlib
+import typing as t
+
+import structlog
+
+from dfd.exceptions import DfdError
+from dfd.models.video import Aggregation, VideoPredictionSettings
+
+from .service import InferenceService
+
+LOGGER = structlog.get_logger()
+
+
+class InferenceServer(http.server.ThreadingHTTPServer):
+    """Handle each request in separate thread, requests are batched by inference service."""
+
+    daemon_threads = True
+
+    def __init__(self, address: t.Tuple[str, int], service: InferenceService) -> None:
+        """Initialize InferenceServer and bind it to address.
+
+        Args:
+            address: Host and port, port 0 binds to any free port.
+            service: Service used to score requests.
+
+        """
+        super().__init__(address, _RequestHandler)
+        self.service = service
+
+    @property
+    def url(self) -> str:
+        """URL under which server is available."""
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    server: InferenceServer
+
+    def do_GET(self) -> None:
+        if self.path != "/stats":
+            self._respond(404, {"error": f"Unknown endpoint {self.path}."})
+            return
+        stats = {
+            model_key: model_stats._asdict()
+            for model_key, model_stats in self.server.service.stats().items()
+        }
+        self._respond(200, {"models": stats})
+
+    def do_POST(self) -> None:
+        if self.path not in ("/predict/frames", "/predict/videos"):
+            self._respond(404, {"error": f"Unknown endpoint {self.path}."})
+            return
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(content_length) or b"{}")
+            model_name = body["model_name"]
+            model_path = pathlib.Path(body["model_path"])
+            paths = [pathlib.Path(path) for path in body["paths"]]
+            if self.path == "/predict/frames":
+                confidences = self.server.service.predict_frames(model_name, model_path, paths)
+                self._respond(200, {"confidences": confidences})
+            else:
+                verdicts = self.server.service.predict_videos(
+                    model_name, model_path, paths, _parse_settings(body.get("settings", {}))
+                )
+                self._respond(
+                    200,
+                    {
+                        "verdicts": [
+                            {**verdict._asdict(), "prediction": verdict.prediction.name}
+                            for verdict in verdicts
+                        ]
+                    },
+                )
+        except (DfdError, KeyError, TypeError, ValueError) as error:
+            self._respond(400, {"error": f"{type(error).__name__}: {error}"})
+        except Exception as error:  # Server keeps running, error is reported to client
+            LOGGER.exception("request_failed", path=self.path)
+            self._respond(500, {"error": f"{type(error).__name__}: {error}"})
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        LOGGER.debug("http_request", message=format % args)
+
+    def _respond(self, status: int, body: t.Dict[str, t.Any]) -> None:
+        encoded_body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded_body)))
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+
+def _parse_settings(settings: t.Dict[str, t.Any]) -> VideoPredictionSettings:
+    if "aggregation" in settings:
+        settings = {**settings, "aggregation": Aggregation(settings["aggregation"])}
+    return VideoPredictionSettings(**settings)
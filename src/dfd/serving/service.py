@@ -0,0 +1,165 @@
+"""Keep models loaded and score requests in shared batches."""
+import pathlib
+import threading
+import typing as t
+
+import cv2 as cv
+import numpy as np
+import structlog
+
+from dfd.datasets.face_extractor import FaceExtractor
+from dfd.exceptions import DfdError
+from dfd.models import ModelInterface, ModelRegistry, TrainingSettings
+from dfd.models.interface import Prediction
+from dfd.models.video import VideoPredictionSettings, VideoPredictor, VideoVerdict, to_model_input
+
+from .batcher import BatcherStats, DynamicBatcher
+
+LOGGER = structlog.get_logger()
+
+
+class _BatchedModel(ModelInterface):
+    """Model whose faces are scored by dynamic batcher, so it can be shared by many threads."""
+
+    def __init__(self, batcher: DynamicBatcher) -> None:
+        self._batcher = batcher
+
+    def train(
+        self,
+        train_ds_path: pathlib.Path,
+        validation_ds_path: pathlib.Path,
+        settings: TrainingSettings = TrainingSettings(),
+    ) -> None:
+        raise DfdError("Served model cannot be trained.")
+
+    def test(self, test_ds_path: pathlib.Path) -> t.Dict[str, float]:
+        return t.cast(t.Dict[str, float], self._batcher.model.test(test_ds_path))
+
+    def predict(self, sample_path: pathlib.Path) -> t.Dict[pathlib.Path, Prediction]:
+        return t.cast(t.Dict[pathlib.Path, Prediction], self._batcher.model.predict(sample_path))
+
+    def predict_arrays(self, faces: np.ndarray) -> np.ndarray:
+        return self._batcher.predict_arrays(faces)
+
+    def save(self, path: pathlib.Path):
+        self._batcher.model.save(path)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> ModelInterface:
+        raise DfdError("Served model cannot be loaded directly.")
+
+    def get_available_metrics_names(self) -> t.List[str]:
+        return t.cast(t.List[str], self._batcher.model.get_available_metrics_names())
+
+
+class InferenceService:
+    """Score frames and videos with models loaded once and kept in memory.
+
+    Each loaded model gets its own dynamic batcher, so requests handled concurrently
+    are scored together.
+
+    """
+
+    def __init__(
+        self,
+        model_registry: ModelRegistry,
+        face_extractor: FaceExtractor,
+        max_batch_size: int = 64,
+        max_latency: float = 0.005,
+        num_threads: t.Optional[int] = None,
+    ) -> None:
+        """Initialize InferenceService.
+
+        Args:
+            model_registry: Registry of models that can be loaded.
+            face_extractor: Face extractor used to crop faces from frames of videos.
+            max_batch_size: Max number of faces scored in single call.
+            max_latency: Max number of seconds request waits for other requests.
+            num_threads: Number of threads models run inference with, see
+                ``ModelRegistry.load_model``.
+
+        """
+        self._model_registry = model_registry
+        self._face_extractor = face_extractor
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency
+        self._num_threads = num_threads
+        self._batchers: t.Dict[str, DynamicBatcher] = {}
+        self._lock = threading.Lock()
+
+    def load_model(self, model_name: str, model_path: pathlib.Path) -> DynamicBatcher:
+        """Load model unless it is already loaded.
+
+        Raises:
+            DfdError: If model is not registered or number of threads cannot be set.
+
+        Returns:
+            Batcher scoring faces with model.
+
+        """
+        model_key = _get_model_key(model_name, model_path)
+        with self._lock:
+            batcher = self._batchers.get(model_key)
+            if batcher is None:
+                LOGGER.info("loading_model", model_name=model_name, model_path=str(model_path))
+                model = self._model_registry.load_model(model_name, model_path, self._num_threads)
+                batcher = DynamicBatcher(model, self._max_batch_size, self._max_latency)
+                self._batchers[model_key] = batcher
+            return batcher
+
+    def predict_frames(
+        self, model_name: str, model_path: pathlib.Path, frame_paths: t.Sequence[pathlib.Path]
+    ) -> t.List[float]:
+        """Score faces saved as images, e.g. by ``extract-faces`` command.
+
+        Raises:
+            DfdError: If image cannot be read.
+
+        Returns:
+            Confidence that face is fake for each image.
+
+        """
+        batcher = self.load_model(model_name, model_path)
+        faces = []
+        for frame_path in frame_paths:
+            frame = cv.imread(str(frame_path))
+            if frame is None:
+                raise DfdError(f"Cannot read image {frame_path}.")
+            faces.append(to_model_input(frame))
+        if not faces:
+            return []
+        return t.cast(t.List[float], batcher.predict_arrays(np.stack(faces)).tolist())
+
+    def predict_videos(
+        self,
+        model_name: str,
+        model_path: pathlib.Path,
+        video_paths: t.Sequence[pathlib.Path],
+        settings: VideoPredictionSettings = VideoPredictionSettings(),
+    ) -> t.List[VideoVerdict]:
+        """Predict whether videos are DeepFakes, see ``VideoPredictor``.
+
+        Returns:
+            Prediction for each video.
+
+        """
+        batcher = self.load_model(model_name, model_path)
+        video_predictor = VideoPredictor(_BatchedModel(batcher), self._face_extractor, settings)
+        return [video_predictor.predict(video_path) for video_path in video_paths]
+
+    def stats(self) -> t.Dict[str, BatcherStats]:
+        """Get throughput and latency of each loaded model."""
+        with self._lock:
+            batchers = dict(self._batchers)
+        return {model_key: batcher.stats() for model_key, batcher in batchers.items()}
+
+    def close(self) -> None:
+        """Stop batchers of all loaded models."""
+        with self._lock:
+            for batcher in self._batchers.values():
+                batcher.close()
+            self._batchers.clear()
+
+
+def _get_model_key(model_name: str, model_path: pathlib.Path) -> str:
+    return f"{model_name}:{model_path.resolve()}"
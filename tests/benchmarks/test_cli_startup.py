@@ -0,0 +1,39 @@
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+NO_REPEATS = 3
+
+COMMANDS = {
+    "dfd --help": [sys.executable, "-m", "dfd", "--help"],
+    "dfd preprocess split --help": [
+        sys.executable,
+        "-m",
+        "dfd",
+        "preprocess",
+        ".",
+        ".",
+        "split",
+        "--help",
+    ],
+    "import registries": [
+        sys.executable,
+        "-c",
+        "from dfd.models import ModelRegistry; ModelRegistry.default()",
+    ],
+}
+
+
+@pytest.mark.parametrize("command_name", sorted(COMMANDS))
+def test_cli_startup_time(report_benchmark, command_name):
+    durations = []
+    for _ in range(NO_REPEATS):
+        start = time.perf_counter()
+        subprocess.run(COMMANDS[command_name], check=True, capture_output=True)
+        durations.append(time.perf_counter() - start)
+    report_benchmark(f"startup {command_name}", median_s=statistics.median(durations))
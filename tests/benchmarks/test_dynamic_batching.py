@@ -0,0 +1,60 @@
+import time
+from concurrent import futures
+
+import numpy as np
+import pytest
+
+from dfd.models.implementation import MesoNet
+from dfd.serving import DynamicBatcher
+
+pytestmark = pytest.mark.benchmark
+
+NO_CLIENTS = 16
+NO_REQUESTS_PER_CLIENT = 32
+FACE_SHAPE = (1, 256, 256, 3)
+
+
+@pytest.fixture(scope="module")
+def model():
+    model = MesoNet()
+    # Warm up, so first batches do not pay for tracing
+    model.predict_arrays(np.zeros(FACE_SHAPE, dtype=np.float32))
+    return model
+
+
+@pytest.mark.parametrize(
+    "max_batch_size, max_latency_ms",
+    [
+        # Each request is scored separately
+        (1, 0),
+        (64, 0),
+        (64, 2),
+        (64, 5),
+        (64, 10),
+    ],
+)
+def test_dynamic_batching_throughput(report_benchmark, model, max_batch_size, max_latency_ms):
+    # Given
+    batcher = DynamicBatcher(model, max_batch_size, max_latency=max_latency_ms / 1000)
+    face = np.random.default_rng(0).uniform(0, 255, FACE_SHAPE).astype(np.float32)
+
+    def _client():
+        for _ in range(NO_REQUESTS_PER_CLIENT):
+            batcher.predict_arrays(face)
+
+    # When
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=NO_CLIENTS) as executor:
+        for client_future in [executor.submit(_client) for _ in range(NO_CLIENTS)]:
+            client_future.result()
+    duration = time.perf_counter() - start
+    batcher.close()
+    # Then
+    stats = batcher.stats()
+    report_benchmark(
+        f"dynamic batching, max batch {max_batch_size}, max latency {max_latency_ms} ms",
+        requests_per_s=NO_CLIENTS * NO_REQUESTS_PER_CLIENT / duration,
+        mean_batch_size=stats.mean_batch_size,
+        latency_p50_ms=stats.latency_p50 * 1000,
+        latency_p95_ms=stats.latency_p95 * 1000,
+    )
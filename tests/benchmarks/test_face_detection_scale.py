@@ -0,0 +1,58 @@
+import time
+
+import cv2 as cv
+import pytest
+
+from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+
+pytestmark = pytest.mark.benchmark
+
+
+def _intersection_over_union(first_location, second_location) -> float:
+    first_top, first_right, first_bottom, first_left = first_location
+    second_top, second_right, second_bottom, second_left = second_location
+    intersection_height = max(min(first_bottom, second_bottom) - max(first_top, second_top), 0)
+    intersection_width = max(min(first_right, second_right) - max(first_left, second_left), 0)
+    intersection = intersection_height * intersection_width
+    first_area = (first_bottom - first_top) * (first_right - first_left)
+    second_area = (second_bottom - second_top) * (second_right - second_left)
+    return intersection / (first_area + second_area - intersection)
+
+
+def _locate_faces(face_extractor, frames):
+    start = time.perf_counter()
+    face_locations = [face_extractor.locate(frame) for frame in frames]
+    return face_locations, (time.perf_counter() - start) / len(frames)
+
+
+@pytest.mark.parametrize("model", [FaceExtractionModel.HOG, FaceExtractionModel.CNN])
+@pytest.mark.parametrize("detection_scale", [0.75, 0.5, 0.25])
+def test_face_detection_scale(benchmark_frames_path, report_benchmark, model, detection_scale):
+    # Given
+    frames = [cv.imread(str(frame_path)) for frame_path in sorted(benchmark_frames_path.iterdir())]
+    reference_face_extractor = FaceExtractor(model, detection_scale=1.0)
+    scaled_face_extractor = FaceExtractor(model, detection_scale=detection_scale)
+    # When
+    reference_locations, reference_seconds_per_frame = _locate_faces(
+        reference_face_extractor, frames
+    )
+    scaled_locations, scaled_seconds_per_frame = _locate_faces(scaled_face_extractor, frames)
+    # Then
+    location_pairs = [
+        (reference_location, scaled_location)
+        for reference_location, scaled_location in zip(reference_locations, scaled_locations)
+        if reference_location is not None
+    ]
+    no_found_faces = sum(1 for _, scaled_location in location_pairs if scaled_location)
+    intersections_over_union = [
+        _intersection_over_union(reference_location, scaled_location)
+        for reference_location, scaled_location in location_pairs
+        if scaled_location is not None
+    ]
+    report_benchmark(
+        f"face detection {model.value} scale {detection_scale}",
+        speedup=reference_seconds_per_frame / scaled_seconds_per_frame,
+        seconds_per_frame=scaled_seconds_per_frame,
+        recall=no_found_faces / max(len(location_pairs), 1),
+        mean_iou=sum(intersections_over_union) / max(len(intersections_over_union), 1),
+    )
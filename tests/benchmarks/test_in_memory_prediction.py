@@ -0,0 +1,58 @@
+import time
+
+import cv2 as cv
+import numpy as np
+import pytest
+
+from dfd.models.implementation import MesoNet
+
+pytestmark = pytest.mark.benchmark
+
+NO_FACES = 256
+BATCH_SIZE = 32
+FACE_SHAPE = (256, 256, 3)
+
+
+@pytest.fixture(scope="module")
+def model():
+    model = MesoNet()
+    # Warm up, so first batches do not pay for tracing
+    model.predict_arrays(np.zeros((BATCH_SIZE, *FACE_SHAPE), dtype=np.uint8))
+    return model
+
+
+@pytest.fixture(scope="module")
+def faces():
+    random_generator = np.random.default_rng(0)
+    return [random_generator.integers(0, 256, FACE_SHAPE, dtype=np.uint8) for _ in range(NO_FACES)]
+
+
+def _predict_from_disk(model, faces, tmp_path):
+    # Faces held in memory had to be saved to be scored
+    for face_index, face in enumerate(faces):
+        cv.imwrite(str(tmp_path / f"{face_index}.png"), cv.cvtColor(face, cv.COLOR_RGB2BGR))
+    model.predict(tmp_path)
+
+
+def _predict_arrays(model, faces, tmp_path):
+    for lower_bound in range(0, len(faces), BATCH_SIZE):
+        model.predict_arrays(np.stack(faces[lower_bound : lower_bound + BATCH_SIZE]))
+
+
+def _predict_iter(model, faces, tmp_path):
+    for _ in model.predict_iter(faces, batch_size=BATCH_SIZE):
+        pass
+
+
+@pytest.mark.parametrize(
+    "predict", [_predict_from_disk, _predict_arrays, _predict_iter], ids=lambda f: f.__name__
+)
+def test_in_memory_prediction_throughput(report_benchmark, tmp_path, model, faces, predict):
+    # When
+    start = time.perf_counter()
+    predict(model, faces, tmp_path)
+    duration = time.perf_counter() - start
+    # Then
+    report_benchmark(
+        f"in-memory prediction, {predict.__name__[1:]}", faces_per_s=NO_FACES / duration
+    )
@@ -0,0 +1,87 @@
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from dfd.models.implementation import MesoNet
+from dfd.models.implementation.export import ExportFormat
+
+pytestmark = pytest.mark.benchmark
+
+NO_BATCHES = 8
+BATCH_SIZE = 32
+
+# Each backend is measured in fresh process, so cold start and memory include imports
+BENCHMARK_CODE = """
+import json, pathlib, sys, time
+import numpy as np
+from dfd.models import ModelRegistry
+model_name, model_path, load_kwargs, no_batches, batch_size = sys.argv[1:]
+model_class = ModelRegistry.default().get_model_class(model_name)
+model = model_class.load(pathlib.Path(model_path), **json.loads(load_kwargs))
+faces = np.random.default_rng(0).integers(0, 256, (int(batch_size), 256, 256, 3), dtype=np.uint8)
+model.predict_arrays(faces[:1])
+ready_time = time.perf_counter()
+for _ in range(int(no_batches)):
+    model.predict_arrays(faces)
+duration = time.perf_counter() - ready_time
+# Max RSS reported by getrusage includes memory of forking parent, VmHWM is reset on exec
+status = pathlib.Path("/proc/self/status").read_text()
+peak_rss_kb = int(status.split("VmHWM:")[1].split()[0])
+print(json.dumps({
+    "faces_per_s": int(no_batches) * int(batch_size) / duration,
+    "peak_rss_mb": peak_rss_kb / 1024,
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def model_paths(tmp_path_factory):
+    models_path = tmp_path_factory.mktemp("models")
+    model = MesoNet()
+    model.save(models_path / "meso_net")
+    return {
+        "meso_net": models_path / "meso_net.h5",
+        "meso_net_exported": model.export(models_path / "exported", ExportFormat.TFLITE),
+        "meso_net_opencv": model.export(models_path / "exported", ExportFormat.FROZEN_GRAPH),
+    }
+
+
+@pytest.mark.parametrize(
+    "model_name, load_kwargs",
+    [
+        ("meso_net", {}),
+        ("meso_net_exported", {}),
+        ("meso_net_opencv", {}),
+        ("meso_net_opencv", {"num_threads": 1}),
+    ],
+)
+def test_inference_backend(report_benchmark, model_paths, model_name, load_kwargs):
+    # When
+    start = time.perf_counter()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            BENCHMARK_CODE,
+            model_name,
+            str(model_paths[model_name]),
+            json.dumps(load_kwargs),
+            str(NO_BATCHES),
+            str(BATCH_SIZE),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    total_duration = time.perf_counter() - start
+    # Then
+    measurements = json.loads(result.stdout.splitlines()[-1])
+    batches_duration = NO_BATCHES * BATCH_SIZE / measurements["faces_per_s"]
+    report_benchmark(
+        f"inference backend {model_name} {json.dumps(load_kwargs)}",
+        cold_start_s=total_duration - batches_duration,
+        **measurements,
+    )
@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+import pytest
+
+from dfd.datasets.modifications.definitions import (
+    CLAHEModification,
+    GammaCorrectionModification,
+    GaussianBlurModification,
+    GaussianNoiseModification,
+    HistogramEqualizationModification,
+    MedianFilterModification,
+)
+
+pytestmark = pytest.mark.benchmark
+
+NO_FRAMES = 64
+FRAME_SHAPE = (256, 256, 3)
+NO_REPEATS = 5
+
+
+def _measure_frames_per_second(modify, frames) -> float:
+    start = time.perf_counter()
+    for _ in range(NO_REPEATS):
+        modify(frames)
+    return NO_REPEATS * len(frames) / (time.perf_counter() - start)
+
+
+@pytest.mark.parametrize(
+    "modification",
+    [
+        CLAHEModification(clip_limit=2.0, grid_width=8, grid_height=8),
+        GammaCorrectionModification(gamma_value=0.5),
+        GaussianBlurModification(kernel_width=9, kernel_height=9),
+        GaussianNoiseModification(),
+        HistogramEqualizationModification(),
+        MedianFilterModification(aperture_size=3),
+    ],
+    ids=lambda modification: modification.name(),
+)
+def test_modifications_batch(report_benchmark, modification):
+    # Given
+    frames = np.random.default_rng(0).integers(0, 256, (NO_FRAMES, *FRAME_SHAPE), dtype=np.uint8)
+    # When
+    per_frame_throughput = _measure_frames_per_second(
+        lambda frames: [modification.perform(frame) for frame in frames], frames
+    )
+    batched_throughput = _measure_frames_per_second(modification.perform_batch, frames)
+    # Then
+    report_benchmark(
+        f"modification {modification.name()}",
+        per_frame_fps=per_frame_throughput,
+        batched_fps=batched_throughput,
+        speedup=batched_throughput / per_frame_throughput,
+    )
@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+import pytest
+
+from dfd import assets
+from dfd.datasets.modifications.register import ModificationRegister
+
+pytestmark = pytest.mark.benchmark
+
+FRAME_SHAPE = (256, 256, 3)
+NO_REPEATS = 50
+
+# Options of modifications and upper bounds of median latency of single 256x256 frame,
+# bounds are generous, so only regressions like per-call recompilation of state are caught
+MODIFICATION_OPTIONS = {
+    "CLAHEModification": {"clip_limit": 2.0, "grid_width": 8, "grid_height": 8},
+    "GammaCorrectionModification": {"gamma_value": 0.5},
+    "GaussianBlurModification": {"kernel_width": 9, "kernel_height": 9},
+    "GaussianNoiseModification": {"mean": 0.0, "standard_deviation": 10.0},
+    "HistogramEqualizationModification": {},
+    "MedianFilterModification": {"aperture_size": 3},
+    "RedEyesEffectModification": {
+        "face_landmarks_detector_path": str(assets.FACE_LANDMARKS_MODEL_PATH)
+    },
+}
+LATENCY_BUDGETS_MS = {
+    "CLAHEModification": 3.0,
+    "GammaCorrectionModification": 0.5,
+    "GaussianBlurModification": 2.0,
+    "GaussianNoiseModification": 8.0,
+    "HistogramEqualizationModification": 1.0,
+    "MedianFilterModification": 1.0,
+    "RedEyesEffectModification": 50.0,
+}
+
+
+def test_all_registered_modifications_are_measured():
+    assert ModificationRegister.default().names() == sorted(MODIFICATION_OPTIONS)
+
+
+@pytest.mark.parametrize("modification_name", sorted(MODIFICATION_OPTIONS))
+def test_modification_latency(report_benchmark, modification_name):
+    # Given
+    if (
+        modification_name == "RedEyesEffectModification"
+        and not assets.FACE_LANDMARKS_MODEL_PATH.is_file()
+    ):
+        pytest.skip("face landmarks model is not downloaded")
+    modification_class = ModificationRegister.default().get_modification_class(modification_name)
+    modification = modification_class(**MODIFICATION_OPTIONS[modification_name])
+    frame = np.random.default_rng(0).integers(0, 256, FRAME_SHAPE, dtype=np.uint8)
+    # Warm up caches, so only steady state is measured
+    modification.perform(frame)
+    # When
+    latencies_ms = []
+    for _ in range(NO_REPEATS):
+        start = time.perf_counter()
+        modification.perform(frame)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    median_latency_ms = float(np.median(latencies_ms))
+    # Then
+    report_benchmark(
+        f"modification {modification_name} latency",
+        median_ms=median_latency_ms,
+        budget_ms=LATENCY_BUDGETS_MS[modification_name],
+    )
+    assert median_latency_ms <= LATENCY_BUDGETS_MS[modification_name]
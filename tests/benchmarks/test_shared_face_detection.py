@@ -0,0 +1,50 @@
+import pathlib
+import time
+
+import cv2 as cv
+import pytest
+
+from dfd import assets
+from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.frames_generators import ModificationGenerator
+from dfd.datasets.settings import GeneratorSettings
+
+pytestmark = pytest.mark.benchmark
+
+
+def _modify_and_locate_separately(modification_generator, face_extractor, input_frames):
+    # Face is searched for by modifications and then again on every modified frame
+    for modified_frame in modification_generator.from_frames(input_frames, len(input_frames)):
+        face_extractor.locate(modified_frame.frame)
+
+
+def _modify_and_locate_once(modification_generator, face_extractor, input_frames):
+    for modified_frame in modification_generator.from_frames(
+        input_frames, len(input_frames), face_locator=face_extractor.locate
+    ):
+        if modified_frame.face_detection is None:
+            face_extractor.locate(modified_frame.frame)
+
+
+@pytest.mark.parametrize(
+    "modify_and_locate", [_modify_and_locate_separately, _modify_and_locate_once]
+)
+def test_shared_face_detection(benchmark_frames_path, report_benchmark, modify_and_locate):
+    # Given
+    if not assets.FACE_LANDMARKS_MODEL_PATH.exists():
+        pytest.skip("face landmarks model is not downloaded")
+    input_frames = [
+        (cv.imread(str(frame_path)), pathlib.Path(frame_path.name))
+        for frame_path in sorted(benchmark_frames_path.iterdir())
+    ]
+    modification_generator = ModificationGenerator(GeneratorSettings.default())
+    face_extractor = FaceExtractor(FaceExtractionModel.HOG)
+    # When
+    start = time.perf_counter()
+    modify_and_locate(modification_generator, face_extractor, input_frames)
+    seconds_per_frame = (time.perf_counter() - start) / len(input_frames)
+    # Then
+    report_benchmark(
+        f"modify and locate faces {modify_and_locate.__name__.strip('_')}",
+        seconds_per_frame=seconds_per_frame,
+    )
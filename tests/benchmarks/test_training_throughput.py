@@ -0,0 +1,53 @@
+import time
+
+import cv2 as cv
+import numpy as np
+import pytest
+
+from dfd.models import CacheMode, TrainingSettings
+from dfd.models.implementation import MesoNet
+
+pytestmark = pytest.mark.benchmark
+
+NO_IMAGES_PER_CLASS = 64
+IMAGE_SHAPE = (256, 256, 3)
+NO_EPOCHS = 3
+
+CONFIGURATIONS = {
+    "no cache": TrainingSettings(),
+    "memory cache": TrainingSettings(cache=CacheMode.MEMORY),
+    "disk cache": TrainingSettings(cache=CacheMode.DISK),
+    "memory cache, batch 64": TrainingSettings(batch_size=64, cache=CacheMode.MEMORY),
+    "memory cache, mixed precision": TrainingSettings(cache=CacheMode.MEMORY, mixed_precision=True),
+    "memory cache, XLA": TrainingSettings(cache=CacheMode.MEMORY, jit_compile=True),
+}
+
+
+@pytest.fixture(scope="module")
+def dataset_path(tmp_path_factory):
+    dataset_path = tmp_path_factory.mktemp("dataset")
+    random_generator = np.random.default_rng(0)
+    for class_name in ["reals", "fakes"]:
+        class_path = dataset_path / class_name
+        class_path.mkdir()
+        for image_index in range(NO_IMAGES_PER_CLASS):
+            image = random_generator.integers(0, 256, IMAGE_SHAPE, dtype=np.uint8)
+            cv.imwrite(str(class_path / f"{image_index}.png"), image)
+    return dataset_path
+
+
+@pytest.mark.parametrize("configuration_name", list(CONFIGURATIONS))
+def test_training_throughput(report_benchmark, tmp_path, dataset_path, configuration_name):
+    # Given
+    settings = CONFIGURATIONS[configuration_name]._replace(
+        epochs=NO_EPOCHS, cache_path=tmp_path / "cache"
+    )
+    model = MesoNet()
+    # When
+    start = time.perf_counter()
+    model.train(dataset_path, dataset_path, settings)
+    duration = time.perf_counter() - start
+    # Then
+    # Each epoch reads dataset twice, once for training and once for validation
+    no_images = 2 * NO_EPOCHS * 2 * NO_IMAGES_PER_CLASS
+    report_benchmark(f"training {configuration_name}", images_per_s=no_images / duration)
@@ -0,0 +1,63 @@
+import pathlib
+import typing as t
+
+import pytest
+
+_BENCHMARK_RESULTS_KEY = pytest.StashKey[t.List[str]]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmarks",
+        action="store_true",
+        default=False,
+        help="Run benchmarks, they are skipped by default.",
+    )
+    parser.addoption(
+        "--benchmark-frames-path",
+        type=pathlib.Path,
+        default=None,
+        help="Directory containing frames with faces used by face detection benchmarks.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: benchmark, run only if --benchmarks is set")
+    config.stash[_BENCHMARK_RESULTS_KEY] = []
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="use --benchmarks to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    benchmark_results = config.stash[_BENCHMARK_RESULTS_KEY]
+    if not benchmark_results:
+        return
+    terminalreporter.section("benchmarks")
+    for benchmark_result in benchmark_results:
+        terminalreporter.write_line(benchmark_result)
+
+
+@pytest.fixture
+def report_benchmark(request):
+    """Report benchmark result, all results are displayed in terminal summary."""
+
+    def _report_benchmark(name: str, **values: float):
+        formatted_values = ", ".join(f"{key}: {value:.5f}" for key, value in values.items())
+        request.config.stash[_BENCHMARK_RESULTS_KEY].append(f"{name} | {formatted_values}")
+
+    return _report_benchmark
+
+
+@pytest.fixture
+def benchmark_frames_path(request) -> pathlib.Path:
+    frames_path = request.config.getoption("--benchmark-frames-path")
+    if frames_path is None:
+        pytest.skip("use --benchmark-frames-path to provide frames")
+    return frames_path
@@ -0,0 +1,51 @@
+import click
+import cv2 as cv
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from dfd.cli import entry_point
+from dfd.cli.export import _load_evaluation_faces
+from dfd.datasets.packed import pack_directory
+
+
+def _write_faces(path, no_faces: int):
+    path.mkdir(parents=True)
+    for face_index in range(no_faces):
+        face = np.full((8, 8, 3), face_index, dtype=np.uint8)
+        cv.imwrite(str(path / f"{face_index:02d}.png"), face)
+
+
+def test_empty_calibration_path_is_reported(tmp_path):
+    # Given
+    calibration_path = tmp_path / "calibration"
+    calibration_path.mkdir()
+    # When
+    result = CliRunner().invoke(
+        entry_point,
+        ["export", "--calibration-path", str(calibration_path), str(tmp_path), str(tmp_path)],
+    )
+    # Then
+    assert result.exit_code == 2
+    assert "No faces found in calibration path" in result.output
+
+
+def test_empty_evaluation_path_is_reported(tmp_path):
+    with pytest.raises(click.UsageError):
+        _load_evaluation_faces(tmp_path, 10, None)
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_evaluation_faces_are_capped(tmp_path, packed):
+    # Given
+    evaluation_path = tmp_path / "faces"
+    _write_faces(evaluation_path / "reals", 6)
+    _write_faces(evaluation_path / "fakes", 6)
+    if packed:
+        pack_directory(evaluation_path, tmp_path / "packed", image_size=(8, 8), seed=0)
+        evaluation_path = tmp_path / "packed"
+    # When
+    faces, labels = _load_evaluation_faces(evaluation_path, 4, None)
+    # Then
+    assert len(faces) == 4
+    assert labels is not None and sorted(labels) == [0, 0, 1, 1]
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from dfd.cli import entry_point
+
+
+def _get_imported_modules(arguments):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "dfd", *arguments],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    # Lines have format "import time: self [us] | cumulative | imported package"
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+@pytest.mark.parametrize(
+    "arguments, heavy_modules",
+    [
+        (["--help"], {"tensorflow", "face_recognition", "dlib"}),
+        (["export", "--help"], {"tensorflow", "face_recognition", "dlib"}),
+        (["preprocess", "{input}", "{output}", "split", "--help"], {"tensorflow", "dlib"}),
+        (["preprocess", "{input}", "{output}", "split"], {"tensorflow", "dlib"}),
+        (["preprocess", "{input}", "{output}", "modify-frames", "--help"], {"tensorflow"}),
+        (["train", "--help"], {"tensorflow", "dlib"}),
+        (["serve", "--help"], {"tensorflow", "dlib"}),
+        (["predict-video", "--help"], {"tensorflow", "dlib"}),
+    ],
+)
+def test_command_does_not_import_heavy_modules(tmp_path, arguments, heavy_modules):
+    # Given
+    input_path = tmp_path / "input"
+    input_path.mkdir()
+    arguments = [
+        argument.format(input=input_path, output=tmp_path / "output") for argument in arguments
+    ]
+    # When
+    imported_modules = _get_imported_modules(arguments)
+    # Then
+    assert "dfd.cli.entry_point" in imported_modules
+    assert not imported_modules & heavy_modules
+
+
+def test_help_lists_lazy_subcommands():
+    # When
+    result = CliRunner().invoke(entry_point, ["--help"])
+    # Then
+    assert result.exit_code == 0
+    for command_name in ["predict", "preprocess", "test", "train"]:
+        assert command_name in result.output
@@ -0,0 +1,36 @@
+import pytest
+from click.testing import CliRunner
+
+from dfd import plugins
+from dfd.cli import entry_point
+from dfd.exceptions import DfdError
+
+
+@pytest.fixture
+def plugin_model(monkeypatch):
+    monkeypatch.setattr(
+        plugins,
+        "get_entry_point_references",
+        lambda group: (
+            {"plugin_stub": "dfd.models.stubs:ModelStub"} if group == "dfd.models" else {}
+        ),
+    )
+
+
+def test_model_registered_by_plugin_can_be_used(tmp_path, plugin_model):
+    # When
+    result = CliRunner().invoke(
+        entry_point, ["test", "--model-name", "plugin_stub", str(tmp_path), str(tmp_path)]
+    )
+    # Then
+    assert result.exit_code == 0, result.output
+    assert "metric" in result.output
+
+
+def test_unknown_model_is_reported_by_registry(tmp_path):
+    # When
+    result = CliRunner().invoke(
+        entry_point, ["test", "--model-name", "unknown", str(tmp_path), str(tmp_path)]
+    )
+    # Then
+    assert isinstance(result.exception, DfdError)
@@ -0,0 +1,20 @@
+import cv2
+import numpy as np
+import pytest
+
+VIDEO_FRAME_SHAPE = (24, 32, 3)
+
+
+@pytest.fixture
+def make_video():
+    def _make_video(path, no_frames: int = 10, frame_shape=VIDEO_FRAME_SHAPE):
+        frame_height, frame_width, _ = frame_shape
+        writer = cv2.VideoWriter(
+            str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (frame_width, frame_height)
+        )
+        for frame_index in range(no_frames):
+            writer.write(np.full(frame_shape, frame_index * 20, dtype=np.uint8))
+        writer.release()
+        return path
+
+    return _make_video
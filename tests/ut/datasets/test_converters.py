@@ -0,0 +1,61 @@
+import pytest
+
+from dfd.datasets.converters import (
+    convert_video_to_frames,
+    count_video_frames,
+    generate_video_frames,
+)
+from dfd.exceptions import DfdError
+
+NO_VIDEO_FRAMES = 10
+
+
+@pytest.fixture
+def video_path(tmp_path, make_video):
+    return make_video(tmp_path / "video.avi", no_frames=NO_VIDEO_FRAMES)
+
+
+def test_generate_all_video_frames(video_path):
+    # When
+    video_frames = list(generate_video_frames(str(video_path)))
+    # Then
+    assert [video_frame.frame_index for video_frame in video_frames] == list(range(NO_VIDEO_FRAMES))
+    assert all(video_frame.frame.shape == (24, 32, 3) for video_frame in video_frames)
+
+
+@pytest.mark.parametrize(
+    "frame_stride, max_frames, expected_indexes",
+    [
+        (3, None, [0, 3, 6, 9]),
+        (1, 4, [0, 1, 2, 3]),
+        (2, 2, [0, 2]),
+        (1, 100, list(range(NO_VIDEO_FRAMES))),
+    ],
+)
+def test_generate_video_frames_with_stride_and_limit(
+    video_path, frame_stride, max_frames, expected_indexes
+):
+    # When
+    video_frames = generate_video_frames(
+        str(video_path), frame_stride=frame_stride, max_frames=max_frames
+    )
+    # Then
+    assert [video_frame.frame_index for video_frame in video_frames] == expected_indexes
+
+
+def test_generate_video_frames_incorrect_stride(video_path):
+    with pytest.raises(DfdError):
+        next(generate_video_frames(str(video_path), frame_stride=0))
+
+
+def test_convert_video_to_frames(video_path):
+    frames = convert_video_to_frames(str(video_path))
+    assert len(frames) == NO_VIDEO_FRAMES
+
+
+@pytest.mark.parametrize(
+    "exact, limit, expected_no_frames",
+    [(False, None, NO_VIDEO_FRAMES), (True, None, NO_VIDEO_FRAMES), (True, 4, 4)],
+)
+def test_count_video_frames(video_path, exact, limit, expected_no_frames):
+    assert count_video_frames(str(video_path), exact=exact, limit=limit) == expected_no_frames
@@ -0,0 +1,61 @@
+import pytest
+
+from dfd.datasets.dataset_index import IMAGE_SUFFIXES, DatasetIndex
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    for relative_path in ["reals/b.png", "reals/a.png", "fakes/nested/c.png", "other/d.png"]:
+        tmp_path.joinpath(relative_path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(relative_path).write_bytes(b"image")
+    return tmp_path
+
+
+def test_build_labeled_index(dataset_path):
+    # When
+    dataset_index = DatasetIndex.build(dataset_path, class_names=["reals", "fakes"])
+    # Then
+    assert dataset_index.file_paths == [
+        dataset_path / "reals/a.png",
+        dataset_path / "reals/b.png",
+        dataset_path / "fakes/nested/c.png",
+    ]
+    assert dataset_index.labels == [0, 0, 1]
+    assert (dataset_index.count(0), dataset_index.count(1)) == (2, 1)
+
+
+def test_build_not_recursive_index(dataset_path):
+    # Given
+    dataset_path.joinpath("e.png").write_bytes(b"image")
+    # When
+    dataset_index = DatasetIndex.build(dataset_path, recursive=False)
+    # Then
+    assert dataset_index.file_paths == [dataset_path / "e.png"]
+    assert dataset_index.labels is None
+
+
+def test_index_is_outdated_when_file_is_added(dataset_path):
+    # Given
+    dataset_index = DatasetIndex.build(dataset_path, class_names=["reals", "fakes"])
+    loaded_index = DatasetIndex.from_json(dataset_index.to_json())
+    assert loaded_index.is_up_to_date()
+    # When
+    dataset_path.joinpath("fakes/nested/f.png").write_bytes(b"image")
+    # Then
+    assert loaded_index.file_paths == dataset_index.file_paths
+    assert not loaded_index.is_up_to_date()
+
+
+def test_build_index_of_images_only(dataset_path):
+    # Given
+    dataset_path.joinpath("reals/.DS_Store").write_bytes(b"metadata")
+    dataset_path.joinpath("reals/manifest.json").write_text("{}")
+    dataset_path.joinpath("reals/e.PNG").write_bytes(b"image")
+    # When
+    dataset_index = DatasetIndex.build(dataset_path, class_names=["reals"], suffixes=IMAGE_SUFFIXES)
+    # Then
+    assert dataset_index.file_paths == [
+        dataset_path / "reals/a.png",
+        dataset_path / "reals/b.png",
+        dataset_path / "reals/e.PNG",
+    ]
@@ -0,0 +1,130 @@
+import threading
+import time
+from concurrent import futures
+
+import numpy as np
+import pytest
+
+from dfd.datasets import face_extractor as face_extractor_module
+from dfd.datasets.face_extractor import (
+    FaceExtractionEngine,
+    FaceExtractionModel,
+    FaceExtractor,
+    FaceLocation,
+)
+from dfd.datasets.face_location_cache import FaceLocationCache
+from dfd.exceptions import DfdError
+
+
+def test_dlib_batch_engine_requires_cnn():
+    with pytest.raises(DfdError):
+        FaceExtractor(FaceExtractionModel.HOG, batch_engine=FaceExtractionEngine.DLIB_BATCH)
+
+
+@pytest.mark.parametrize(
+    "face_location, expected_shape",
+    [
+        (None, (480, 640, 3)),
+        (FaceLocation(top=100, right=300, bottom=200, left=200), (256, 256, 3)),
+        (FaceLocation(top=0, right=40, bottom=30, left=0), (256, 256, 3)),
+        (FaceLocation(top=0, right=600, bottom=400, left=100), (400, 500, 3)),
+    ],
+)
+def test_crop(face_location, expected_shape):
+    # Given
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    face_extractor = FaceExtractor(FaceExtractionModel.HOG)
+    # When
+    face = face_extractor.crop(frame, face_location)
+    # Then
+    assert face.shape == expected_shape
+
+
+@pytest.mark.parametrize(
+    "batch_engine", [FaceExtractionEngine.THREAD_POOL, FaceExtractionEngine.PROCESS_POOL]
+)
+def test_locate_batch_with_pool(batch_engine):
+    # Given
+    frames_batch = [np.zeros((120, 160, 3), dtype=np.uint8) for _ in range(3)]
+    # When
+    with FaceExtractor(
+        FaceExtractionModel.HOG, batch_engine=batch_engine, workers=2
+    ) as face_extractor:
+        face_locations = face_extractor.locate_batch(frames_batch)
+    # Then
+    assert face_locations == [None, None, None]
+
+
+def test_locate_on_downscaled_frame(monkeypatch):
+    # Given
+    detected_frame_shapes = []
+
+    def locate_faces_stub(frame_in_rgb, model_name, number_of_times_to_upsample):
+        detected_frame_shapes.append(frame_in_rgb.shape)
+        return [(10, 60, 50, 20)]
+
+    monkeypatch.setattr(face_extractor_module, "_locate_faces", locate_faces_stub)
+    face_extractor = FaceExtractor(FaceExtractionModel.HOG, detection_scale=0.25)
+    # When
+    face_location = face_extractor.locate(np.zeros((480, 640, 3), dtype=np.uint8))
+    # Then
+    assert detected_frame_shapes == [(120, 160, 3)]
+    assert face_location == FaceLocation(top=40, right=240, bottom=200, left=80)
+
+
+@pytest.mark.parametrize("detection_scale", [0, -1, 1.5])
+def test_incorrect_detection_scale(detection_scale):
+    with pytest.raises(DfdError):
+        FaceExtractor(FaceExtractionModel.HOG, detection_scale=detection_scale)
+
+
+def test_locate_uses_cache(monkeypatch, tmp_path):
+    # Given
+    detected_frames = []
+
+    def locate_faces_stub(frame_in_rgb, model_name, number_of_times_to_upsample):
+        detected_frames.append(frame_in_rgb)
+        return [(10, 60, 50, 20)]
+
+    monkeypatch.setattr(face_extractor_module, "_locate_faces", locate_faces_stub)
+    frames = [np.full((48, 64, 3), value, dtype=np.uint8) for value in range(3)]
+    # When
+    with FaceLocationCache(tmp_path / "cache.sqlite") as cache:
+        face_extractor = FaceExtractor(
+            FaceExtractionModel.HOG, batch_engine=FaceExtractionEngine.THREAD_POOL, cache=cache
+        )
+        face_extractor.locate(frames[0])
+        face_locations = face_extractor.locate_batch(frames)
+        face_extractor.close()
+    # Then
+    assert len(detected_frames) == 3
+    assert face_locations == [FaceLocation(top=10, right=60, bottom=50, left=20)] * 3
+
+
+def test_pool_is_started_once_by_concurrent_threads(monkeypatch):
+    # Given
+    started_executors = []
+
+    class SlowStartingExecutor(futures.ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            time.sleep(0.05)
+            super().__init__(max_workers=max_workers)
+            started_executors.append(self)
+
+    monkeypatch.setattr(face_extractor_module.futures, "ThreadPoolExecutor", SlowStartingExecutor)
+    monkeypatch.setattr(face_extractor_module, "_locate_faces", lambda *args, **kwargs: [])
+    frames_batch = [np.zeros((48, 64, 3), dtype=np.uint8) for _ in range(2)]
+    # When
+    with FaceExtractor(
+        FaceExtractionModel.HOG, batch_engine=FaceExtractionEngine.THREAD_POOL, workers=2
+    ) as face_extractor:
+        request_threads = [
+            threading.Thread(target=face_extractor.locate_batch, args=(frames_batch,))
+            for _ in range(4)
+        ]
+        for request_thread in request_threads:
+            request_thread.start()
+        for request_thread in request_threads:
+            request_thread.join()
+    # Then
+    assert len(started_executors) == 1
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from dfd.datasets.face_location import FaceLocation
+from dfd.datasets.face_location_cache import CachedFaceLocation, FaceLocationCache
+
+FACE_LOCATION = FaceLocation(top=1, right=20, bottom=30, left=4)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "cache" / "faces.sqlite"
+
+
+@pytest.mark.parametrize("face_location", [FACE_LOCATION, None])
+def test_get_stored_face_location(cache_path, face_location):
+    with FaceLocationCache(cache_path) as cache:
+        cache.put("frame", "hog", face_location)
+        assert cache.get("frame", "hog") == CachedFaceLocation(face_location)
+
+
+def test_get_missing_face_location(cache_path):
+    with FaceLocationCache(cache_path) as cache:
+        cache.put("frame", "hog", FACE_LOCATION)
+        assert cache.get("frame", "cnn") is None
+        assert cache.get("other_frame", "hog") is None
+
+
+def test_face_locations_are_persisted(cache_path):
+    with FaceLocationCache(cache_path) as cache:
+        cache.put("frame", "hog", FACE_LOCATION)
+    with FaceLocationCache(cache_path) as cache:
+        assert cache.get("frame", "hog") == CachedFaceLocation(FACE_LOCATION)
+
+
+def test_hash_frame():
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    modified_frame = frame.copy()
+    modified_frame[0, 0, 0] = 1
+    assert FaceLocationCache.hash_frame(frame) == FaceLocationCache.hash_frame(frame.copy())
+    assert FaceLocationCache.hash_frame(frame) != FaceLocationCache.hash_frame(modified_frame)
+    assert FaceLocationCache.hash_frame(frame) != FaceLocationCache.hash_frame(
+        frame.reshape((6, 4, 3))
+    )
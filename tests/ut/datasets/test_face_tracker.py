@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from dfd.datasets.face_extractor import FaceLocation
+from dfd.datasets.face_tracker import FaceTracker
+
+FACE_SIZE = 40
+
+
+class FaceExtractorStub:
+    """Locate textured square placed on frame, count performed detections."""
+
+    def __init__(self):
+        self.no_detections = 0
+
+    def locate(self, frame):
+        self.no_detections += 1
+        rows, columns = np.nonzero(frame[:, :, 0])
+        if rows.size == 0:
+            return None
+        return FaceLocation(
+            top=rows.min(), right=columns.max() + 1, bottom=rows.max() + 1, left=columns.min()
+        )
+
+
+def _make_frame(top: int, left: int) -> np.ndarray:
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    texture = np.random.default_rng(0).integers(1, 255, (FACE_SIZE, FACE_SIZE, 3))
+    frame[top : top + FACE_SIZE, left : left + FACE_SIZE] = texture
+    return frame
+
+
+@pytest.fixture
+def face_extractor_stub():
+    return FaceExtractorStub()
+
+
+def test_face_is_tracked_between_keyframes(face_extractor_stub):
+    # Given
+    face_tracker = FaceTracker(face_extractor_stub, keyframe_interval=5)
+    frames = [_make_frame(top=20 + shift, left=30 + shift) for shift in range(10)]
+    # When
+    face_locations = [face_tracker.locate(frame) for frame in frames]
+    # Then
+    assert face_extractor_stub.no_detections == 2
+    assert face_locations == [
+        FaceLocation(top=20 + shift, right=70 + shift, bottom=60 + shift, left=30 + shift)
+        for shift in range(10)
+    ]
+
+
+def test_face_is_detected_on_scene_change(face_extractor_stub):
+    # Given
+    face_tracker = FaceTracker(face_extractor_stub, keyframe_interval=100)
+    frames = [_make_frame(top=20, left=30), np.full((120, 160, 3), 255, dtype=np.uint8)]
+    # When
+    for frame in frames:
+        face_tracker.locate(frame)
+    # Then
+    assert face_extractor_stub.no_detections == 2
+
+
+def test_reset(face_extractor_stub):
+    # Given
+    face_tracker = FaceTracker(face_extractor_stub, keyframe_interval=100)
+    frame = _make_frame(top=20, left=30)
+    # When
+    face_tracker.locate(frame)
+    face_tracker.reset()
+    face_tracker.locate(frame)
+    # Then
+    assert face_extractor_stub.no_detections == 2
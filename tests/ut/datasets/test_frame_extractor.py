@@ -0,0 +1,83 @@
+import pytest
+
+from dfd.datasets import FrameExtractor
+from dfd.datasets.manifest import PreprocessingManifest
+
+
+@pytest.fixture
+def videos_path(tmp_path, make_video):
+    videos_path = tmp_path / "videos"
+    videos_path.mkdir()
+    for video_name in ("a.avi", "b.avi", "c.avi"):
+        make_video(videos_path / video_name, no_frames=4)
+    return videos_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_extract_batch(tmp_path, videos_path, workers):
+    # Given
+    output_path = tmp_path / "frames"
+    output_path.mkdir()
+    frame_extractor = FrameExtractor(frame_stride=2, workers=workers)
+    # When
+    frame_extractor.extract_batch(videos_path, output_path, lower_bound=1)
+    # Then
+    assert sorted(path.name for path in output_path.iterdir()) == [
+        "b_0.png",
+        "b_2.png",
+        "c_0.png",
+        "c_2.png",
+    ]
+
+
+def test_generate_batch(videos_path):
+    # Given
+    frame_extractor = FrameExtractor(max_frames=3)
+    # When
+    extracted_frames = list(frame_extractor.generate_batch(videos_path, upper_bound=2))
+    # Then
+    assert [extracted_frame.name for extracted_frame in extracted_frames] == [
+        "a_0.png",
+        "a_1.png",
+        "a_2.png",
+        "b_0.png",
+        "b_1.png",
+        "b_2.png",
+    ]
+
+
+@pytest.mark.parametrize("exact", [False, True])
+@pytest.mark.parametrize(
+    "frame_stride, max_frames, expected_no_frames",
+    [(1, None, 12), (3, None, 6), (1, 1, 3), (3, 1, 3)],
+)
+def test_count_frames(videos_path, frame_stride, max_frames, expected_no_frames, exact):
+    frame_extractor = FrameExtractor(frame_stride=frame_stride, max_frames=max_frames)
+    assert frame_extractor.count_frames(videos_path, exact=exact) == expected_no_frames
+
+
+def test_extract_batch_skips_videos_recorded_in_manifest(tmp_path, videos_path, make_video):
+    # Given
+    output_path = tmp_path / "frames"
+    output_path.mkdir()
+    frame_extractor = FrameExtractor(max_frames=1)
+    with PreprocessingManifest(tmp_path / "manifest.sqlite") as manifest:
+        frame_extractor.extract_batch(videos_path, output_path, manifest=manifest)
+        output_path.joinpath("a_0.png").unlink()
+        make_video(videos_path / "d.avi", no_frames=4)
+        # When
+        frame_extractor.extract_batch(videos_path, output_path, manifest=manifest)
+    # Then
+    assert sorted(path.name for path in output_path.iterdir()) == ["b_0.png", "c_0.png", "d_0.png"]
+
+
+@pytest.mark.parametrize("frame_stride, max_frames", [(1, None), (3, None), (2, 1)])
+def test_list_frame_names(videos_path, frame_stride, max_frames):
+    # Given
+    frame_extractor = FrameExtractor(frame_stride=frame_stride, max_frames=max_frames)
+    # When
+    frame_names = frame_extractor.list_frame_names(sorted(videos_path.iterdir()))
+    # Then
+    assert frame_names == [
+        extracted_frame.name for extracted_frame in frame_extractor.generate_batch(videos_path)
+    ]
@@ -0,0 +1,57 @@
+import pytest
+
+from dfd.datasets.dataset_index import DatasetIndex
+from dfd.datasets.manifest import PreprocessingManifest
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with PreprocessingManifest(tmp_path / "manifest.sqlite") as manifest:
+        yield manifest
+
+
+def test_processed_items_are_not_pending(tmp_path, manifest):
+    # Given
+    first_item, second_item = tmp_path / "a.avi", tmp_path / "b.avi"
+    first_item.write_bytes(b"a")
+    second_item.write_bytes(b"b")
+    output_path = tmp_path / "output"
+    # When
+    manifest.put("stage", output_path, str(first_item), manifest.fingerprint(first_item), [])
+    pending_items = manifest.select_pending("stage", output_path, [first_item, second_item])
+    # Then
+    assert [pending_item.path for pending_item in pending_items] == [second_item]
+    assert manifest.select_pending("other-stage", output_path, [first_item]) != []
+    assert manifest.select_pending("stage", tmp_path / "other-output", [first_item]) != []
+
+
+def test_changed_item_is_pending_and_its_outputs_are_removed(tmp_path, manifest):
+    # Given
+    item, output = tmp_path / "a.avi", tmp_path / "a_0.png"
+    item.write_bytes(b"a")
+    output.write_bytes(b"frame")
+    manifest.put("stage", tmp_path, str(item), manifest.fingerprint(item), [str(output)])
+    # When
+    item.write_bytes(b"changed")
+    pending_items = manifest.select_pending("stage", tmp_path, [item])
+    # Then
+    assert [pending_item.path for pending_item in pending_items] == [item]
+    assert not output.exists()
+
+
+def test_saved_directory_index_is_reused_until_directory_changes(tmp_path, manifest, monkeypatch):
+    # Given
+    frames_path = tmp_path / "frames"
+    frames_path.mkdir()
+    frames_path.joinpath("a.png").write_bytes(b"a")
+    manifest.index_directory(frames_path)
+    build = DatasetIndex.build
+    monkeypatch.setattr(DatasetIndex, "build", pytest.fail)
+    # When
+    saved_index = manifest.index_directory(frames_path)
+    frames_path.joinpath("b.png").write_bytes(b"b")
+    monkeypatch.setattr(DatasetIndex, "build", build)
+    updated_index = manifest.index_directory(frames_path)
+    # Then
+    assert saved_index.file_paths == [frames_path / "a.png"]
+    assert updated_index.file_paths == [frames_path / "a.png", frames_path / "b.png"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from dfd.datasets.frames_generators.assignment import ModificationAssignment, assign_modifications
+
+
+def _assign_modifications_by_linear_scan(shares, frames_permutation):
+    no_frames = len(frames_permutation)
+    ranges = []
+    summed_share = 0.0
+    for share in shares:
+        ranges.append((int(summed_share * no_frames), int((summed_share + share) * no_frames) - 1))
+        summed_share += share
+    ranges.append((int(summed_share * no_frames), no_frames))
+    return [
+        next(
+            range_index
+            for range_index, (lower_bound, upper_bound) in enumerate(ranges)
+            if lower_bound <= permuted_index <= upper_bound
+        )
+        for permuted_index in frames_permutation
+    ]
+
+
+@pytest.mark.parametrize(
+    "shares, no_frames",
+    [([0.1, 0.2, 0.3], 100), ([0.5, 0.5], 7), ([0.0, 0.25, 0.0], 13), ([], 5), ([0.3], 0)],
+)
+def test_assign_modifications_is_equal_to_linear_scan(shares, no_frames):
+    # When
+    modification_indices = assign_modifications(shares, no_frames, np.random.default_rng(0))
+    # Then
+    frames_permutation = np.random.default_rng(0).permutation(no_frames)
+    assert modification_indices.tolist() == _assign_modifications_by_linear_scan(
+        shares, frames_permutation
+    )
+
+
+def test_assignment_is_saved_and_extended(tmp_path):
+    # Given
+    modification_names = ["gamma_correction_2.0", "identity"]
+    assignment = ModificationAssignment.create(
+        modification_names, [0.5], [f"{index}.png" for index in range(10)], seed=0
+    )
+    assignment.save(tmp_path / "assignment.npz")
+    # When
+    loaded_assignment = ModificationAssignment.load(tmp_path / "assignment.npz")
+    extended_assignment = loaded_assignment.extend(
+        [f"{index}.png" for index in range(14)], [0.5], seed=0
+    )
+    # Then
+    assert loaded_assignment.modification_names == modification_names
+    assert extended_assignment.frame_names == [f"{index}.png" for index in range(14)]
+    for index in range(10):
+        frame_name = f"{index}.png"
+        assert extended_assignment.get_modification_index(
+            frame_name
+        ) == assignment.get_modification_index(frame_name)
+    new_modification_indices = [
+        extended_assignment.get_modification_index(f"{index}.png") for index in range(10, 14)
+    ]
+    assert sorted(new_modification_indices) == [0, 0, 1, 1]
+    assert extended_assignment.get_modification_index("missing.png") is None
@@ -0,0 +1,301 @@
+import pathlib
+
+import cv2 as cv
+import numpy as np
+import pydantic
+import pytest
+
+from dfd.datasets.face_location import FaceLocation
+from dfd.datasets.frames_generators import ModificationAssignment, ModificationGenerator
+from dfd.datasets.modifications.definitions import HistogramEqualizationModification
+from dfd.datasets.settings import GeneratorSettings, ModificationOrder, ModificationSettings
+from dfd.exceptions import DfdError
+
+FACE_LOCATION = FaceLocation(top=2, right=12, bottom=12, left=2)
+
+
+def _make_input_frames(no_frames: int):
+    return [
+        (np.full((24, 32, 3), frame_index, dtype=np.uint8), pathlib.Path(f"{frame_index}.png"))
+        for frame_index in range(no_frames)
+    ]
+
+
+def test_face_is_located_once_per_frame_and_shared():
+    # Given
+    settings = GeneratorSettings(
+        modifications=[
+            ModificationSettings(
+                name="GammaCorrectionModification", share=0.5, options={"gamma_value": 2.0}
+            )
+        ]
+    )
+    modification_generator = ModificationGenerator(settings)
+    located_frames = []
+
+    def face_locator(frame):
+        located_frames.append(frame)
+        return FACE_LOCATION
+
+    input_frames = _make_input_frames(no_frames=4)
+    # When
+    modified_frames = list(
+        modification_generator.from_frames(input_frames, no_frames=4, face_locator=face_locator)
+    )
+    # Then
+    assert len(located_frames) == 4
+    for (input_frame, _), located_frame in zip(input_frames, located_frames):
+        assert located_frame is input_frame
+    for modified_frame in modified_frames:
+        assert modified_frame.face_detection.face_location == FACE_LOCATION
+
+
+def test_face_is_not_located_without_face_locator():
+    # Given
+    modification_generator = ModificationGenerator(GeneratorSettings(modifications=[]))
+    # When
+    modified_frames = list(
+        modification_generator.from_frames(_make_input_frames(no_frames=2), no_frames=2)
+    )
+    # Then
+    assert all(modified_frame.face_detection is None for modified_frame in modified_frames)
+
+
+def test_frames_are_modified_in_batches_and_yielded_in_order():
+    # Given
+    settings = GeneratorSettings(
+        modifications=[
+            ModificationSettings(name="HistogramEqualizationModification", share=0.5),
+        ]
+    )
+    input_frames = [
+        (
+            np.random.default_rng(frame_index).integers(0, 256, (24, 32, 3), dtype=np.uint8),
+            pathlib.Path(f"{frame_index}.png"),
+        )
+        for frame_index in range(7)
+    ]
+    # When
+    modified_frames = list(
+        ModificationGenerator(settings, batch_size=3).from_frames(input_frames, no_frames=7)
+    )
+    # Then
+    assert [modified_frame.original_path for modified_frame in modified_frames] == [
+        path for _, path in input_frames
+    ]
+    assert {modified_frame.modification_used for modified_frame in modified_frames} == {
+        "histogram_equalization",
+        "identity",
+    }
+    for modified_frame, (input_frame, _) in zip(modified_frames, input_frames):
+        expected_frame = input_frame
+        if modified_frame.modification_used == "histogram_equalization":
+            expected_frame = HistogramEqualizationModification().perform(input_frame)
+        np.testing.assert_array_equal(modified_frame.frame, expected_frame)
+
+
+def _generate_all(modification_generator, input_frames):
+    return list(modification_generator.from_frames(input_frames, no_frames=len(input_frames)))
+
+
+def test_parallel_generator_assigns_the_same_modifications_as_serial():
+    # Given
+    settings = GeneratorSettings(
+        modifications=[
+            ModificationSettings(name="HistogramEqualizationModification", share=0.3),
+            ModificationSettings(
+                name="GammaCorrectionModification", share=0.3, options={"gamma_value": 2.0}
+            ),
+        ]
+    )
+    input_frames = _make_input_frames(no_frames=23)
+    serial_generator = ModificationGenerator(settings, batch_size=4, seed=0)
+    parallel_generator = ModificationGenerator(
+        settings, batch_size=4, workers=3, prefetch=2, seed=0
+    )
+    # When
+    serial_frames = _generate_all(serial_generator, input_frames)
+    parallel_frames = _generate_all(parallel_generator, input_frames)
+    # Then
+    assert [frame.original_path for frame in parallel_frames] == [path for _, path in input_frames]
+    for serial_frame, parallel_frame in zip(serial_frames, parallel_frames):
+        assert parallel_frame.modification_used == serial_frame.modification_used
+        np.testing.assert_array_equal(parallel_frame.frame, serial_frame.frame)
+
+
+def test_parallel_generator_without_preserved_order_yields_all_frames():
+    # Given
+    input_frames = _make_input_frames(no_frames=10)
+    modification_generator = ModificationGenerator(
+        GeneratorSettings(modifications=[]), batch_size=3, workers=2, preserve_order=False
+    )
+    # When
+    modified_frames = _generate_all(modification_generator, input_frames)
+    # Then
+    assert sorted(frame.original_path.name for frame in modified_frames) == sorted(
+        path.name for _, path in input_frames
+    )
+
+
+def test_parallel_generator_loads_frames_from_paths(tmp_path):
+    # Given
+    frame_paths = []
+    for frame, path in _make_input_frames(no_frames=5):
+        frame_path = tmp_path.joinpath(path)
+        cv.imwrite(str(frame_path), frame)
+        frame_paths.append(frame_path)
+    modification_generator = ModificationGenerator(
+        GeneratorSettings(modifications=[]), batch_size=2, workers=2
+    )
+    # When
+    modified_frames = list(modification_generator.from_paths(frame_paths))
+    # Then
+    assert [frame.original_path for frame in modified_frames] == frame_paths
+    for frame_index, modified_frame in enumerate(modified_frames):
+        assert (modified_frame.frame == frame_index).all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_unreadable_frame_is_reported(tmp_path, workers):
+    # Given
+    tmp_path.joinpath("0.png").write_bytes(b"not an image")
+    modification_generator = ModificationGenerator(
+        GeneratorSettings(modifications=[]), workers=workers
+    )
+    # When & Then
+    with pytest.raises(DfdError):
+        list(modification_generator.from_paths([tmp_path / "0.png"]))
+
+
+def test_frames_are_modified_according_to_saved_assignment(tmp_path):
+    # Given
+    settings = GeneratorSettings(
+        modifications=[ModificationSettings(name="HistogramEqualizationModification", share=0.5)]
+    )
+    for frame, path in _make_input_frames(no_frames=6):
+        cv.imwrite(str(tmp_path.joinpath(path)), frame)
+    frame_names = sorted(path.name for path in tmp_path.iterdir())
+    ModificationGenerator(settings, seed=3).create_assignment(frame_names).save(
+        tmp_path.parent / "assignment.npz"
+    )
+    assignment = ModificationAssignment.load(tmp_path.parent / "assignment.npz")
+    # When
+    modified_frames = list(
+        ModificationGenerator(settings).from_directory(tmp_path, assignment=assignment)
+    )
+    # Then
+    assert [frame.original_path.name for frame in modified_frames] == frame_names
+    modification_names = assignment.modification_names
+    for modified_frame in modified_frames:
+        modification_index = assignment.get_modification_index(modified_frame.original_path.name)
+        assert modified_frame.modification_used == modification_names[modification_index]
+    assert sum(frame.modification_used != "identity" for frame in modified_frames) == 3
+
+
+def test_assignment_of_different_modifications_is_rejected():
+    # Given
+    assignment = ModificationGenerator(GeneratorSettings(modifications=[])).create_assignment(
+        ["0.png"]
+    )
+    settings = GeneratorSettings(
+        modifications=[ModificationSettings(name="HistogramEqualizationModification", share=0.5)]
+    )
+    # When & Then
+    with pytest.raises(DfdError):
+        list(
+            ModificationGenerator(settings).from_frames(
+                _make_input_frames(no_frames=1), no_frames=1, assignment=assignment
+            )
+        )
+
+
+def test_fanned_out_modifications_share_single_face_detection():
+    # Given
+    settings = GeneratorSettings(
+        fan_out=True,
+        modifications=[
+            ModificationSettings(name="GammaCorrectionModification", options={"gamma_value": 0.6}),
+            ModificationSettings(name="GammaCorrectionModification", options={"gamma_value": 1.4}),
+            ModificationSettings(name="MedianFilterModification", options={"aperture_size": 3}),
+        ],
+    )
+    modification_generator = ModificationGenerator(settings, batch_size=2)
+    located_frames = []
+
+    def face_locator(frame):
+        located_frames.append(frame)
+        return FACE_LOCATION
+
+    input_frames = _make_input_frames(no_frames=3)
+    # When
+    modified_frames = list(
+        modification_generator.from_frames(input_frames, no_frames=3, face_locator=face_locator)
+    )
+    # Then
+    assert len(located_frames) == 3
+    assert modification_generator.no_variants_per_frame == 3
+    assert [(frame.original_path.name, frame.modification_used) for frame in modified_frames] == [
+        (path.name, modification_used)
+        for _, path in input_frames
+        for modification_used in ("gamma_correction_0.6", "gamma_correction_1.4", "median_filter_3")
+    ]
+    assert all(frame.face_detection.face_location == FACE_LOCATION for frame in modified_frames)
+
+
+def test_shares_are_required_unless_modifications_are_fanned_out():
+    # When & Then
+    with pytest.raises(pydantic.ValidationError):
+        GeneratorSettings(modifications=[ModificationSettings(name="CLAHEModification")])
+
+
+def _get_crop_location(frame_shape, face_location):
+    return FaceLocation(top=0, right=40, bottom=40, left=0)
+
+
+@pytest.mark.parametrize(
+    "order, expected_modifications_cropped_first",
+    [
+        (
+            ModificationOrder.MODIFY_THEN_CROP,
+            {"median_filter_5": False, "histogram_equalization": False},
+        ),
+        (
+            ModificationOrder.CROP_THEN_MODIFY,
+            {"median_filter_5": True, "histogram_equalization": False},
+        ),
+    ],
+)
+def test_face_is_cropped_before_modification_according_to_order(
+    order, expected_modifications_cropped_first
+):
+    # Given
+    settings = GeneratorSettings(
+        fan_out=True,
+        order=order,
+        crop_margin=4,
+        modifications=[
+            ModificationSettings(name="MedianFilterModification", options={"aperture_size": 5}),
+            ModificationSettings(name="HistogramEqualizationModification"),
+        ],
+    )
+    frame = np.random.default_rng(0).integers(0, 256, (80, 96, 3), dtype=np.uint8)
+    # When
+    modified_frames = list(
+        ModificationGenerator(settings).from_frames(
+            [(frame, pathlib.Path("0.png"))],
+            no_frames=1,
+            face_locator=lambda frame: FACE_LOCATION,
+            crop_locator=_get_crop_location,
+        )
+    )
+    # Then
+    for modified_frame in modified_frames:
+        modification_used = modified_frame.modification_used
+        assert modified_frame.is_cropped == expected_modifications_cropped_first[modification_used]
+    median_filtered_frame = modified_frames[0]
+    if median_filtered_frame.is_cropped:
+        # Median filter sees the same neighbourhood thanks to margin
+        np.testing.assert_array_equal(
+            median_filtered_frame.frame, cv.medianBlur(frame, 5)[0:40, 0:40]
+        )
+        assert median_filtered_frame.face_detection.face_location == FACE_LOCATION
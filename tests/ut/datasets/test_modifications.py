@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from dfd.datasets.modifications.definitions import (
+    CLAHEModification,
+    GammaCorrectionModification,
+    GaussianBlurModification,
+    GaussianNoiseModification,
+    HistogramEqualizationModification,
+    IdentityModification,
+    MedianFilterModification,
+)
+
+
+@pytest.fixture
+def images():
+    return np.random.default_rng(0).integers(0, 256, (4, 24, 32, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize(
+    "modification",
+    [
+        CLAHEModification(clip_limit=2.0, grid_width=8, grid_height=8),
+        GammaCorrectionModification(gamma_value=0.5),
+        GaussianBlurModification(kernel_width=9, kernel_height=9),
+        HistogramEqualizationModification(),
+        IdentityModification(),
+        MedianFilterModification(aperture_size=3),
+    ],
+    ids=lambda modification: modification.name(),
+)
+def test_perform_batch_is_equal_to_perform(images, modification):
+    # When
+    modified_images = modification.perform_batch(images)
+    # Then
+    expected_images = np.stack([modification.perform(image) for image in images])
+    np.testing.assert_array_equal(modified_images, expected_images)
+
+
+def test_perform_batch_adds_noise(images):
+    # Given
+    modification = GaussianNoiseModification(standard_deviation=5.0)
+    # When
+    modified_images = modification.perform_batch(images)
+    # Then
+    assert modified_images.shape == images.shape
+    assert modified_images.dtype == np.uint8
+    assert not np.array_equal(modified_images, images)
+
+
+def test_gaussian_noise_saturates():
+    # Given
+    images = np.stack([np.zeros((8, 8, 3), np.uint8), np.full((8, 8, 3), 255, np.uint8)])
+    modification = GaussianNoiseModification(mean=0.0, standard_deviation=50.0, seed=0)
+    # When
+    modified_images = modification.perform_batch(images)
+    # Then
+    assert modified_images[0].max() > 0 and modified_images[0].min() == 0
+    assert modified_images[1].min() < 255 and modified_images[1].max() == 255
+
+
+def test_gaussian_noise_is_reproducible_with_seed(images):
+    # When
+    first_images = GaussianNoiseModification(standard_deviation=5.0, seed=1).perform_batch(images)
+    second_images = GaussianNoiseModification(standard_deviation=5.0, seed=1).perform_batch(images)
+    # Then
+    np.testing.assert_array_equal(first_images, second_images)
@@ -0,0 +1,52 @@
+import pathlib
+
+import cv2 as cv
+import numpy as np
+import pytest
+
+from dfd.datasets.packed import PackedDataset, pack_directory
+from dfd.exceptions import DfdError
+
+
+def _write_image(path, value: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cv.imwrite(str(path), np.full((10, 20, 3), value, dtype=np.uint8))
+
+
+def test_pack_labeled_directory(tmp_path):
+    # Given
+    input_path, output_path = tmp_path / "faces", tmp_path / "packed"
+    _write_image(input_path / "reals" / "a.png", 10)
+    _write_image(input_path / "reals" / "b.png", 20)
+    _write_image(input_path / "fakes" / "c.png", 30)
+    # When
+    pack_directory(input_path, output_path, image_size=(8, 6), seed=0)
+    packed_dataset = PackedDataset.open(output_path)
+    # Then
+    assert packed_dataset.images.shape == (3, 8, 6, 3)
+    assert packed_dataset.images.dtype == np.uint8
+    expected_labels = {"a.png": 0, "b.png": 0, "c.png": 1}
+    expected_values = {"a.png": 10, "b.png": 20, "c.png": 30}
+    for image, label, file_path in zip(
+        packed_dataset.images, packed_dataset.labels, packed_dataset.file_paths
+    ):
+        file_name = pathlib.Path(file_path).name
+        assert label == expected_labels[file_name]
+        assert np.all(image == expected_values[file_name])
+
+
+def test_pack_unlabeled_directory(tmp_path):
+    # Given
+    input_path, output_path = tmp_path / "sample", tmp_path / "packed"
+    _write_image(input_path / "a.png", 10)
+    # When
+    pack_directory(input_path, output_path, image_size=(8, 6))
+    packed_dataset = PackedDataset.open(output_path)
+    # Then
+    assert packed_dataset.labels is None
+    assert packed_dataset.file_paths == [str(input_path / "a.png")]
+
+
+def test_open_not_packed_directory(tmp_path):
+    with pytest.raises(DfdError):
+        PackedDataset.open(tmp_path)
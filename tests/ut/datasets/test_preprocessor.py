@@ -0,0 +1,142 @@
+import cv2 as cv
+import numpy as np
+
+from dfd.datasets import FrameExtractor, preprocess_fakes, preprocess_reals
+from dfd.datasets.frames_generators import ModificationAssignment, ModificationGenerator
+from dfd.datasets.manifest import PreprocessingManifest
+from dfd.datasets.preprocessor import FACES_STAGE, modify_frames
+from dfd.datasets.settings import GeneratorSettings, ModificationSettings
+
+
+class FaceExtractorStub:
+    """Return frames unchanged, count processed frames."""
+
+    def __init__(self):
+        self.no_extracted_faces = 0
+
+    def extract(self, frame):
+        self.no_extracted_faces += 1
+        return frame
+
+    def locate(self, frame):
+        return None
+
+    def get_crop_location(self, frame_shape, face_location):
+        return face_location
+
+    def crop(self, frame, face_location):
+        self.no_extracted_faces += 1
+        return frame
+
+
+def test_preprocess_fakes_in_memory_resumes_from_manifest(tmp_path, make_video):
+    # Given
+    input_path, output_path = tmp_path / "videos", tmp_path / "faces"
+    input_path.mkdir()
+    output_path.mkdir()
+    make_video(input_path / "a.avi", no_frames=3)
+    frame_extractor = FrameExtractor()
+    face_extractor = FaceExtractorStub()
+    with PreprocessingManifest(tmp_path / "manifest.sqlite") as manifest:
+        preprocess_fakes(
+            frame_extractor, face_extractor, input_path, None, output_path, manifest=manifest
+        )
+        make_video(input_path / "b.avi", no_frames=2)
+        # When
+        preprocess_fakes(
+            frame_extractor, face_extractor, input_path, None, output_path, manifest=manifest
+        )
+    # Then
+    assert face_extractor.no_extracted_faces == 5
+    assert sorted(path.name for path in output_path.iterdir()) == [
+        "a_0.png",
+        "a_1.png",
+        "a_2.png",
+        "b_0.png",
+        "b_1.png",
+    ]
+
+
+def test_video_without_frames_is_recorded_in_manifest(tmp_path, make_video):
+    # Given
+    input_path, output_path = tmp_path / "videos", tmp_path / "faces"
+    input_path.mkdir()
+    output_path.mkdir()
+    make_video(input_path / "a.avi", no_frames=2)
+    input_path.joinpath("b.avi").write_bytes(b"not a video")
+    with PreprocessingManifest(tmp_path / "manifest.sqlite") as manifest:
+        preprocess_fakes(
+            FrameExtractor(), FaceExtractorStub(), input_path, None, output_path, manifest=manifest
+        )
+        # When
+        pending_items = manifest.select_pending(
+            FACES_STAGE, output_path, sorted(input_path.iterdir())
+        )
+    # Then
+    assert pending_items == []
+
+
+def test_modify_frames_keeps_assignment_of_frames_between_runs(tmp_path):
+    # Given
+    input_path, output_path = tmp_path / "frames", tmp_path / "faces"
+    input_path.mkdir()
+    for frame_index in range(6):
+        cv.imwrite(str(input_path / f"{frame_index}.png"), np.zeros((8, 8, 3), dtype=np.uint8))
+    settings = GeneratorSettings(
+        modifications=[ModificationSettings(name="HistogramEqualizationModification", share=0.5)]
+    )
+    modify_frames(FaceExtractorStub(), ModificationGenerator(settings), input_path, output_path)
+    assignment_path = tmp_path / "faces.modifications.npz"
+    first_assignment = ModificationAssignment.load(assignment_path)
+    cv.imwrite(str(input_path / "6.png"), np.zeros((8, 8, 3), dtype=np.uint8))
+    # When
+    modify_frames(FaceExtractorStub(), ModificationGenerator(settings), input_path, output_path)
+    # Then
+    second_assignment = ModificationAssignment.load(assignment_path)
+    assert second_assignment.frame_names == first_assignment.frame_names + ["6.png"]
+    for frame_name in first_assignment.frame_names:
+        modification_index = first_assignment.get_modification_index(frame_name)
+        assert second_assignment.get_modification_index(frame_name) == modification_index
+        modification_name = first_assignment.modification_names[modification_index]
+        assert output_path.joinpath(modification_name, frame_name).is_file()
+
+
+def test_preprocess_reals_in_memory_keeps_assignment_of_frames_between_runs(tmp_path, make_video):
+    # Given
+    input_path, output_path = tmp_path / "videos", tmp_path / "faces"
+    input_path.mkdir()
+    make_video(input_path / "a.avi", no_frames=4)
+    settings = GeneratorSettings(
+        modifications=[ModificationSettings(name="HistogramEqualizationModification", share=0.5)]
+    )
+    assignment_path = tmp_path / "faces.modifications.npz"
+    with PreprocessingManifest(tmp_path / "manifest.sqlite") as manifest:
+        preprocess_reals(
+            FrameExtractor(),
+            FaceExtractorStub(),
+            ModificationGenerator(settings),
+            input_path,
+            None,
+            output_path,
+            manifest=manifest,
+        )
+        first_assignment = ModificationAssignment.load(assignment_path)
+        make_video(input_path / "b.avi", no_frames=2)
+        # When
+        preprocess_reals(
+            FrameExtractor(),
+            FaceExtractorStub(),
+            ModificationGenerator(settings),
+            input_path,
+            None,
+            output_path,
+            manifest=manifest,
+        )
+    # Then
+    second_assignment = ModificationAssignment.load(assignment_path)
+    assert first_assignment.frame_names == ["a_0.png", "a_1.png", "a_2.png", "a_3.png"]
+    assert second_assignment.frame_names == first_assignment.frame_names + ["b_0.png", "b_1.png"]
+    for frame_name in second_assignment.frame_names:
+        modification_index = second_assignment.get_modification_index(frame_name)
+        modification_name = second_assignment.modification_names[modification_index]
+        assert output_path.joinpath(modification_name, frame_name).is_file()
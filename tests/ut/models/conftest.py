@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from dfd.models.implementation.meso_net import MesoNet
+
+
+@pytest.fixture
+def make_meso_net():
+    def _make_meso_net(negative_scale: bool = False):
+        """Build MesoNet with random batch normalization statistics."""
+        # Weights are initialized the same way each time, so quantization error is stable
+        keras.utils.set_random_seed(0)
+        model = MesoNet()
+        random_generator = np.random.default_rng(0)
+        for layer in model._model.layers:
+            if isinstance(layer, layers.BatchNormalization):
+                no_channels = layer.get_weights()[0].shape[0]
+                gamma = random_generator.uniform(0.5, 1.5, no_channels)
+                if negative_scale:
+                    gamma[0] = -gamma[0]
+                layer.set_weights(
+                    [
+                        gamma,
+                        random_generator.normal(0, 0.1, no_channels),
+                        random_generator.normal(0, 0.1, no_channels),
+                        random_generator.uniform(0.5, 2, no_channels),
+                    ]
+                )
+        return model
+
+    return _make_meso_net
+
+
+@pytest.fixture(scope="module")
+def faces():
+    return np.random.default_rng(1).integers(0, 256, (4, 256, 256, 3), dtype=np.uint8)
@@ -0,0 +1,84 @@
+import cv2 as cv
+import numpy as np
+import pytest
+
+from dfd.exceptions import DfdError
+from dfd.models import ModelRegistry
+from dfd.models.implementation.export import (
+    ExportFormat,
+    Quantization,
+    build_inference_module,
+    compare_models,
+    fold_batch_normalization,
+)
+from dfd.models.implementation.exported_meso_net import ExportedMesoNet
+
+
+@pytest.mark.parametrize("negative_scale", [False, True])
+def test_fold_batch_normalization(make_meso_net, faces, negative_scale):
+    # Given
+    model = make_meso_net(negative_scale)
+    # When
+    operations = fold_batch_normalization(model._model)
+    # Then
+    assert len(operations) < len(model._model.layers)
+    folded_confidences = build_inference_module(operations).predict(faces.astype(np.float32))
+    np.testing.assert_allclose(np.ravel(folded_confidences), model.predict_arrays(faces), atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "export_format, quantization, tolerance",
+    [
+        (ExportFormat.SAVED_MODEL, Quantization.NONE, 1e-5),
+        (ExportFormat.TFLITE, Quantization.NONE, 1e-5),
+        (ExportFormat.TFLITE, Quantization.FLOAT16, 1e-2),
+        (ExportFormat.TFLITE, Quantization.INT8, 0.2),
+    ],
+)
+def test_export_and_load(tmp_path, make_meso_net, faces, export_format, quantization, tolerance):
+    # Given
+    model = make_meso_net()
+    # When
+    exported_path = model.export(
+        tmp_path / "exported", export_format, quantization, calibration_faces=lambda: faces
+    )
+    exported_model = (
+        ModelRegistry.default().get_model_class("meso_net_exported").load(exported_path)
+    )
+    # Then
+    assert isinstance(exported_model, ExportedMesoNet)
+    np.testing.assert_allclose(
+        exported_model.predict_arrays(faces), model.predict_arrays(faces), atol=tolerance
+    )
+    # Batch size can change between calls
+    assert exported_model.predict_arrays(faces[:1]).shape == (1,)
+
+
+def test_quantization_requires_tflite(tmp_path, make_meso_net):
+    with pytest.raises(DfdError):
+        make_meso_net().export(tmp_path / "exported", ExportFormat.SAVED_MODEL, Quantization.INT8)
+
+
+def test_exported_model_predicts_and_tests(tmp_path, make_meso_net, faces):
+    # Given
+    model = make_meso_net()
+    for class_name, class_faces in [("reals", faces[:2]), ("fakes", faces[2:])]:
+        tmp_path.joinpath("dataset", class_name).mkdir(parents=True)
+        for face_index, face in enumerate(class_faces):
+            cv.imwrite(
+                str(tmp_path / "dataset" / class_name / f"{face_index}.png"), face[..., ::-1]
+            )
+    exported_model = ExportedMesoNet.load(model.export(tmp_path / "exported"))
+    # When
+    predictions = exported_model.predict(tmp_path / "dataset")
+    metrics = exported_model.test(tmp_path / "dataset")
+    comparison = compare_models(model, exported_model, faces, [0, 0, 1, 1], no_latency_runs=2)
+    # Then
+    assert len(predictions) == 4
+    assert set(metrics) == set(exported_model.get_available_metrics_names())
+    assert metrics["true_positives"] + metrics["false_negatives"] == 2
+    assert comparison["max_confidence_difference"] < 1e-5
+    assert comparison["accuracy_delta"] == 0
+    assert comparison["exported_latency_ms"] > 0
+    with pytest.raises(DfdError):
+        exported_model.train(tmp_path / "dataset", tmp_path / "dataset")
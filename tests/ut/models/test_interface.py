@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from dfd.exceptions import DfdError
+from dfd.models import ModelInterface
+from dfd.models.stubs import ModelStub
+
+
+class RecordingModelStub(ModelStub):
+    """Record scored batches, confidence of face equals its first pixel divided by 255."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_arrays(self, faces):
+        self.batches.append(faces)
+        return faces[:, 0, 0, 0] / 255
+
+
+def test_predict_iter():
+    # Given
+    model = RecordingModelStub()
+    faces = (np.full((4, 4, 3), value, dtype=np.uint8) for value in range(0, 255, 51))
+    # When
+    confidences = list(model.predict_iter(faces, batch_size=2))
+    # Then
+    assert confidences == pytest.approx([0, 0.2, 0.4, 0.6, 0.8])
+    assert [len(batch) for batch in model.batches] == [2, 2, 1]
+    # All batches are views of single input buffer
+    assert all(np.shares_memory(batch, model.batches[0]) for batch in model.batches)
+
+
+def test_predict_iter_without_faces():
+    assert list(RecordingModelStub().predict_iter([])) == []
+
+
+def test_predict_iter_faces_of_different_shapes():
+    faces = [np.zeros((4, 4, 3)), np.zeros((2, 2, 3))]
+    with pytest.raises(DfdError):
+        list(RecordingModelStub().predict_iter(faces))
+
+
+class LegacyModelStub(ModelInterface):
+    """Model of plugin written before in-memory prediction was added."""
+
+    def train(self, train_ds_path, validation_ds_path, settings=None):
+        return None
+
+    def test(self, test_ds_path):
+        return {}
+
+    def predict(self, sample_path):
+        return {}
+
+    def save(self, path):
+        return None
+
+    @classmethod
+    def load(cls, path):
+        return cls()
+
+    def get_available_metrics_names(self):
+        return []
+
+
+def test_model_without_in_memory_prediction():
+    # Given
+    model = LegacyModelStub()
+    # When, Then
+    with pytest.raises(DfdError, match="LegacyModelStub"):
+        list(model.predict_iter([np.zeros((4, 4, 3))]))
@@ -0,0 +1,83 @@
+import cv2 as cv
+import numpy as np
+import pytest
+
+from dfd.datasets.dataset_index import DatasetIndex
+from dfd.datasets.packed import DEFAULT_CLASS_NAMES, pack_directory
+from dfd.exceptions import DfdError
+from dfd.models import CacheMode
+from dfd.models.implementation.meso_net import MesoNet, _load_images_dataset
+from dfd.models.interface import Prediction
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    random_generator = np.random.default_rng(0)
+    for class_name, no_images in [("reals", 3), ("fakes", 2)]:
+        tmp_path.joinpath(class_name).mkdir()
+        for image_index in range(no_images):
+            image = random_generator.integers(0, 256, (64, 48, 3), dtype=np.uint8)
+            cv.imwrite(str(tmp_path / class_name / f"{image_index}.png"), image)
+    return tmp_path
+
+
+@pytest.mark.parametrize("cache", list(CacheMode))
+def test_load_images_dataset(tmp_path, dataset_path, cache):
+    # Given
+    dataset_index = DatasetIndex.build(dataset_path, DEFAULT_CLASS_NAMES)
+    dataset = _load_images_dataset(
+        dataset_index.file_paths,
+        dataset_index.labels,
+        batch_size=2,
+        shuffle=True,
+        cache=cache,
+        cache_path=tmp_path / "cache",
+    )
+    # When
+    for _ in range(2):
+        batches = list(dataset.as_numpy_iterator())
+    # Then
+    assert [len(batch_images) for batch_images, _ in batches] == [2, 2, 1]
+    assert all(batch_images.shape[1:] == (256, 256, 3) for batch_images, _ in batches)
+    assert all(batch_images.dtype == np.float32 for batch_images, _ in batches)
+    dataset_labels = np.concatenate([batch_labels for _, batch_labels in batches]).ravel()
+    assert sorted(dataset_labels) == [0, 0, 0, 1, 1]
+
+
+def test_disk_cache_requires_path(dataset_path):
+    dataset_index = DatasetIndex.build(dataset_path, DEFAULT_CLASS_NAMES)
+    with pytest.raises(DfdError):
+        _load_images_dataset(
+            dataset_index.file_paths, dataset_index.labels, batch_size=2, cache=CacheMode.DISK
+        )
+
+
+def test_predict_arrays():
+    # Given
+    model = MesoNet()
+    faces = np.random.default_rng(0).integers(0, 256, (3, 256, 256, 3), dtype=np.uint8)
+    # When
+    confidences = model.predict_arrays(faces)
+    # Then
+    assert confidences.shape == (3,)
+    assert np.all((confidences >= 0) & (confidences <= 1))
+    np.testing.assert_allclose(
+        model.predict_arrays(faces.astype(np.float32)), confidences, atol=1e-6
+    )
+    np.testing.assert_allclose(
+        list(model.predict_iter(faces, batch_size=2)), confidences, atol=1e-6
+    )
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_predict(tmp_path, dataset_path, packed):
+    # Given
+    sample_path = dataset_path / "reals"
+    if packed:
+        sample_path = tmp_path / "packed"
+        pack_directory(dataset_path / "reals", sample_path)
+    # When
+    predictions = MesoNet().predict(sample_path)
+    # Then
+    assert len(predictions) == 3
+    assert all(isinstance(prediction, Prediction) for prediction in predictions.values())
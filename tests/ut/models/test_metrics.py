@@ -0,0 +1,17 @@
+import pytest
+
+from dfd.models.metrics import BINARY_METRICS_NAMES, compute_binary_metrics
+
+
+def test_compute_binary_metrics():
+    # When
+    metrics = compute_binary_metrics([0, 0, 1, 1, 1], [0.1, 0.6, 0.4, 0.8, 0.6])
+    # Then
+    assert list(metrics) == BINARY_METRICS_NAMES
+    assert metrics["binary_accuracy"] == pytest.approx(0.6)
+    assert metrics["precision"] == pytest.approx(2 / 3)
+    assert metrics["recall"] == pytest.approx(2 / 3)
+    # Fake is ranked above real in 4 of 6 pairs, tie counts as half
+    assert metrics["auc"] == pytest.approx(4.5 / 6)
+    assert metrics["true_positives"] == 2
+    assert metrics["false_negatives"] == 1
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from dfd.exceptions import DfdError
+from dfd.models import ModelRegistry
+from dfd.models.implementation.export import ExportFormat
+from dfd.models.implementation.opencv_meso_net import OpenCvMesoNet
+
+
+@pytest.mark.parametrize("negative_scale", [False, True])
+def test_predictions_match_keras(tmp_path, make_meso_net, faces, negative_scale):
+    # Given
+    model = make_meso_net(negative_scale)
+    exported_path = model.export(tmp_path / "exported", ExportFormat.FROZEN_GRAPH)
+    # When
+    opencv_model = ModelRegistry.default().load_model("meso_net_opencv", exported_path, 2)
+    # Then
+    assert isinstance(opencv_model, OpenCvMesoNet)
+    np.testing.assert_allclose(
+        opencv_model.predict_arrays(faces), model.predict_arrays(faces), atol=1e-4
+    )
+    np.testing.assert_allclose(
+        list(opencv_model.predict_iter(faces, batch_size=3)),
+        model.predict_arrays(faces),
+        atol=1e-4,
+    )
+
+
+def test_load_does_not_import_tensorflow(tmp_path, make_meso_net, faces):
+    # Given
+    exported_path = make_meso_net().export(tmp_path / "exported", ExportFormat.FROZEN_GRAPH)
+    code = (
+        "import sys, pathlib; import numpy as np; "
+        "from dfd.models import ModelRegistry; "
+        "model_class = ModelRegistry.default().get_model_class('meso_net_opencv'); "
+        f"model = model_class.load(pathlib.Path({str(exported_path)!r}), num_threads=1); "
+        "model.predict_arrays(np.zeros((2, 256, 256, 3), dtype=np.uint8)); "
+        "assert 'tensorflow' not in sys.modules"
+    )
+    # When
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    # Then
+    assert result.returncode == 0, result.stderr
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(DfdError):
+        OpenCvMesoNet.load(tmp_path / "model.h5")
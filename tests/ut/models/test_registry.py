@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from types import MappingProxyType
 
 import pytest
@@ -22,3 +24,51 @@ def test_not_registered_model():
     registry = ModelRegistry(REGISTERED_MODELS)
     with pytest.raises(DfdError):
         registry.get_model_class("non_existing_class")
+
+
+def test_get_model_registered_by_reference():
+    # Given
+    registry = ModelRegistry(MappingProxyType({"stub": "dfd.models.stubs:ModelStub"}))
+    # When
+    actual_model_class = registry.get_model_class("stub")
+    # Then
+    assert actual_model_class is ModelStub
+
+
+def test_default_registry_does_not_import_models():
+    # Given
+    code = (
+        "import sys; from dfd.models import ModelRegistry; "
+        "assert ModelRegistry.default().names() == "
+        "['meso_net', 'meso_net_exported', 'meso_net_opencv']; "
+        "assert 'tensorflow' not in sys.modules"
+    )
+    # When
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    # Then
+    assert result.returncode == 0, result.stderr
+
+
+class ThreadedModelStub(ModelStub):
+    def __init__(self, num_threads=None):
+        self.num_threads = num_threads
+
+    @classmethod
+    def load(cls, path, num_threads=None):
+        return cls(num_threads)
+
+
+def test_load_model_with_threads(tmp_path):
+    # Given
+    registry = ModelRegistry(MappingProxyType({"stub": ThreadedModelStub}))
+    # When
+    model = registry.load_model("stub", tmp_path, num_threads=2)
+    # Then
+    assert model.num_threads == 2
+
+
+def test_load_model_not_supporting_threads(tmp_path):
+    registry = ModelRegistry(REGISTERED_MODELS)
+    assert isinstance(registry.load_model("stub", tmp_path), ModelStub)
+    with pytest.raises(DfdError):
+        registry.load_model("stub", tmp_path, num_threads=2)
@@ -0,0 +1,123 @@
+import math
+
+import pytest
+
+from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.datasets.face_location import FaceLocation
+from dfd.exceptions import DfdError
+from dfd.models.interface import Prediction
+from dfd.models.stubs import ModelStub
+from dfd.models.video import (
+    Aggregation,
+    VideoPredictionSettings,
+    VideoPredictor,
+    aggregate_confidences,
+)
+
+
+class FaceExtractorStub(FaceExtractor):
+    """Find face in the same place on each frame, except fully black frames."""
+
+    def locate_batch(self, frames_batch):
+        return [
+            FaceLocation(top=2, right=20, bottom=20, left=2) if frame.any() else None
+            for frame in frames_batch
+        ]
+
+
+class BrightnessModelStub(ModelStub):
+    """Bright faces are fake."""
+
+    def __init__(self):
+        self.scored_batches = []
+
+    def predict_arrays(self, faces):
+        assert faces.shape[1:] == (256, 256, 3)
+        self.scored_batches.append(len(faces))
+        return faces.mean(axis=(1, 2, 3)) / 255
+
+
+# Frames are larger than model input, so faces are cropped without being resized
+VIDEO_FRAME_SHAPE = (288, 320, 3)
+
+
+@pytest.fixture
+def face_extractor():
+    return FaceExtractorStub(FaceExtractionModel.HOG)
+
+
+@pytest.mark.parametrize(
+    "aggregation, expected_score",
+    [
+        (Aggregation.MEAN, 0.38),
+        (Aggregation.TRIMMED_MEAN, 0.3),
+        (Aggregation.VOTE, 0.2),
+    ],
+)
+def test_aggregate_confidences(aggregation, expected_score):
+    # Given
+    confidences = [0.0, 0.2, 0.3, 0.4, 1.0]
+    # When
+    score, standard_error = aggregate_confidences(confidences, aggregation, trim_share=0.2)
+    # Then
+    assert score == pytest.approx(expected_score)
+    assert 0 < standard_error < math.inf
+
+
+def test_vote_uses_threshold():
+    # Given
+    confidences = [0.0, 0.2, 0.6, 0.8, 1.0]
+    # When
+    score, _ = aggregate_confidences(confidences, Aggregation.VOTE, threshold=0.7)
+    # Then
+    assert score == pytest.approx(0.4)
+
+
+def test_aggregate_no_confidences():
+    with pytest.raises(DfdError):
+        aggregate_confidences([], Aggregation.MEAN)
+
+
+def test_predict_whole_video(tmp_path, make_video, face_extractor):
+    # Given
+    # Brightness of frames grows from 0 to 180, first frame is black and has no face
+    video_path = make_video(tmp_path / "video.avi", no_frames=10, frame_shape=VIDEO_FRAME_SHAPE)
+    model = BrightnessModelStub()
+    settings = VideoPredictionSettings(
+        frame_stride=2, batch_size=2, aggregation=Aggregation.MEAN, early_stop_z=None
+    )
+    # When
+    verdict = VideoPredictor(model, face_extractor, settings).predict(video_path)
+    # Then
+    assert verdict.prediction == Prediction.REAL
+    assert verdict.no_sampled_frames == 5
+    assert verdict.no_scored_frames == 4
+    assert not verdict.stopped_early
+    assert model.scored_batches == [1, 2, 1]
+
+
+def test_predict_stops_early(tmp_path, make_video, face_extractor):
+    # Given
+    video_path = make_video(tmp_path / "video.avi", no_frames=10, frame_shape=VIDEO_FRAME_SHAPE)
+    model = BrightnessModelStub()
+    settings = VideoPredictionSettings(
+        batch_size=4, aggregation=Aggregation.VOTE, min_frames=3, early_stop_z=2.0
+    )
+    # When
+    verdict = VideoPredictor(model, face_extractor, settings).predict(video_path)
+    # Then
+    assert verdict.prediction == Prediction.REAL
+    assert verdict.stopped_early
+    assert verdict.no_sampled_frames == 4
+
+
+def test_predict_video_without_faces(tmp_path, make_video, face_extractor):
+    video_path = make_video(tmp_path / "video.avi", no_frames=1, frame_shape=VIDEO_FRAME_SHAPE)
+    verdict = VideoPredictor(ModelStub(), face_extractor).predict(video_path)
+    assert verdict.prediction == Prediction.UNCERTAIN
+    assert verdict.no_scored_frames == 0
+
+
+def test_invalid_trim_share(face_extractor):
+    with pytest.raises(DfdError):
+        VideoPredictor(ModelStub(), face_extractor, VideoPredictionSettings(trim_share=0.5))
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+from dfd.exceptions import DfdError
+from dfd.models.stubs import ModelStub
+from dfd.serving import DynamicBatcher
+
+
+class RecordingModelStub(ModelStub):
+    """Record size of scored batches, confidence of face equals its first pixel."""
+
+    def __init__(self, error=None):
+        self.batch_sizes = []
+        self._error = error
+
+    def predict_arrays(self, faces):
+        if self._error is not None:
+            raise self._error
+        self.batch_sizes.append(len(faces))
+        return faces[:, 0, 0, 0].astype(np.float32)
+
+
+def make_faces(*values):
+    return np.asarray(values, dtype=np.float32).reshape(-1, 1, 1, 1)
+
+
+def test_concurrent_requests_are_batched():
+    # Given
+    model = RecordingModelStub()
+    batcher = DynamicBatcher(model, max_batch_size=64, max_latency=0.5)
+    results = {}
+
+    def _request(index):
+        results[index] = batcher.predict_arrays(make_faces(index, index))
+
+    threads = [threading.Thread(target=_request, args=(index,)) for index in range(8)]
+    # When
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+    # Then
+    assert all(list(results[index]) == [index, index] for index in range(8))
+    assert sum(model.batch_sizes) == 16
+    assert len(model.batch_sizes) < 8
+    stats = batcher.stats()
+    assert stats.no_requests == 8
+    assert stats.no_faces == 16
+    assert stats.no_batches == len(model.batch_sizes)
+    assert stats.latency_max >= stats.latency_p50 > 0
+
+
+def test_large_request_is_split():
+    # Given
+    model = RecordingModelStub()
+    batcher = DynamicBatcher(model, max_batch_size=2, max_latency=0)
+    # When
+    confidences = batcher.predict_arrays(make_faces(1, 2, 3, 4, 5))
+    batcher.close()
+    # Then
+    assert list(confidences) == [1, 2, 3, 4, 5]
+    assert model.batch_sizes == [2, 2, 1]
+
+
+def test_error_is_passed_to_caller():
+    batcher = DynamicBatcher(RecordingModelStub(error=RuntimeError("failed")))
+    with pytest.raises(RuntimeError):
+        batcher.predict_arrays(make_faces(1))
+    batcher.close()
+
+
+def test_invalid_max_batch_size():
+    with pytest.raises(DfdError):
+        DynamicBatcher(ModelStub(), max_batch_size=0)
+
+
+def test_closed_batcher_rejects_requests():
+    batcher = DynamicBatcher(RecordingModelStub())
+    batcher.close()
+    with pytest.raises(DfdError):
+        batcher.predict_arrays(make_faces(1))
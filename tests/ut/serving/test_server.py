@@ -0,0 +1,72 @@
+import threading
+from types import MappingProxyType
+
+import cv2 as cv
+import numpy as np
+import pytest
+
+from dfd.datasets.face_extractor import FaceExtractionModel, FaceExtractor
+from dfd.exceptions import DfdError
+from dfd.models import ModelRegistry
+from dfd.models.interface import Prediction
+from dfd.models.stubs import ModelStub
+from dfd.models.video import VideoPredictionSettings
+from dfd.serving import InferenceClient, InferenceServer, InferenceService
+
+
+class BrightnessModelStub(ModelStub):
+    """Bright faces are fake."""
+
+    def predict_arrays(self, faces):
+        return faces.mean(axis=(1, 2, 3)) / 255
+
+
+@pytest.fixture
+def client():
+    service = InferenceService(
+        ModelRegistry(MappingProxyType({"stub": BrightnessModelStub})),
+        FaceExtractor(FaceExtractionModel.HOG),
+    )
+    server = InferenceServer(("127.0.0.1", 0), service)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield InferenceClient(server.url)
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def test_predict_frames(tmp_path, client):
+    # Given
+    frame_paths = []
+    for brightness in (0, 255):
+        frame_path = tmp_path / f"{brightness}.png"
+        cv.imwrite(str(frame_path), np.full((64, 64, 3), brightness, dtype=np.uint8))
+        frame_paths.append(frame_path)
+    # When
+    frame_path_to_confidence_map = client.predict_frames("stub", tmp_path, frame_paths)
+    # Then
+    assert frame_path_to_confidence_map == {frame_paths[0]: 0, frame_paths[1]: 1}
+    stats = client.stats()
+    assert [model_stats["no_faces"] for model_stats in stats.values()] == [2]
+
+
+def test_predict_videos_without_faces(tmp_path, make_video, client):
+    # Given
+    video_path = make_video(tmp_path / "video.avi", no_frames=1)
+    # When
+    video_path_to_verdict_map = client.predict_videos(
+        "stub", tmp_path, [video_path], VideoPredictionSettings(batch_size=4)
+    )
+    # Then
+    assert video_path_to_verdict_map[video_path].prediction == Prediction.UNCERTAIN
+
+
+def test_request_error_is_reported(tmp_path, client):
+    with pytest.raises(DfdError, match="not registered"):
+        client.predict_frames("unknown", tmp_path, [])
+
+
+def test_server_not_running():
+    with pytest.raises(DfdError):
+        InferenceClient("http://127.0.0.1:1").stats()
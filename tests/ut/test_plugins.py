@@ -0,0 +1,66 @@
+from importlib import metadata
+
+import pytest
+
+from dfd import plugins
+from dfd.exceptions import DfdError
+from dfd.models import ModelInterface
+from dfd.models.stubs import ModelStub
+
+
+@pytest.fixture
+def entry_points(monkeypatch):
+    def _register(*entry_points):
+        monkeypatch.setattr(
+            plugins.metadata, "entry_points", lambda: metadata.EntryPoints(entry_points)
+        )
+        plugins.get_entry_point_references.cache_clear()
+
+    yield _register
+    plugins.get_entry_point_references.cache_clear()
+
+
+def test_import_object():
+    assert plugins.import_object("dfd.models.stubs:ModelStub") is ModelStub
+
+
+@pytest.mark.parametrize(
+    "reference", ["dfd.models.stubs", "dfd.models.stubs:NotExisting", "not_existing:Class"]
+)
+def test_import_object_fails(reference):
+    with pytest.raises(DfdError):
+        plugins.import_object(reference)
+
+
+def test_registry_imports_class_on_request():
+    # Given
+    registry = plugins.LazyClassRegistry(ModelInterface, {"stub": "dfd.models.stubs:ModelStub"})
+    # When
+    model_class = registry.get("stub")
+    # Then
+    assert model_class is ModelStub
+    assert registry.get("not_registered") is None
+
+
+def test_registry_rejects_class_with_wrong_base():
+    registry = plugins.LazyClassRegistry(ModelInterface, {"error": "dfd.exceptions:DfdError"})
+    with pytest.raises(DfdError):
+        registry.get("error")
+
+
+def test_add_entry_point_references(entry_points):
+    # Given
+    entry_points(
+        metadata.EntryPoint("stub", "dfd.models.stubs:ModelStub", "dfd.models"),
+        metadata.EntryPoint("meso_net", "third_party:MesoNet", "dfd.models"),
+        metadata.EntryPoint("other", "third_party:Other", "other.group"),
+    )
+    # When
+    name_to_reference_map = plugins.add_entry_point_references(
+        {"meso_net": "dfd.models.implementation.meso_net:MesoNet"}, "dfd.models"
+    )
+    # Then
+    assert name_to_reference_map == {
+        "meso_net": "dfd.models.implementation.meso_net:MesoNet",
+        "stub": "dfd.models.stubs:ModelStub",
+    }